@@ -3,7 +3,11 @@ Blockchain integration helpers.
 """
 
 from .chama_client import ChamaClient, ChamaSummary  # noqa: F401
+from .index_store import ChamaIndexStore, open_index_store  # noqa: F401
+from .indexer import ChamaIndexer  # noqa: F401
 
 
 
 
+from .membership import MembershipIndex  # noqa: F401
+from .subscription_hub import ChamaFeed  # noqa: F401
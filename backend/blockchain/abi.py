@@ -0,0 +1,16 @@
+"""
+Contract ABI helpers shared by the chain client and the event indexer.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Dict
+
+
+def abi_type(entry: Dict[str, Any]) -> str:
+    """Render an ABI input/output entry as a codec type string, expanding tuples."""
+    type_name: str = entry["type"]
+    if type_name.startswith("tuple"):
+        inner = ",".join(abi_type(component) for component in entry["components"])
+        return f"({inner}){type_name[len('tuple'):]}"
+    return type_name
@@ -2,21 +2,94 @@
 Thin abstraction over etherscan-compatible JSON-RPC calls for interacting with
 the ChamaFactory contract. For the hackathon we keep things simple and only
 expose the read paths required by the voice assistant.
+
+Bulk reads (``list_chamas``/``get_chamas``) are packed into chunked JSON-RPC
+batches by default, or into Multicall3 ``aggregate3`` calls, so a page of N
+chamas costs one ``chamaCount`` call plus ``ceil(N / batch_size)`` requests
+instead of N + 1. Set ``CHAMA_READ_MODE=fanout`` for one ``eth_call`` per chama.
+
+With ``CHAMA_READ_MODE=index`` reads are served from the local store kept by
+``blockchain.indexer`` and make no RPC calls at all.
+
+Otherwise reads go through a ``BlockAwareCache`` that holds results until the head block
+advances and coalesces concurrent reads of the same chama, so repeated
+``/chamas`` and balance requests within a block hit the node once.
+
+RPC traffic goes through a ``ProviderPool`` over one or more endpoints
+(``SEPOLIA_RPC_URLS``) with timeouts, health-scored failover and hedged reads.
 """
 
 from __future__ import annotations
 
 import asyncio
+import base64
+import functools
+import json
 import os
-from dataclasses import dataclass
+from collections import OrderedDict
+from dataclasses import dataclass, field
 from decimal import Decimal
-from typing import Any, Dict, List, Optional
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from eth_utils import is_address, to_checksum_address
+
+from services.metrics import chama_cache_requests, chama_rpc_saved, rpc_calls_per_request, rpc_requests
+from services.tracing import traced
+
+from .abi import abi_type
+from .provider_pool import ProviderPool
+from .read_cache import ACTIVE_KEY, COUNT_KEY, BlockAwareCache, chama_key, user_key
+
+if TYPE_CHECKING:  # pragma: no cover
+    from web3 import AsyncWeb3
+    from web3.contract.async_contract import AsyncContract
+
+    from .index_store import ChamaIndexStore
+
+READ_MODES = ("batch", "multicall", "fanout", "index")
+
+# Upper bound on ids examined per page when filtering by owner or archived.
+PAGE_SCAN_LIMIT = 500
 
-from web3 import AsyncHTTPProvider, AsyncWeb3
-from web3.contract.async_contract import AsyncContract
+# Encoded /chamas pages kept per state version.
+PAGE_CACHE_ENTRIES = 256
 
+# Canonical Multicall3 deployment, available on Sepolia and most public chains.
+MULTICALL3_ADDRESS = "0xcA11bde05977b3631167028862bE2a173976CA11"
 
-DEFAULT_FACTORY_ABI = [
+MULTICALL3_ABI = [
+    {
+        "inputs": [
+            {
+                "components": [
+                    {"internalType": "address", "name": "target", "type": "address"},
+                    {"internalType": "bool", "name": "allowFailure", "type": "bool"},
+                    {"internalType": "bytes", "name": "callData", "type": "bytes"},
+                ],
+                "internalType": "struct Multicall3.Call3[]",
+                "name": "calls",
+                "type": "tuple[]",
+            }
+        ],
+        "name": "aggregate3",
+        "outputs": [
+            {
+                "components": [
+                    {"internalType": "bool", "name": "success", "type": "bool"},
+                    {"internalType": "bytes", "name": "returnData", "type": "bytes"},
+                ],
+                "internalType": "struct Multicall3.Result[]",
+                "name": "returnData",
+                "type": "tuple[]",
+            }
+        ],
+        "stateMutability": "payable",
+        "type": "function",
+    },
+]
+
+
+FACTORY_FUNCTIONS_ABI = [
     {
         "inputs": [],
         "name": "chamaCount",
@@ -51,22 +124,113 @@ DEFAULT_FACTORY_ABI = [
         "stateMutability": "view",
         "type": "function",
     },
+    {
+        "inputs": [],
+        "name": "getActiveChamaIds",
+        "outputs": [
+            {"internalType": "uint256[]", "name": "", "type": "uint256[]"},
+        ],
+        "stateMutability": "view",
+        "type": "function",
+    },
+    {
+        "inputs": [
+            {"internalType": "address", "name": "_user", "type": "address"},
+        ],
+        "name": "getUserChamas",
+        "outputs": [
+            {"internalType": "uint256[]", "name": "", "type": "uint256[]"},
+        ],
+        "stateMutability": "view",
+        "type": "function",
+    },
 ]
 
+FACTORY_EVENTS_ABI = [
+    {
+        "anonymous": False,
+        "inputs": [
+            {"indexed": True, "internalType": "uint256", "name": "chamaId", "type": "uint256"},
+            {"indexed": True, "internalType": "address", "name": "creator", "type": "address"},
+            {"indexed": False, "internalType": "address", "name": "chamaAddress", "type": "address"},
+            {"indexed": False, "internalType": "string", "name": "name", "type": "string"},
+            {"indexed": False, "internalType": "uint256", "name": "contributionAmount", "type": "uint256"},
+        ],
+        "name": "ChamaCreated",
+        "type": "event",
+    },
+    {
+        "anonymous": False,
+        "inputs": [
+            {"indexed": True, "internalType": "uint256", "name": "chamaId", "type": "uint256"},
+            {"indexed": True, "internalType": "address", "name": "member", "type": "address"},
+            {"indexed": False, "internalType": "uint256", "name": "timestamp", "type": "uint256"},
+        ],
+        "name": "MemberJoined",
+        "type": "event",
+    },
+    {
+        "anonymous": False,
+        "inputs": [
+            {"indexed": True, "internalType": "uint256", "name": "chamaId", "type": "uint256"},
+            {"indexed": True, "internalType": "address", "name": "contributor", "type": "address"},
+            {"indexed": False, "internalType": "uint256", "name": "amount", "type": "uint256"},
+            {"indexed": False, "internalType": "uint256", "name": "timestamp", "type": "uint256"},
+        ],
+        "name": "ContributionMade",
+        "type": "event",
+    },
+    {
+        "anonymous": False,
+        "inputs": [
+            {"indexed": True, "internalType": "uint256", "name": "chamaId", "type": "uint256"},
+            {"indexed": True, "internalType": "address", "name": "recipient", "type": "address"},
+            {"indexed": False, "internalType": "uint256", "name": "amount", "type": "uint256"},
+            {"indexed": False, "internalType": "uint256", "name": "rotationRound", "type": "uint256"},
+        ],
+        "name": "PayoutDistributed",
+        "type": "event",
+    },
+    {
+        "anonymous": False,
+        "inputs": [
+            {"indexed": True, "internalType": "uint256", "name": "chamaId", "type": "uint256"},
+            {"indexed": False, "internalType": "uint256", "name": "timestamp", "type": "uint256"},
+        ],
+        "name": "ChamaArchived",
+        "type": "event",
+    },
+]
 
-@dataclass
+DEFAULT_FACTORY_ABI = FACTORY_FUNCTIONS_ABI + FACTORY_EVENTS_ABI
+
+
+@dataclass(slots=True)
 class ChamaSummary:
+    """
+    One chama as served by ``/chamas``. Amounts are kept as integer wei; the
+    ETH values are derived on access. The JSON encoding is computed once and
+    reused, since summaries are immutable once built and live in the read
+    cache across requests.
+    """
+
     id: int
     name: str
     owner: str
     members: int
-    contribution_wei: Decimal
-    contribution_eth: Decimal
-    total_funds_wei: Decimal
-    total_funds_eth: Decimal
+    contribution_wei: int
+    total_funds_wei: int
     frequency: int
     active: bool
-    raw: Dict[str, Any]
+    _json: Optional[bytes] = field(default=None, init=False, repr=False, compare=False)
+
+    @property
+    def contribution_eth(self) -> Decimal:
+        return ChamaClient._from_wei(self.contribution_wei)
+
+    @property
+    def total_funds_eth(self) -> Decimal:
+        return ChamaClient._from_wei(self.total_funds_wei)
 
     def to_dict(self) -> Dict[str, Any]:
         return {
@@ -82,6 +246,11 @@ class ChamaSummary:
             "contributionFrequency": self.frequency,
         }
 
+    def to_json(self) -> bytes:
+        if self._json is None:
+            self._json = json.dumps(self.to_dict(), separators=(",", ":")).encode("utf-8")
+        return self._json
+
 
 class ChamaClient:
     def __init__(
@@ -89,67 +258,270 @@ class ChamaClient:
         rpc_url: Optional[str] = None,
         factory_address: Optional[str] = None,
         factory_abi: Any = None,
+        read_mode: Optional[str] = None,
+        batch_size: Optional[int] = None,
+        multicall_address: Optional[str] = None,
+        index_store: Optional["ChamaIndexStore"] = None,
     ) -> None:
-        self._rpc_url = rpc_url or os.getenv("SEPOLIA_RPC_URL")
+        self._pool = ProviderPool.from_env(rpc_url)
         self._factory_address = factory_address or os.getenv("CHAMA_FACTORY_ADDRESS")
         self._factory_abi = factory_abi or DEFAULT_FACTORY_ABI
-        self._web3: Optional[AsyncWeb3] = None
-        self._contract: Optional[AsyncContract] = None
+        self._read_mode = (read_mode or os.getenv("CHAMA_READ_MODE", "batch")).lower()
+        self._batch_size = max(1, batch_size or int(os.getenv("CHAMA_RPC_BATCH_SIZE", "100")))
+        self._web3: Optional["AsyncWeb3"] = None
+        self._contract: Optional["AsyncContract"] = None
+        self._multicall: Optional["AsyncContract"] = None
+        self._index = index_store
+        # Reads that must hit the chain (index mode hydration) use batches.
+        self._chain_mode = "batch" if self._read_mode == "index" else self._read_mode
+        self._pages: "OrderedDict[Tuple[Any, ...], bytes]" = OrderedDict()
+        self._cache = BlockAwareCache(
+            block_poll_seconds=float(os.getenv("CHAMA_BLOCK_POLL_SECONDS", "4")),
+            max_entries=int(os.getenv("CHAMA_CACHE_MAX_ENTRIES", "10000")),
+        )
+        self._chama_info_type = abi_type(
+            next(item for item in self._factory_abi if item.get("name") == "getChamaInfo")["outputs"][0]
+        )
+
+        if self._read_mode not in READ_MODES:
+            raise ValueError(f"Unknown CHAMA_READ_MODE {self._read_mode!r}; expected one of {READ_MODES}")
+        if self._read_mode == "index" and self._index is None:
+            raise ValueError("CHAMA_READ_MODE=index requires an index store.")
 
-        if self._rpc_url and self._factory_address:
-            provider = AsyncHTTPProvider(self._rpc_url)
-            self._web3 = AsyncWeb3(provider)
+        if self._pool is not None and self._factory_address:
+            # web3 takes about a second to import, so it is only loaded once a chain is configured.
+            from web3 import AsyncWeb3
+
+            from .pooled_provider import PooledAsyncProvider
+
+            self._web3 = AsyncWeb3(PooledAsyncProvider(self._pool))
             self._contract = self._web3.eth.contract(  # type: ignore[assignment]
                 address=self._factory_address,
                 abi=self._factory_abi,
             )
+            self._multicall = self._web3.eth.contract(  # type: ignore[assignment]
+                address=to_checksum_address(
+                    multicall_address or os.getenv("MULTICALL3_ADDRESS", MULTICALL3_ADDRESS)
+                ),
+                abi=MULTICALL3_ABI,
+            )
 
     @property
     def is_ready(self) -> bool:
-        return self._contract is not None
+        return self._contract is not None or self._serves_index
+
+    @property
+    def web3(self) -> Optional["AsyncWeb3"]:
+        return self._web3
 
+    @property
+    def factory_address(self) -> Optional[str]:
+        return self._factory_address
+
+    @property
+    def _serves_index(self) -> bool:
+        return self._read_mode == "index" and self._index is not None
+
+    @property
+    def cache(self) -> BlockAwareCache:
+        return self._cache
+
+    @traced("chama.get_chama")
     async def get_chama(self, chama_id: int) -> Optional[ChamaSummary]:
+        if self._serves_index:
+            return await asyncio.to_thread(self._index.get_chama, chama_id)  # type: ignore[union-attr]
         if self._contract is None:
             return None
 
-        result: Dict[str, Any] = await self._contract.functions.getChamaInfo(chama_id).call()  # type: ignore[no-any-return]
-        if not result:
-            return None
-
-        return self._build_summary(result, fallback_id=chama_id)
+        summaries, calls = await self._fetch_summaries([chama_id])
+        rpc_calls_per_request.labels(operation="get_chama").observe(calls)
+        return summaries[0] if summaries else None
 
+    @traced("chama.list_chamas")
     async def list_chamas(self, limit: int = 6) -> List[ChamaSummary]:
+        if self._serves_index:
+            return await asyncio.to_thread(self._index.list_chamas, limit)  # type: ignore[union-attr]
         if self._contract is None:
             return []
 
-        total = await self.get_chama_count()
+        total, count_calls = await self._chama_count()
         if total <= 0:
             return []
 
         start = max(1, total - limit + 1)
-        tasks = [
-            self._contract.functions.getChamaInfo(chama_id).call()
-            for chama_id in range(start, total + 1)
-        ]
-        results = await asyncio.gather(*tasks, return_exceptions=True)
+        summaries, calls = await self._fetch_summaries(range(start, total + 1))
+        rpc_calls_per_request.labels(operation="list_chamas").observe(calls + count_calls)
+        return list(reversed(summaries))
 
-        summaries: List[ChamaSummary] = []
-        for offset, payload in enumerate(results):
-            chama_id = start + offset
-            if isinstance(payload, Exception) or not payload:
-                continue
-            summaries.append(self._build_summary(payload, fallback_id=chama_id))
+    @traced("chama.get_chamas")
+    async def get_chamas(self, chama_ids: Sequence[int]) -> List[ChamaSummary]:
+        """Fetch several chamas using the configured bulk read mode, preserving order."""
+        if self._serves_index:
+            return await asyncio.to_thread(self._index.get_chamas, list(chama_ids))  # type: ignore[union-attr]
+        if self._contract is None or not chama_ids:
+            return []
 
-        return list(reversed(summaries))
+        summaries, calls = await self._fetch_summaries(chama_ids)
+        rpc_calls_per_request.labels(operation="get_chamas").observe(calls)
+        return summaries
 
     async def get_chama_count(self) -> int:
+        if self._serves_index:
+            return await asyncio.to_thread(self._index.chama_count)  # type: ignore[union-attr]
         if self._contract is None:
             return 0
-        try:
-            count = await self._contract.functions.chamaCount().call()  # type: ignore[no-any-return]
-            return int(count)
-        except Exception:
-            return 0
+        total, _ = await self._chama_count()
+        return total
+
+    async def get_active_chama_ids(self) -> List[int]:
+        if self._serves_index:
+            return await asyncio.to_thread(self._index.active_chama_ids)  # type: ignore[union-attr]
+        if self._contract is None:
+            return []
+        ids = await self._cached_call(ACTIVE_KEY, lambda: self._contract.functions.getActiveChamaIds())  # type: ignore[union-attr]
+        return [int(chama_id) for chama_id in ids]
+
+    @traced("chama.get_user_chama_ids")
+    async def get_user_chama_ids(self, address: str) -> List[int]:
+        if self._serves_index:
+            return await asyncio.to_thread(self._index.member_chama_ids, address)  # type: ignore[union-attr]
+        if self._contract is None:
+            return []
+        checksum = to_checksum_address(address)
+        ids = await self._cached_call(
+            user_key(checksum),
+            lambda: self._contract.functions.getUserChamas(checksum),  # type: ignore[union-attr]
+        )
+        # getUserChamas can list a chama twice if the user re-joined.
+        return list(dict.fromkeys(int(chama_id) for chama_id in ids))
+
+    @traced("chama.page_chamas")
+    async def page_chamas(
+        self,
+        limit: int = 6,
+        before: Optional[int] = None,
+        active: Optional[bool] = None,
+        owner: Optional[str] = None,
+        member: Optional[str] = None,
+    ) -> Tuple[List[ChamaSummary], Optional[int]]:
+        """
+        Return up to ``limit`` chamas with ids below ``before`` (newest first)
+        matching the filters, plus the cursor for the next page (``None`` at
+        the end). Each page costs at most a bounded number of batched reads
+        regardless of how many chamas exist.
+        """
+        summaries, next_cursor, _ = await self._page(limit, before, active, owner, member)
+        return summaries, next_cursor
+
+    async def _page(
+        self,
+        limit: int,
+        before: Optional[int],
+        active: Optional[bool],
+        owner: Optional[str],
+        member: Optional[str],
+    ) -> Tuple[List[ChamaSummary], Optional[int], bool]:
+        """``page_chamas`` plus whether every chama it looked at was read; a failed read drops the chama."""
+        owner = to_checksum_address(owner) if owner else None
+        member = to_checksum_address(member) if member else None
+        if self._serves_index:
+            summaries, next_cursor = await asyncio.to_thread(
+                self._index.page_chamas, limit, before, active, owner, member  # type: ignore[union-attr]
+            )
+            return summaries, next_cursor, True
+        if self._contract is None:
+            return [], None, True
+
+        candidates = await self._candidate_ids(before=before, active=active, member=member)
+        if owner is None and active is not False:
+            page_ids = candidates[:limit]
+            summaries = await self.get_chamas(page_ids)
+            next_cursor = page_ids[-1] if len(candidates) > limit and page_ids else None
+            return summaries, next_cursor, len(summaries) == len(page_ids)
+
+        # Filters the contract cannot answer directly are applied to
+        # summaries, scanning a bounded window so one page stays cheap.
+        matches: List[ChamaSummary] = []
+        complete = True
+        scanned = 0
+        window = max(limit, self._batch_size)
+        while scanned < len(candidates) and scanned < PAGE_SCAN_LIMIT and len(matches) < limit:
+            chunk = candidates[scanned:scanned + window]
+            scanned += len(chunk)
+            summaries = await self.get_chamas(chunk)
+            complete = complete and len(summaries) == len(chunk)
+            for summary in summaries:
+                if owner is not None and summary.owner.lower() != owner.lower():
+                    continue
+                if active is False and summary.active:
+                    continue
+                matches.append(summary)
+                if len(matches) == limit:
+                    # Resume right after the last match on the next page.
+                    scanned = candidates.index(summary.id) + 1
+                    break
+
+        next_cursor: Optional[int] = None
+        if scanned < len(candidates):
+            next_cursor = candidates[scanned - 1] if scanned else None
+        return matches, next_cursor, complete
+
+    @traced("chama.page_json")
+    async def page_json(
+        self,
+        limit: int = 6,
+        before: Optional[int] = None,
+        active: Optional[bool] = None,
+        owner: Optional[str] = None,
+        member: Optional[str] = None,
+        version: Optional[str] = None,
+    ) -> Tuple[bytes, bool]:
+        """
+        ``page_chamas`` encoded as the ``/chamas`` response body, and whether
+        every chama on it could be read. Complete pages are kept per
+        ``state_version`` so repeated requests within a block (or index
+        checkpoint) are answered from the stored bytes; a page missing a chama
+        whose read failed is not, so the next request tries again.
+        """
+        key = (version, limit, before, active, owner and owner.lower(), member and member.lower())
+        if version is not None:
+            body = self._pages.get(key)
+            if body is not None:
+                self._pages.move_to_end(key)
+                return body, True
+
+        summaries, next_id, complete = await self._page(limit, before, active, owner, member)
+        body = b"".join(
+            (
+                b'{"chamas":[',
+                b",".join(summary.to_json() for summary in summaries),
+                b'],"nextCursor":',
+                json.dumps(encode_cursor(next_id)).encode("ascii"),
+                b"}",
+            )
+        )
+        if version is not None and complete:
+            self._pages[key] = body
+            while len(self._pages) > PAGE_CACHE_ENTRIES:
+                self._pages.popitem(last=False)
+        return body, complete
+
+    async def state_version(self) -> Optional[str]:
+        """A token that changes whenever reads may return different data, for ETags."""
+        if self._serves_index:
+            checkpoint = await asyncio.to_thread(self._index.checkpoint)  # type: ignore[union-attr]
+            return f"index:{checkpoint[0]}" if checkpoint else None
+        if self._contract is None:
+            return None
+        block = await self._cache.refresh(self._block_number)
+        return f"block:{block}:{self._cache.generation}" if block is not None else None
+
+    async def read_chain(self, chama_ids: Sequence[int]) -> List[ChamaSummary]:
+        """Read chamas from the node, bypassing the index store and the read cache."""
+        if self._contract is None or not chama_ids:
+            return []
+        summaries, _ = await self._rpc_summaries(chama_ids)
+        return [summaries[chama_id] for chama_id in chama_ids if chama_id in summaries]
 
     async def healthcheck(self) -> bool:
         if self._web3 is None:
@@ -160,9 +532,216 @@ class ChamaClient:
         except Exception:
             return False
 
+    @property
+    def provider_pool(self) -> Optional[ProviderPool]:
+        return self._pool
+
+    async def close(self) -> None:
+        if self._pool is not None:
+            await self._pool.close()
+
+    async def _chama_count(self) -> Tuple[int, int]:
+        """Return ``chamaCount`` (0 on failure) and the RPC requests spent."""
+        assert self._contract is not None
+        await self._cache.refresh(self._block_number)
+        hit, count = self._cache.get(COUNT_KEY)
+        if hit:
+            return count, 0
+
+        generation = self._cache.generation
+        spent = []
+
+        async def fetch() -> int:
+            rpc_requests.labels(method="eth_call").inc()
+            spent.append(1)
+            value = int(await self._contract.functions.chamaCount().call())  # type: ignore[union-attr]
+            self._cache.put(COUNT_KEY, value, generation)
+            return value
+
+        try:
+            count = await self._cache.flight.do(COUNT_KEY, fetch)
+        except Exception:
+            return 0, len(spent)
+        return count, len(spent)
+
+    async def _candidate_ids(
+        self,
+        before: Optional[int],
+        active: Optional[bool],
+        member: Optional[str],
+    ) -> Sequence[int]:
+        """Ids that can match, newest first, below the cursor."""
+        if member is not None:
+            ids = sorted(await self.get_user_chama_ids(member), reverse=True)
+            if active:
+                active_ids = set(await self.get_active_chama_ids())
+                ids = [chama_id for chama_id in ids if chama_id in active_ids]
+        elif active:
+            ids = sorted(await self.get_active_chama_ids(), reverse=True)
+        else:
+            total = await self.get_chama_count()
+            upper = total if before is None else min(total, before - 1)
+            # A range slices and indexes in O(1), so a page costs the same however many chamas exist.
+            return range(upper, 0, -1)
+        if before is not None:
+            ids = [chama_id for chama_id in ids if chama_id < before]
+        return ids
+
+    async def _cached_call(self, key: Tuple[Any, ...], build_call: Callable[[], Any]) -> Any:
+        await self._cache.refresh(self._block_number)
+        hit, value = self._cache.get(key)
+        if hit:
+            return value
+
+        generation = self._cache.generation
+
+        async def fetch() -> Any:
+            rpc_requests.labels(method="eth_call").inc()
+            result = await build_call().call()
+            self._cache.put(key, result, generation)
+            return result
+
+        return await self._cache.flight.do(key, fetch)
+
+    async def _fetch_summaries(self, chama_ids: Sequence[int]) -> Tuple[List[ChamaSummary], int]:
+        """
+        Return summaries for ``chama_ids`` in order (skipping failures) and the
+        RPC requests spent. Cached ids cost nothing and ids already being read
+        by another request wait on that read instead of issuing their own.
+        """
+        await self._cache.refresh(self._block_number)
+        chama_ids = [int(chama_id) for chama_id in chama_ids]
+        found: Dict[int, ChamaSummary] = {}
+        owned: List[int] = []
+        waiting: Dict[int, asyncio.Future] = {}
+
+        for chama_id in dict.fromkeys(chama_ids):
+            hit, summary = self._cache.get(chama_key(chama_id))
+            if hit:
+                found[chama_id] = summary
+                continue
+            future, owner = self._cache.flight.join(chama_key(chama_id))
+            if owner:
+                owned.append(chama_id)
+            else:
+                waiting[chama_id] = future
+                chama_cache_requests.labels(result="coalesced").inc()
+                chama_rpc_saved.inc()
+
+        calls = 0
+        if owned:
+            generation = self._cache.generation
+            try:
+                fetched, calls = await self._rpc_summaries(owned)
+            except BaseException as exc:
+                for chama_id in owned:
+                    self._cache.flight.resolve(chama_key(chama_id), error=exc)
+                raise
+            for chama_id in owned:
+                summary = fetched.get(chama_id)
+                if summary is not None:
+                    self._cache.put(chama_key(chama_id), summary, generation)
+                    found[chama_id] = summary
+                self._cache.flight.resolve(chama_key(chama_id), summary)
+
+        for chama_id, future in waiting.items():
+            try:
+                summary = await asyncio.shield(future)
+            except Exception:
+                continue
+            if summary is not None:
+                found[chama_id] = summary
+
+        return [found[chama_id] for chama_id in chama_ids if chama_id in found], calls
+
+    async def _block_number(self) -> int:
+        assert self._web3 is not None
+        rpc_requests.labels(method="eth_blockNumber").inc()
+        return int(await self._web3.eth.block_number)  # type: ignore[misc]
+
+    async def _rpc_summaries(self, chama_ids: Sequence[int]) -> Tuple[Dict[int, ChamaSummary], int]:
+        """Read ``chama_ids`` from the node, returning summaries by id and the RPC requests spent."""
+        assert self._contract is not None
+        chama_ids = list(chama_ids)
+
+        if self._chain_mode == "fanout":
+            rpc_requests.labels(method="eth_call").inc(len(chama_ids))
+            tasks = [self._contract.functions.getChamaInfo(chama_id).call() for chama_id in chama_ids]
+            payloads: List[Any] = await asyncio.gather(*tasks, return_exceptions=True)
+            calls = len(chama_ids)
+        else:
+            calldata = [
+                self._contract.encodeABI(fn_name="getChamaInfo", args=[chama_id]) for chama_id in chama_ids
+            ]
+            chunks = [
+                calldata[offset:offset + self._batch_size]
+                for offset in range(0, len(calldata), self._batch_size)
+            ]
+            fetch = self._multicall_chunk if self._chain_mode == "multicall" else self._batch_chunk
+            results = await asyncio.gather(*(fetch(chunk) for chunk in chunks), return_exceptions=True)
+            payloads = []
+            for chunk, result in zip(chunks, results):
+                payloads.extend(result if not isinstance(result, BaseException) else [None] * len(chunk))
+            calls = len(chunks)
+            payloads = [self._decode_chama_info(data) for data in payloads]
+
+        summaries: Dict[int, ChamaSummary] = {}
+        for chama_id, payload in zip(chama_ids, payloads):
+            if isinstance(payload, BaseException) or not payload:
+                continue
+            summaries[chama_id] = self._build_summary(payload, fallback_id=chama_id)
+        return summaries, calls
+
+    async def _batch_chunk(self, calldata: Sequence[str]) -> List[Optional[bytes]]:
+        """Send one JSON-RPC batch of ``eth_call`` requests and return raw results by position."""
+        assert self._pool is not None
+        batch = [
+            {
+                "jsonrpc": "2.0",
+                "id": index,
+                "method": "eth_call",
+                "params": [{"to": self._factory_address, "data": data}, "latest"],
+            }
+            for index, data in enumerate(calldata)
+        ]
+        rpc_requests.labels(method="batch").inc()
+        replies = await self._pool.post_json(batch)
+
+        if isinstance(replies, dict):
+            # Some providers answer a rejected batch with a single error object.
+            raise RuntimeError(f"JSON-RPC batch rejected: {replies.get('error')}")
+        results: List[Optional[bytes]] = [None] * len(calldata)
+        for reply in replies:
+            index = reply.get("id")
+            if isinstance(index, int) and 0 <= index < len(results) and reply.get("result"):
+                results[index] = bytes.fromhex(reply["result"][2:])
+        return results
+
+    async def _multicall_chunk(self, calldata: Sequence[str]) -> List[Optional[bytes]]:
+        """Aggregate one chunk of calls through Multicall3 in a single ``eth_call``."""
+        assert self._multicall is not None
+        calls = [(self._factory_address, True, bytes.fromhex(data[2:])) for data in calldata]
+        rpc_requests.labels(method="eth_call").inc()
+        results = await self._multicall.functions.aggregate3(calls).call()  # type: ignore[no-any-return]
+        return [bytes(data) if success else None for success, data in results]
+
+    def _decode_chama_info(self, data: Optional[bytes]) -> Any:
+        if not data:
+            return None
+        assert self._web3 is not None
+        try:
+            (decoded,) = self._web3.codec.decode([self._chama_info_type], data)
+        except Exception:
+            return None
+        return decoded
+
     @staticmethod
-    def _from_wei(amount: Decimal) -> Decimal:
-        return (amount / Decimal("1e18")).quantize(Decimal("0.0001"))
+    def is_address(value: str) -> bool:
+        return bool(is_address(value))
+
+    @staticmethod
+    def _from_wei(amount: int) -> Decimal:
+        return (Decimal(amount) / Decimal("1e18")).quantize(Decimal("0.0001"))
 
     def _build_summary(self, payload: Dict[str, Any], fallback_id: int) -> ChamaSummary:
         def _get(key: str, index: int) -> Any:
@@ -170,21 +749,39 @@ class ChamaClient:
                 return payload.get(key)
             return payload[index]
 
-        contribution_wei = Decimal(_get("contributionAmount", 4) or 0)
-        total_funds_wei = Decimal(_get("totalFunds", 6) or 0)
-
-        raw_dict = dict(payload.items()) if hasattr(payload, "items") else {}
-
         return ChamaSummary(
             id=int(_get("id", 0) or fallback_id),
             name=str(_get("name", 1) or ""),
-            owner=str(_get("owner", 2) or ""),
+            owner=_checksum(str(_get("owner", 2) or "")),
             members=int(_get("memberCount", 3) or 0),
-            contribution_wei=contribution_wei,
-            contribution_eth=self._from_wei(contribution_wei),
-            total_funds_wei=total_funds_wei,
-            total_funds_eth=self._from_wei(total_funds_wei),
+            contribution_wei=int(_get("contributionAmount", 4) or 0),
+            total_funds_wei=int(_get("totalFunds", 6) or 0),
             frequency=int(_get("contributionFrequency", 5) or 0),
             active=bool(_get("active", 7) or False),
-            raw=raw_dict,
         )
+
+
+def encode_cursor(chama_id: Optional[int]) -> Optional[str]:
+    """Opaque ``/chamas`` page cursor for "ids below ``chama_id``"."""
+    if chama_id is None:
+        return None
+    return base64.urlsafe_b64encode(f"c:{chama_id}".encode("ascii")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> int:
+    """Inverse of ``encode_cursor``; raises ``ValueError`` for anything it did not produce."""
+    try:
+        prefix, value = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode("ascii").split(":", 1)
+        chama_id = int(value)
+    except (ValueError, UnicodeDecodeError) as exc:
+        raise ValueError("invalid cursor") from exc
+    if prefix != "c" or chama_id < 1:
+        raise ValueError("invalid cursor")
+    return chama_id
+
+
+@functools.lru_cache(maxsize=4096)
+def _checksum(address: str) -> str:
+    # Raw ABI decoding (batch/multicall) yields lowercase addresses; web3's
+    # contract calls return checksummed ones.
+    return to_checksum_address(address) if is_address(address) else address
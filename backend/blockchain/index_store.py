@@ -0,0 +1,418 @@
+"""
+Local query store for chamas materialised from ChamaFactory events.
+
+The indexer appends decoded events and the store keeps ``chamas``,
+``chama_members`` and ``contributions`` up to date from them. Raw events are
+retained in ``chama_events`` so a chain reorganisation can be undone by
+deleting everything above the fork block and recomputing the affected chamas.
+
+SQLite is the default backend. A ``postgres://`` URL in ``CHAMA_INDEX_DB``
+uses Postgres through ``psycopg`` when it is installed. All methods are
+blocking; async callers should run them through ``asyncio.to_thread``.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from .chama_client import ChamaSummary
+
+try:
+    import psycopg  # type: ignore
+except Exception:  # pragma: no cover - optional dependency
+    psycopg = None
+
+
+DEFAULT_INDEX_PATH = Path(__file__).resolve().parent.parent / "data" / "chama_index.sqlite3"
+
+# Block hashes kept for finding the fork point after a reorg.
+RECENT_BLOCKS = 256
+
+SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS index_checkpoint (
+        id INTEGER PRIMARY KEY CHECK (id = 1),
+        block_number BIGINT NOT NULL,
+        block_hash TEXT NOT NULL
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS indexed_blocks (
+        block_number BIGINT PRIMARY KEY,
+        block_hash TEXT NOT NULL
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS chama_events (
+        block_number BIGINT NOT NULL,
+        log_index INTEGER NOT NULL,
+        tx_hash TEXT NOT NULL,
+        event TEXT NOT NULL,
+        chama_id BIGINT NOT NULL,
+        payload TEXT NOT NULL,
+        PRIMARY KEY (block_number, log_index)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS chamas (
+        id BIGINT PRIMARY KEY,
+        name TEXT NOT NULL,
+        owner TEXT NOT NULL,
+        chama_address TEXT NOT NULL,
+        members INTEGER NOT NULL,
+        contribution_wei TEXT NOT NULL,
+        frequency BIGINT NOT NULL,
+        total_funds_wei TEXT NOT NULL,
+        active INTEGER NOT NULL,
+        created_block BIGINT NOT NULL
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS chama_members (
+        chama_id BIGINT NOT NULL,
+        member TEXT NOT NULL,
+        joined_block BIGINT NOT NULL,
+        PRIMARY KEY (chama_id, member)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS contributions (
+        block_number BIGINT NOT NULL,
+        log_index INTEGER NOT NULL,
+        chama_id BIGINT NOT NULL,
+        contributor TEXT NOT NULL,
+        amount_wei TEXT NOT NULL,
+        timestamp BIGINT NOT NULL,
+        PRIMARY KEY (block_number, log_index)
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS chama_members_member ON chama_members (member)",
+    "CREATE INDEX IF NOT EXISTS chama_events_chama ON chama_events (chama_id)",
+    "CREATE INDEX IF NOT EXISTS contributions_chama ON contributions (chama_id)",
+)
+
+
+@dataclass
+class ChamaEvent:
+    name: str
+    chama_id: int
+    block_number: int
+    block_hash: str
+    log_index: int
+    tx_hash: str
+    args: Dict[str, Any]
+
+
+class ChamaIndexStore:
+    def __init__(self, url: Optional[str] = None) -> None:
+        url = url or os.getenv("CHAMA_INDEX_DB") or str(DEFAULT_INDEX_PATH)
+        self._lock = threading.Lock()
+        if url.startswith(("postgres://", "postgresql://")):
+            if psycopg is None:
+                raise RuntimeError("CHAMA_INDEX_DB points at Postgres but psycopg is not installed.")
+            self._conn = psycopg.connect(url)
+            self._placeholder = "%s"
+        else:
+            path = Path(url.removeprefix("sqlite:///"))
+            path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(str(path), check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._placeholder = "?"
+        with self._lock, self._transaction() as cursor:
+            for statement in SCHEMA:
+                cursor.execute(statement)
+
+    def close(self) -> None:
+        self._conn.close()
+
+    # -- reads -----------------------------------------------------------
+
+    def checkpoint(self) -> Optional[Tuple[int, str]]:
+        row = self._fetchone("SELECT block_number, block_hash FROM index_checkpoint WHERE id = 1")
+        return (int(row[0]), str(row[1])) if row else None
+
+    def recent_blocks(self) -> List[Tuple[int, str]]:
+        """Indexed block hashes, newest first."""
+        rows = self._fetchall("SELECT block_number, block_hash FROM indexed_blocks ORDER BY block_number DESC")
+        return [(int(number), str(block_hash)) for number, block_hash in rows]
+
+    def chama_count(self) -> int:
+        row = self._fetchone("SELECT COALESCE(MAX(id), 0) FROM chamas")
+        return int(row[0]) if row else 0
+
+    def get_chama(self, chama_id: int) -> Optional[ChamaSummary]:
+        rows = self.get_chamas([chama_id])
+        return rows[0] if rows else None
+
+    def get_chamas(self, chama_ids: Sequence[int]) -> List[ChamaSummary]:
+        if not chama_ids:
+            return []
+        marks = ", ".join(self._placeholder for _ in chama_ids)
+        rows = self._fetchall(f"{_SELECT_CHAMAS} WHERE id IN ({marks})", [int(i) for i in chama_ids])
+        by_id = {int(row[0]): _summary_from_row(row) for row in rows}
+        return [by_id[int(chama_id)] for chama_id in chama_ids if int(chama_id) in by_id]
+
+    def list_chamas(self, limit: int = 6) -> List[ChamaSummary]:
+        rows = self._fetchall(f"{_SELECT_CHAMAS} ORDER BY id DESC LIMIT {self._placeholder}", [int(limit)])
+        return [_summary_from_row(row) for row in rows]
+
+    def active_chama_ids(self) -> List[int]:
+        return [int(row[0]) for row in self._fetchall("SELECT id FROM chamas WHERE active = 1 ORDER BY id")]
+
+    def member_chama_ids(self, address: str) -> List[int]:
+        rows = self._fetchall(
+            "SELECT chama_id FROM chama_members WHERE member = ? ORDER BY chama_id", [address.lower()]
+        )
+        return [int(row[0]) for row in rows]
+
+    def page_chamas(
+        self,
+        limit: int,
+        before: Optional[int] = None,
+        active: Optional[bool] = None,
+        owner: Optional[str] = None,
+        member: Optional[str] = None,
+    ) -> Tuple[List[ChamaSummary], Optional[int]]:
+        clauses: List[str] = []
+        params: List[Any] = []
+        if before is not None:
+            clauses.append("id < ?")
+            params.append(int(before))
+        if active is not None:
+            clauses.append("active = ?")
+            params.append(1 if active else 0)
+        if owner is not None:
+            clauses.append("LOWER(owner) = ?")
+            params.append(owner.lower())
+        if member is not None:
+            clauses.append("id IN (SELECT chama_id FROM chama_members WHERE member = ?)")
+            params.append(member.lower())
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+        # One extra row tells us whether another page exists.
+        params.append(int(limit) + 1)
+        rows = self._fetchall(f"{_SELECT_CHAMAS}{where} ORDER BY id DESC LIMIT ?", params)
+        summaries = [_summary_from_row(row) for row in rows[:limit]]
+        next_cursor = summaries[-1].id if len(rows) > limit and summaries else None
+        return summaries, next_cursor
+
+    def missing_frequency(self) -> List[int]:
+        rows = self._fetchall("SELECT id FROM chamas WHERE frequency = 0")
+        return [int(row[0]) for row in rows]
+
+    # -- writes ----------------------------------------------------------
+
+    def apply(self, events: Iterable[ChamaEvent], block_number: int, block_hash: str) -> Set[int]:
+        """Apply events up to ``block_number`` atomically; returns the touched chama ids."""
+        touched: Set[int] = set()
+        with self._lock, self._transaction() as cursor:
+            for event in events:
+                inserted = self._execute(
+                    cursor,
+                    "INSERT INTO chama_events (block_number, log_index, tx_hash, event, chama_id, payload) "
+                    "VALUES (?, ?, ?, ?, ?, ?) ON CONFLICT DO NOTHING",
+                    (
+                        event.block_number,
+                        event.log_index,
+                        event.tx_hash,
+                        event.name,
+                        event.chama_id,
+                        json.dumps(event.args, default=str),
+                    ),
+                )
+                if inserted:
+                    self._materialise(cursor, event)
+                    self._remember_block(cursor, event.block_number, event.block_hash)
+                    touched.add(event.chama_id)
+            self._remember_block(cursor, block_number, block_hash)
+            self._execute(
+                cursor,
+                "INSERT INTO index_checkpoint (id, block_number, block_hash) VALUES (1, ?, ?) "
+                "ON CONFLICT (id) DO UPDATE SET block_number = excluded.block_number, block_hash = excluded.block_hash",
+                (block_number, block_hash),
+            )
+            self._execute(
+                cursor,
+                "DELETE FROM indexed_blocks WHERE block_number < ?",
+                (block_number - RECENT_BLOCKS,),
+            )
+        return touched
+
+    def rollback(self, block_number: int, block_hash: Optional[str]) -> Set[int]:
+        """Forget everything above ``block_number``; returns the chama ids that changed."""
+        with self._lock, self._transaction() as cursor:
+            self._execute(cursor, "SELECT DISTINCT chama_id FROM chama_events WHERE block_number > ?", (block_number,))
+            touched = {int(row[0]) for row in cursor.fetchall()}
+            for table in ("chama_events", "contributions", "indexed_blocks"):
+                self._execute(cursor, f"DELETE FROM {table} WHERE block_number > ?", (block_number,))
+            self._execute(cursor, "DELETE FROM chama_members WHERE joined_block > ?", (block_number,))
+            self._execute(cursor, "DELETE FROM chamas WHERE created_block > ?", (block_number,))
+            for chama_id in touched:
+                self._recompute(cursor, chama_id)
+            if block_hash is None:
+                self._execute(cursor, "DELETE FROM index_checkpoint", ())
+            else:
+                self._execute(
+                    cursor,
+                    "UPDATE index_checkpoint SET block_number = ?, block_hash = ? WHERE id = 1",
+                    (block_number, block_hash),
+                )
+        return touched
+
+    def set_frequency(self, chama_id: int, frequency: int) -> None:
+        with self._lock, self._transaction() as cursor:
+            self._execute(cursor, "UPDATE chamas SET frequency = ? WHERE id = ?", (int(frequency), int(chama_id)))
+
+    # -- internals -------------------------------------------------------
+
+    def _materialise(self, cursor: Any, event: ChamaEvent) -> None:
+        args = event.args
+        if event.name == "ChamaCreated":
+            self._execute(
+                cursor,
+                "INSERT INTO chamas (id, name, owner, chama_address, members, contribution_wei, frequency, "
+                "total_funds_wei, active, created_block) VALUES (?, ?, ?, ?, 0, ?, 0, '0', 1, ?) "
+                "ON CONFLICT (id) DO NOTHING",
+                (
+                    event.chama_id,
+                    str(args.get("name", "")),
+                    str(args.get("creator", "")),
+                    str(args.get("chamaAddress", "")),
+                    str(args.get("contributionAmount", 0)),
+                    event.block_number,
+                ),
+            )
+            # The factory adds the creator as the first member.
+            self._add_member(cursor, event.chama_id, str(args.get("creator", "")), event.block_number)
+        elif event.name == "MemberJoined":
+            self._add_member(cursor, event.chama_id, str(args.get("member", "")), event.block_number)
+        elif event.name == "ContributionMade":
+            self._execute(
+                cursor,
+                "INSERT INTO contributions (block_number, log_index, chama_id, contributor, amount_wei, timestamp) "
+                "VALUES (?, ?, ?, ?, ?, ?) ON CONFLICT DO NOTHING",
+                (
+                    event.block_number,
+                    event.log_index,
+                    event.chama_id,
+                    str(args.get("contributor", "")),
+                    str(args.get("amount", 0)),
+                    int(args.get("timestamp", 0)),
+                ),
+            )
+            self._execute(cursor, "SELECT total_funds_wei FROM chamas WHERE id = ?", (event.chama_id,))
+            row = cursor.fetchone()
+            if row is not None:
+                total = int(row[0]) + int(args.get("amount", 0))
+                self._execute(
+                    cursor, "UPDATE chamas SET total_funds_wei = ? WHERE id = ?", (str(total), event.chama_id)
+                )
+        elif event.name == "ChamaArchived":
+            self._execute(cursor, "UPDATE chamas SET active = 0 WHERE id = ?", (event.chama_id,))
+        # PayoutDistributed is kept in chama_events only; it does not change
+        # the factory's totalContributed figure that totalFunds mirrors.
+
+    def _add_member(self, cursor: Any, chama_id: int, member: str, block_number: int) -> None:
+        added = self._execute(
+            cursor,
+            "INSERT INTO chama_members (chama_id, member, joined_block) VALUES (?, ?, ?) ON CONFLICT DO NOTHING",
+            (chama_id, member.lower(), block_number),
+        )
+        if added:
+            self._execute(cursor, "UPDATE chamas SET members = members + 1 WHERE id = ?", (chama_id,))
+
+    def _recompute(self, cursor: Any, chama_id: int) -> None:
+        self._execute(cursor, "SELECT COUNT(*) FROM chama_members WHERE chama_id = ?", (chama_id,))
+        members = int(cursor.fetchone()[0])
+        self._execute(cursor, "SELECT amount_wei FROM contributions WHERE chama_id = ?", (chama_id,))
+        total = sum(int(row[0]) for row in cursor.fetchall())
+        self._execute(
+            cursor,
+            "SELECT COUNT(*) FROM chama_events WHERE chama_id = ? AND event = 'ChamaArchived'",
+            (chama_id,),
+        )
+        active = 0 if int(cursor.fetchone()[0]) else 1
+        self._execute(
+            cursor,
+            "UPDATE chamas SET members = ?, total_funds_wei = ?, active = ? WHERE id = ?",
+            (members, str(total), active, chama_id),
+        )
+
+    def _remember_block(self, cursor: Any, block_number: int, block_hash: str) -> None:
+        self._execute(
+            cursor,
+            "INSERT INTO indexed_blocks (block_number, block_hash) VALUES (?, ?) "
+            "ON CONFLICT (block_number) DO UPDATE SET block_hash = excluded.block_hash",
+            (block_number, block_hash),
+        )
+
+    def _transaction(self):
+        # sqlite3 and psycopg connections both commit on clean exit and roll
+        # back on error when used as context managers; the cursor is closed
+        # by _CursorScope.
+        return _CursorScope(self._conn)
+
+    def _execute(self, cursor: Any, sql: str, params: Sequence[Any]) -> int:
+        if self._placeholder != "?":
+            sql = sql.replace("?", self._placeholder)
+        cursor.execute(sql, tuple(params))
+        return max(cursor.rowcount, 0)
+
+    def _fetchone(self, sql: str, params: Sequence[Any] = ()) -> Optional[Sequence[Any]]:
+        with self._lock, self._transaction() as cursor:
+            self._execute(cursor, sql, params)
+            return cursor.fetchone()
+
+    def _fetchall(self, sql: str, params: Sequence[Any] = ()) -> List[Sequence[Any]]:
+        with self._lock, self._transaction() as cursor:
+            self._execute(cursor, sql, params)
+            return list(cursor.fetchall())
+
+
+class _CursorScope:
+    def __init__(self, conn: Any) -> None:
+        self._conn = conn
+        self._cursor: Any = None
+
+    def __enter__(self) -> Any:
+        self._cursor = self._conn.cursor()
+        return self._cursor
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        try:
+            if exc_type is None:
+                self._conn.commit()
+            else:
+                self._conn.rollback()
+        finally:
+            self._cursor.close()
+
+
+_SELECT_CHAMAS = (
+    "SELECT id, name, owner, members, contribution_wei, total_funds_wei, frequency, active FROM chamas"
+)
+
+
+def _summary_from_row(row: Sequence[Any]) -> ChamaSummary:
+    return ChamaSummary(
+        id=int(row[0]),
+        name=str(row[1]),
+        owner=str(row[2]),
+        members=int(row[3]),
+        contribution_wei=int(row[4]),
+        total_funds_wei=int(row[5]),
+        frequency=int(row[6]),
+        active=bool(row[7]),
+    )
+
+
+def open_index_store() -> Optional[ChamaIndexStore]:
+    """Open the configured store when the indexer or the index read mode is enabled."""
+    if os.getenv("CHAMA_INDEXER_ENABLED", "0") != "1" and os.getenv("CHAMA_READ_MODE", "").lower() != "index":
+        return None
+    return ChamaIndexStore()
@@ -0,0 +1,246 @@
+"""
+Background follower that indexes ChamaFactory events into ``ChamaIndexStore``.
+
+The indexer resumes from the stored checkpoint, bulk-fetches logs with
+``eth_getLogs`` over block ranges (halving the range when a provider rejects a
+wide query) and stays ``CHAMA_INDEX_CONFIRMATIONS`` blocks behind the head.
+Before each pass it checks that the checkpoint block is still canonical; if
+not, it walks back through recently indexed block hashes to the fork point
+and rolls the store back before continuing.
+
+Touched chamas are invalidated in the ChamaClient read cache so RPC-backed
+reads never serve state older than the index.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Sequence, Set
+
+from eth_utils import to_checksum_address
+
+from services.metrics import indexer_block, indexer_events
+
+from .abi import abi_type
+from .chama_client import FACTORY_EVENTS_ABI, ChamaClient
+from .index_store import ChamaEvent, ChamaIndexStore
+from .read_cache import ACTIVE_KEY, COUNT_KEY, user_key
+
+if TYPE_CHECKING:  # pragma: no cover
+    from web3 import AsyncWeb3
+
+logger = logging.getLogger("chamas.indexer")
+
+
+class EventDecoder:
+    """Decodes raw ``eth_getLogs`` entries for the given event ABI into ``ChamaEvent``."""
+
+    def __init__(self, web3: "AsyncWeb3", abi: Sequence[Dict[str, Any]]) -> None:
+        self._codec = web3.codec
+        self._events: Dict[str, Dict[str, Any]] = {}
+        for entry in abi:
+            signature = f"{entry['name']}({','.join(abi_type(item) for item in entry['inputs'])})"
+            self._events[web3.keccak(text=signature).hex()] = entry
+
+    @property
+    def topics(self) -> List[str]:
+        return list(self._events)
+
+    def decode(self, log: Dict[str, Any]) -> Optional[ChamaEvent]:
+        topics = [_hex(topic) for topic in log["topics"]]
+        entry = self._events.get(topics[0]) if topics else None
+        if entry is None:
+            return None
+
+        indexed = [item for item in entry["inputs"] if item["indexed"]]
+        plain = [item for item in entry["inputs"] if not item["indexed"]]
+        args: Dict[str, Any] = {}
+        for item, topic in zip(indexed, topics[1:]):
+            (args[item["name"]],) = self._codec.decode([abi_type(item)], bytes.fromhex(topic[2:]))
+        values = self._codec.decode([abi_type(item) for item in plain], bytes(log["data"]))
+        args.update({item["name"]: value for item, value in zip(plain, values)})
+        for item in entry["inputs"]:
+            if item["type"] == "address":
+                args[item["name"]] = to_checksum_address(args[item["name"]])
+
+        return ChamaEvent(
+            name=entry["name"],
+            chama_id=int(args["chamaId"]),
+            block_number=int(log["blockNumber"]),
+            block_hash=_hex(log["blockHash"]),
+            log_index=int(log["logIndex"]),
+            tx_hash=_hex(log["transactionHash"]),
+            args=args,
+        )
+
+
+class ChamaIndexer:
+    def __init__(
+        self,
+        client: ChamaClient,
+        store: ChamaIndexStore,
+        start_block: Optional[int] = None,
+        confirmations: Optional[int] = None,
+        max_range: Optional[int] = None,
+        poll_seconds: Optional[float] = None,
+    ) -> None:
+        if client.web3 is None or client.factory_address is None:
+            raise RuntimeError("ChamaIndexer needs a configured ChamaClient.")
+        self._client = client
+        self._web3 = client.web3
+        self._address = to_checksum_address(client.factory_address)
+        self._store = store
+        self._start_block = start_block if start_block is not None else int(os.getenv("CHAMA_INDEX_START_BLOCK", "0"))
+        self._confirmations = confirmations if confirmations is not None else int(os.getenv("CHAMA_INDEX_CONFIRMATIONS", "3"))
+        self._max_range = max_range or int(os.getenv("CHAMA_INDEX_MAX_RANGE", "2000"))
+        self._range = self._max_range
+        self._poll = poll_seconds or float(os.getenv("CHAMA_INDEX_POLL_SECONDS", "6"))
+        self._decoder = EventDecoder(self._web3, FACTORY_EVENTS_ABI)
+        self._listeners: List[Callable[[Set[int], int], None]] = []
+        self._event_listeners: List[Callable[[Sequence[ChamaEvent], bool], None]] = []
+        self._task: Optional[asyncio.Task] = None
+
+    def add_listener(self, listener: Callable[[Set[int], int], None]) -> None:
+        """Call ``listener(touched_chama_ids, block_number)`` after each applied range."""
+        self._listeners.append(listener)
+
+    def add_event_listener(self, listener: Callable[[Sequence[ChamaEvent], bool], None]) -> None:
+        """Call ``listener(events, reorg)`` with decoded events; ``reorg`` is True after a rollback."""
+        self._event_listeners.append(listener)
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self.run(), name="chama-indexer")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def run(self) -> None:
+        while True:
+            try:
+                await self.sync_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                logger.warning("Chama indexer pass failed: %s", exc)
+            await asyncio.sleep(self._poll)
+
+    async def sync_once(self) -> int:
+        """Index up to ``head - confirmations``; returns the new checkpoint block."""
+        checkpoint = await asyncio.to_thread(self._store.checkpoint)
+        if checkpoint is not None and not await self._is_canonical(*checkpoint):
+            checkpoint = await self._rewind()
+
+        head = int(await self._web3.eth.block_number)  # type: ignore[misc]
+        target = head - self._confirmations
+        current = checkpoint[0] if checkpoint is not None else self._start_block - 1
+
+        while current < target:
+            end = min(current + self._range, target)
+            try:
+                logs = await self._web3.eth.get_logs(  # type: ignore[misc]
+                    {
+                        "address": self._address,
+                        "fromBlock": current + 1,
+                        "toBlock": end,
+                        "topics": [self._decoder.topics],
+                    }
+                )
+            except Exception:
+                if self._range == 1:
+                    raise
+                self._range = max(1, self._range // 2)
+                continue
+
+            events = [event for event in map(self._decoder.decode, logs) if event is not None]
+            block = await self._web3.eth.get_block(end)  # type: ignore[misc]
+            touched = await asyncio.to_thread(self._store.apply, events, end, _hex(block["hash"]))
+            for event in events:
+                indexer_events.labels(event=event.name).inc()
+            created = {event.chama_id for event in events if event.name == "ChamaCreated"}
+            if created:
+                await self._hydrate(created)
+            self._notify(touched, end, count_changed=bool(created), events=events)
+            indexer_block.set(end)
+            current = end
+            self._range = min(self._max_range, self._range * 2)
+
+        return current
+
+    async def _hydrate(self, chama_ids: Set[int]) -> None:
+        """Fill fields the events do not carry (contribution frequency) from the chain."""
+        try:
+            summaries = await self._client.read_chain(sorted(chama_ids))
+        except Exception as exc:
+            logger.info("Could not hydrate chamas %s: %s", sorted(chama_ids), exc)
+            return
+        for summary in summaries:
+            await asyncio.to_thread(self._store.set_frequency, summary.id, summary.frequency)
+
+    async def _is_canonical(self, block_number: int, block_hash: str) -> bool:
+        block = await self._web3.eth.get_block(block_number)  # type: ignore[misc]
+        return _hex(block["hash"]) == block_hash
+
+    async def _rewind(self) -> Optional[tuple]:
+        recent = await asyncio.to_thread(self._store.recent_blocks)
+        fork: Optional[tuple] = None
+        for block_number, block_hash in recent:
+            if await self._is_canonical(block_number, block_hash):
+                fork = (block_number, block_hash)
+                break
+
+        if fork is None:
+            logger.warning("Reorg deeper than the retained block hashes; re-indexing from scratch.")
+            touched = await asyncio.to_thread(self._store.rollback, self._start_block - 1, None)
+        else:
+            logger.warning("Chain reorg detected; rolling the index back to block %s.", fork[0])
+            touched = await asyncio.to_thread(self._store.rollback, fork[0], fork[1])
+        # Rolled-back joins are not known per member; drop every cached read.
+        self._client.cache.clear()
+        self._notify(touched, fork[0] if fork else self._start_block - 1, count_changed=True, reorg=True)
+        return fork
+
+    def _notify(
+        self,
+        touched: Set[int],
+        block_number: int,
+        count_changed: bool,
+        events: Sequence[ChamaEvent] = (),
+        reorg: bool = False,
+    ) -> None:
+        cache = self._client.cache
+        for chama_id in touched:
+            cache.invalidate_chama(chama_id)
+        if count_changed:
+            cache.invalidate(COUNT_KEY)
+        for event in events:
+            if event.name in ("ChamaCreated", "ChamaArchived"):
+                cache.invalidate(ACTIVE_KEY)
+            for name in ("creator", "member"):
+                if name in event.args:
+                    cache.invalidate(user_key(event.args[name]))
+        for listener in self._listeners:
+            try:
+                listener(touched, block_number)
+            except Exception as exc:  # pragma: no cover - listener bugs must not stop indexing
+                logger.warning("Indexer listener failed: %s", exc)
+        for event_listener in self._event_listeners:
+            try:
+                event_listener(events, reorg)
+            except Exception as exc:  # pragma: no cover - listener bugs must not stop indexing
+                logger.warning("Indexer event listener failed: %s", exc)
+
+
+def _hex(value: Any) -> str:
+    if isinstance(value, (bytes, bytearray)):
+        return "0x" + bytes(value).hex()
+    text = str(value)
+    return text if text.startswith("0x") else "0x" + text
@@ -0,0 +1,88 @@
+"""
+Address -> chama ids membership index for resolving who a voice user is.
+
+Lookups are seeded from the factory's ``getUserChamas`` (or the local index
+store in ``CHAMA_READ_MODE=index``) and cached per address. When the event
+indexer runs, ``ChamaCreated`` and ``MemberJoined`` events are folded into
+cached entries as they arrive, so a new membership is visible immediately and
+entries only fall back to a fresh ``getUserChamas`` read once their TTL
+expires. Summaries for all of a user's chamas come from one batched
+``ChamaClient.get_chamas`` read.
+"""
+
+from __future__ import annotations
+
+import os
+import time
+from collections import OrderedDict
+from typing import TYPE_CHECKING, List, Optional, Sequence, Tuple
+
+from .chama_client import ChamaClient, ChamaSummary
+from .read_cache import SingleFlight
+
+if TYPE_CHECKING:  # pragma: no cover
+    from .index_store import ChamaEvent
+    from .indexer import ChamaIndexer
+
+# Event name -> the argument holding the address that gained the chama.
+_MEMBERSHIP_EVENTS = {"ChamaCreated": "creator", "MemberJoined": "member"}
+
+
+class MembershipIndex:
+    def __init__(
+        self,
+        client: ChamaClient,
+        ttl_seconds: Optional[float] = None,
+        max_entries: Optional[int] = None,
+    ) -> None:
+        self._client = client
+        self._ttl = ttl_seconds if ttl_seconds is not None else float(os.getenv("CHAMA_MEMBERSHIP_TTL", "300"))
+        self._max_entries = max_entries or int(os.getenv("CHAMA_MEMBERSHIP_MAX_ENTRIES", "50000"))
+        self._entries: "OrderedDict[str, Tuple[Tuple[int, ...], float]]" = OrderedDict()
+        self._flight = SingleFlight(track_metrics=False)
+
+    def attach(self, indexer: "ChamaIndexer") -> None:
+        indexer.add_event_listener(self.apply_events)
+
+    async def chama_ids(self, address: str) -> List[int]:
+        key = address.lower()
+        entry = self._entries.get(key)
+        if entry is not None and entry[1] > time.monotonic():
+            self._entries.move_to_end(key)
+            return list(entry[0])
+
+        async def fetch() -> Tuple[int, ...]:
+            ids = tuple(await self._client.get_user_chama_ids(address))
+            self._store(key, ids)
+            return ids
+
+        return list(await self._flight.do(key, fetch))
+
+    async def chamas_for(self, address: str) -> List[ChamaSummary]:
+        """Summaries for every chama ``address`` belongs to, newest first."""
+        ids = sorted(await self.chama_ids(address), reverse=True)
+        return await self._client.get_chamas(ids) if ids else []
+
+    def apply_events(self, events: Sequence["ChamaEvent"], reorg: bool = False) -> None:
+        if reorg:
+            # Rolled-back joins are not listed per member.
+            self._entries.clear()
+            return
+        for event in events:
+            field = _MEMBERSHIP_EVENTS.get(event.name)
+            if field is None or field not in event.args:
+                continue
+            key = str(event.args[field]).lower()
+            entry = self._entries.get(key)
+            # Unknown addresses are read in full on their first lookup.
+            if entry is not None and event.chama_id not in entry[0]:
+                self._entries[key] = (entry[0] + (event.chama_id,), entry[1])
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def _store(self, key: str, ids: Tuple[int, ...]) -> None:
+        self._entries[key] = (ids, time.monotonic() + self._ttl)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
@@ -0,0 +1,27 @@
+"""
+web3 provider backed by a ``ProviderPool``.
+
+Kept apart from ``provider_pool`` so the pool can be imported without
+pulling in web3, which ``ChamaClient`` only loads once a chain is configured.
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+from web3.providers.async_base import AsyncJSONBaseProvider
+from web3.types import RPCEndpoint, RPCResponse
+
+from .provider_pool import ProviderPool
+
+
+class PooledAsyncProvider(AsyncJSONBaseProvider):
+    """web3 provider that sends every request through a ``ProviderPool``."""
+
+    def __init__(self, pool: ProviderPool) -> None:
+        super().__init__()
+        self.pool = pool
+
+    async def make_request(self, method: RPCEndpoint, params: Any) -> RPCResponse:
+        raw = await self.pool.post(self.encode_rpc_request(method, params))
+        return self.decode_rpc_response(raw)
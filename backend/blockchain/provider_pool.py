@@ -0,0 +1,224 @@
+"""
+Health-scored pool of JSON-RPC endpoints shared by ChamaClient and the indexer.
+
+``SEPOLIA_RPC_URLS`` (comma separated, falling back to ``SEPOLIA_RPC_URL``)
+lists the nodes. Every request goes out over one keep-alive ``aiohttp``
+session with connect/total timeouts, to the endpoint with the best score: an
+EWMA of its latency inflated by an EWMA of its transport error rate. An
+endpoint that fails ``CHAMA_RPC_FAILURE_THRESHOLD`` times in a row is skipped
+for ``CHAMA_RPC_COOLDOWN_SECONDS`` unless every endpoint is cooling down.
+
+Reads that have not answered after the hedge delay are re-sent once to the
+next best endpoint and the first reply wins; transport failures fail over to
+the next endpoint immediately. JSON-RPC error replies (reverts, rejected
+ranges) are returned to the caller as they are, since another node would
+answer the same. The client only issues reads, so hedging never duplicates a
+write.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import os
+import time
+from typing import Any, Dict, List, Optional, Sequence
+from urllib.parse import urlparse
+
+import aiohttp
+
+from services.metrics import rpc_endpoint_errors, rpc_endpoint_latency, rpc_endpoint_score, rpc_hedged_requests
+from services.tracing import span
+
+logger = logging.getLogger("chamas.rpc")
+
+# Status codes worth retrying on another node; anything else is the reply.
+RETRYABLE_STATUS = {408, 425, 429, 500, 502, 503, 504}
+
+
+class Endpoint:
+    __slots__ = ("url", "label", "latency", "error_rate", "failures", "cooldown_until", "inflight")
+
+    def __init__(self, url: str, label: str) -> None:
+        self.url = url
+        self.label = label
+        # Unmeasured endpoints score 0 so each one is tried early.
+        self.latency = 0.0
+        self.error_rate = 0.0
+        self.failures = 0
+        self.cooldown_until = 0.0
+        self.inflight = 0
+
+    @property
+    def score(self) -> float:
+        """Expected seconds per successful reply; lower is better."""
+        return (self.latency + 0.001 * self.inflight) * (1.0 + 10.0 * self.error_rate)
+
+
+class ProviderPool:
+    def __init__(
+        self,
+        urls: Sequence[str],
+        timeout_seconds: Optional[float] = None,
+        hedge_after_seconds: Optional[float] = None,
+        alpha: float = 0.2,
+        failure_threshold: Optional[int] = None,
+        cooldown_seconds: Optional[float] = None,
+    ) -> None:
+        if not urls:
+            raise ValueError("ProviderPool needs at least one RPC URL.")
+        self._endpoints = [Endpoint(url, label) for url, label in zip(urls, _labels(urls))]
+        self._timeout = timeout_seconds or float(os.getenv("CHAMA_RPC_TIMEOUT_SECONDS", "10"))
+        self._hedge_after = (
+            hedge_after_seconds
+            if hedge_after_seconds is not None
+            else float(os.getenv("CHAMA_RPC_HEDGE_MS", "300")) / 1000
+        )
+        self._alpha = alpha
+        self._failure_threshold = failure_threshold or int(os.getenv("CHAMA_RPC_FAILURE_THRESHOLD", "3"))
+        self._cooldown = cooldown_seconds if cooldown_seconds is not None else float(
+            os.getenv("CHAMA_RPC_COOLDOWN_SECONDS", "30")
+        )
+        self._session: Optional[aiohttp.ClientSession] = None
+
+    @classmethod
+    def from_env(cls, rpc_url: Optional[str] = None) -> Optional["ProviderPool"]:
+        raw = rpc_url or os.getenv("SEPOLIA_RPC_URLS") or os.getenv("SEPOLIA_RPC_URL") or ""
+        urls = [url.strip() for url in raw.split(",") if url.strip()]
+        return cls(urls) if urls else None
+
+    @property
+    def endpoints(self) -> List[Endpoint]:
+        return list(self._endpoints)
+
+    async def post(self, body: bytes) -> bytes:
+        """Send a JSON-RPC payload and return the raw reply of the first endpoint to answer."""
+        with span("rpc"):
+            return await self._post(body)
+
+    async def _post(self, body: bytes) -> bytes:
+        ranked = self._ranked()
+        candidates = iter(ranked)
+        tasks: Dict[asyncio.Future, Endpoint] = {}
+        hedged = False
+        last_error: Optional[BaseException] = None
+
+        def launch() -> bool:
+            endpoint = next(candidates, None)
+            if endpoint is None:
+                return False
+            tasks[asyncio.ensure_future(self._attempt(endpoint, body))] = endpoint
+            return True
+
+        launch()
+        primary = ranked[0]
+        try:
+            while tasks:
+                can_hedge = not hedged and self._hedge_after > 0 and len(ranked) > 1
+                done, _ = await asyncio.wait(
+                    tasks,
+                    timeout=self._hedge_after if can_hedge else None,
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+                if not done:
+                    hedged = launch()
+                    continue
+                for task in done:
+                    endpoint = tasks.pop(task)
+                    if task.exception() is None:
+                        if hedged:
+                            rpc_hedged_requests.labels(winner="primary" if endpoint is primary else "hedge").inc()
+                        return task.result()
+                    last_error = task.exception()
+                if not tasks:
+                    launch()
+        finally:
+            for task in tasks:
+                task.cancel()
+        assert last_error is not None
+        raise last_error
+
+    async def post_json(self, payload: Any) -> Any:
+        return json.loads(await self.post(json.dumps(payload).encode("utf-8")))
+
+    async def close(self) -> None:
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    def _ranked(self) -> List[Endpoint]:
+        now = time.monotonic()
+        available = [endpoint for endpoint in self._endpoints if endpoint.cooldown_until <= now]
+        cooling = [endpoint for endpoint in self._endpoints if endpoint.cooldown_until > now]
+        # Cooling endpoints stay as a last resort when everything else fails.
+        return sorted(available, key=lambda e: e.score) + sorted(cooling, key=lambda e: e.cooldown_until)
+
+    async def _attempt(self, endpoint: Endpoint, body: bytes) -> bytes:
+        session = self._http_session()
+        endpoint.inflight += 1
+        start = time.perf_counter()
+        try:
+            async with session.post(
+                endpoint.url, data=body, headers={"Content-Type": "application/json"}
+            ) as response:
+                if response.status in RETRYABLE_STATUS:
+                    raise aiohttp.ClientResponseError(
+                        response.request_info, response.history, status=response.status
+                    )
+                payload = await response.read()
+        except asyncio.CancelledError:
+            # Lost a hedge race: not a failure, but at least this slow.
+            self._observe_latency(endpoint, time.perf_counter() - start)
+            raise
+        except Exception as exc:
+            self._record(endpoint, time.perf_counter() - start, failed=True)
+            logger.info("RPC endpoint %s failed: %s", endpoint.label, exc)
+            raise
+        finally:
+            endpoint.inflight -= 1
+        self._record(endpoint, time.perf_counter() - start, failed=False)
+        return payload
+
+    def _observe_latency(self, endpoint: Endpoint, elapsed: float) -> None:
+        if endpoint.latency == 0.0:
+            endpoint.latency = elapsed
+        else:
+            endpoint.latency += self._alpha * (elapsed - endpoint.latency)
+
+    def _record(self, endpoint: Endpoint, elapsed: float, failed: bool) -> None:
+        alpha = self._alpha
+        self._observe_latency(endpoint, elapsed)
+        endpoint.error_rate += alpha * ((1.0 if failed else 0.0) - endpoint.error_rate)
+        if failed:
+            endpoint.failures += 1
+            rpc_endpoint_errors.labels(endpoint=endpoint.label).inc()
+            if endpoint.failures >= self._failure_threshold:
+                endpoint.cooldown_until = time.monotonic() + self._cooldown
+        else:
+            endpoint.failures = 0
+            endpoint.cooldown_until = 0.0
+            rpc_endpoint_latency.labels(endpoint=endpoint.label).observe(elapsed)
+        rpc_endpoint_score.labels(endpoint=endpoint.label).set(endpoint.score)
+
+    def _http_session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit_per_host=32, keepalive_timeout=60),
+                timeout=aiohttp.ClientTimeout(total=self._timeout, connect=min(3.0, self._timeout)),
+            )
+        return self._session
+
+
+def _labels(urls: Sequence[str]) -> List[str]:
+    """Metric labels from host names only; provider URLs often embed API keys."""
+    labels: List[str] = []
+    for index, url in enumerate(urls):
+        parsed = urlparse(url)
+        label = parsed.hostname or f"endpoint{index}"
+        if parsed.port:
+            label = f"{label}:{parsed.port}"
+        if label in labels:
+            label = f"{label}#{index}"
+        labels.append(label)
+    return labels
@@ -0,0 +1,144 @@
+"""
+Block-aware read cache and request coalescing for ChamaClient.
+
+Chain state only changes once per block, so ``getChamaInfo`` and
+``chamaCount`` results are cached until the latest block number advances. The
+block number itself is polled at most every ``block_poll_seconds``. The
+indexer and the chama feed also invalidate the entries an event touches as
+soon as they see it; block polling stays on regardless, since the indexer
+trails the head by its confirmations and runs in only one worker.
+
+``SingleFlight`` coalesces concurrent reads of the same key into one RPC call.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+from services.metrics import chama_cache_requests, chama_rpc_saved
+
+COUNT_KEY = ("count",)
+ACTIVE_KEY = ("active",)
+
+
+def chama_key(chama_id: int) -> Tuple[str, int]:
+    return ("chama", int(chama_id))
+
+
+def user_key(address: str) -> Tuple[str, str]:
+    return ("user", address.lower())
+
+
+class SingleFlight:
+    def __init__(self, track_metrics: bool = True) -> None:
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+        self._track_metrics = track_metrics
+
+    def join(self, key: Hashable) -> Tuple[asyncio.Future, bool]:
+        """Return the future for ``key`` and whether the caller owns (must resolve) it."""
+        future = self._inflight.get(key)
+        if future is not None:
+            return future, False
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        return future, True
+
+    def resolve(self, key: Hashable, value: Any = None, error: Optional[BaseException] = None) -> None:
+        future = self._inflight.pop(key, None)
+        if future is None or future.done():
+            return
+        if error is not None:
+            future.set_exception(error)
+            # Waiters re-raise it; mark retrieved so an unawaited future stays quiet.
+            future.exception()
+        else:
+            future.set_result(value)
+
+    async def do(self, key: Hashable, fetch: Callable[[], Awaitable[Any]]) -> Any:
+        future, owner = self.join(key)
+        if not owner:
+            if self._track_metrics:
+                chama_cache_requests.labels(result="coalesced").inc()
+                chama_rpc_saved.inc()
+            return await asyncio.shield(future)
+        try:
+            value = await fetch()
+        except BaseException as exc:
+            self.resolve(key, error=exc)
+            raise
+        self.resolve(key, value)
+        return value
+
+
+class BlockAwareCache:
+    def __init__(self, block_poll_seconds: float = 4.0, max_entries: int = 10_000) -> None:
+        self._poll = block_poll_seconds
+        self._max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._block: Optional[int] = None
+        self._checked_at = 0.0
+        self._generation = 0
+        self._block_flight = SingleFlight(track_metrics=False)
+        self.flight = SingleFlight()
+
+    @property
+    def block_number(self) -> Optional[int]:
+        return self._block
+
+    @property
+    def generation(self) -> int:
+        """Bumped on every invalidation; reads started under an older one are not stored."""
+        return self._generation
+
+    async def refresh(self, fetch_block: Callable[[], Awaitable[int]]) -> Optional[int]:
+        """Poll the head block if the last check is stale and drop entries when it moved."""
+        if time.monotonic() - self._checked_at < self._poll:
+            return self._block
+        try:
+            block = await self._block_flight.do("block", fetch_block)
+        except Exception:
+            # Without a head we cannot vouch for anything cached.
+            self.clear()
+            return None
+        self._checked_at = time.monotonic()
+        self.note_block(int(block))
+        return self._block
+
+    def note_block(self, block: int) -> None:
+        if self._block is not None and block <= self._block:
+            return
+        self._entries.clear()
+        self._generation += 1
+        self._block = block
+
+    def get(self, key: Hashable) -> Tuple[bool, Any]:
+        if key in self._entries:
+            self._entries.move_to_end(key)
+            chama_cache_requests.labels(result="hit").inc()
+            chama_rpc_saved.inc()
+            return True, self._entries[key]
+        chama_cache_requests.labels(result="miss").inc()
+        return False, None
+
+    def put(self, key: Hashable, value: Any, generation: Optional[int] = None) -> None:
+        if generation is not None and generation != self._generation:
+            return
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, key: Hashable) -> None:
+        self._entries.pop(key, None)
+        self._generation += 1
+
+    def invalidate_chama(self, chama_id: int) -> None:
+        self.invalidate(chama_key(chama_id))
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._generation += 1
+        self._checked_at = 0.0
@@ -0,0 +1,183 @@
+"""
+Per-process push feed of chama changes for ``GET /chamas/stream``.
+
+One follower per process watches the chain and fans ``ChamaSummary`` diffs
+out to every connected client, so N browsers cost one chain follower instead
+of N pollers. When the event indexer runs the feed rides on its listener;
+otherwise it polls ``eth_getLogs`` for ChamaFactory events itself, and only
+while someone is subscribed.
+
+Each subscriber has a bounded queue. A consumer that falls
+``CHAMA_FEED_QUEUE_SIZE`` messages behind has its backlog dropped and
+receives a single ``resync`` message telling it to refetch ``/chamas``, so a
+slow client never holds memory or delays the others.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+from eth_utils import to_checksum_address
+
+from services.metrics import chama_feed_messages, chama_feed_resyncs, chama_feed_subscribers
+
+from .chama_client import FACTORY_EVENTS_ABI, ChamaClient
+from .indexer import ChamaIndexer, EventDecoder
+from .read_cache import ACTIVE_KEY, COUNT_KEY, user_key
+
+logger = logging.getLogger("chamas.feed")
+
+
+class Subscription:
+    __slots__ = ("queue", "overflowed")
+
+    def __init__(self, max_pending: int) -> None:
+        self.queue: "asyncio.Queue[Dict[str, Any]]" = asyncio.Queue(maxsize=max_pending)
+        self.overflowed = False
+
+    def offer(self, message: Dict[str, Any]) -> None:
+        if self.overflowed:
+            return
+        try:
+            self.queue.put_nowait(message)
+        except asyncio.QueueFull:
+            # Replace the backlog with one resync; the client refetches.
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait({"type": "resync", "block": message.get("block")})
+            self.overflowed = True
+            chama_feed_resyncs.inc()
+
+    async def next(self, timeout: float) -> Optional[Dict[str, Any]]:
+        """The next message, or ``None`` if nothing arrived within ``timeout``."""
+        try:
+            message = await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+        if message["type"] == "resync":
+            self.overflowed = False
+        return message
+
+
+class ChamaFeed:
+    def __init__(
+        self,
+        client: ChamaClient,
+        queue_size: Optional[int] = None,
+        poll_seconds: Optional[float] = None,
+        max_range: Optional[int] = None,
+    ) -> None:
+        self._client = client
+        self._queue_size = queue_size or int(os.getenv("CHAMA_FEED_QUEUE_SIZE", "64"))
+        self._poll = poll_seconds or float(os.getenv("CHAMA_FEED_POLL_SECONDS", "4"))
+        self._max_range = max_range or int(os.getenv("CHAMA_INDEX_MAX_RANGE", "2000"))
+        self._subscribers: Set[Subscription] = set()
+        self._snapshot: Dict[int, bytes] = {}
+        self._block: Optional[int] = None
+        self._indexed = False
+        self._task: Optional[asyncio.Task] = None
+        self._pending: Set[asyncio.Task] = set()
+
+    @property
+    def block_number(self) -> Optional[int]:
+        return self._block
+
+    def attach(self, indexer: ChamaIndexer) -> None:
+        """Publish from the indexer's applied ranges instead of polling logs."""
+        indexer.add_listener(self._on_indexed)
+        self._indexed = True
+
+    def start(self) -> None:
+        if self._task is None and not self._indexed and self._client.web3 is not None:
+            self._task = asyncio.create_task(self._follow(), name="chama-feed")
+
+    async def stop(self) -> None:
+        tasks = list(self._pending) + ([self._task] if self._task is not None else [])
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._task = None
+
+    def subscribe(self) -> Subscription:
+        subscription = Subscription(self._queue_size)
+        self._subscribers.add(subscription)
+        chama_feed_subscribers.set(len(self._subscribers))
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        self._subscribers.discard(subscription)
+        chama_feed_subscribers.set(len(self._subscribers))
+
+    async def publish_changes(self, chama_ids: Iterable[int], block: int) -> None:
+        """Read the given chamas once and send the ones that changed to every subscriber."""
+        ids = sorted(set(chama_ids))
+        self._block = max(block, self._block or 0)
+        if not ids or not self._subscribers:
+            return
+        summaries = await self._client.get_chamas(ids)
+        changed: List[Dict[str, Any]] = []
+        for summary in summaries:
+            encoded = summary.to_json()
+            if self._snapshot.get(summary.id) != encoded:
+                self._snapshot[summary.id] = encoded
+                changed.append(summary.to_dict())
+        if changed:
+            self._broadcast({"type": "update", "block": block, "chamas": changed})
+
+    def _broadcast(self, message: Dict[str, Any]) -> None:
+        for subscription in list(self._subscribers):
+            subscription.offer(message)
+        chama_feed_messages.inc()
+
+    def _on_indexed(self, touched: Set[int], block: int) -> None:
+        if not touched:
+            self._block = max(block, self._block or 0)
+            return
+        task = asyncio.create_task(self.publish_changes(touched, block))
+        self._pending.add(task)
+        task.add_done_callback(self._pending.discard)
+
+    async def _follow(self) -> None:
+        web3 = self._client.web3
+        assert web3 is not None and self._client.factory_address is not None
+        address = to_checksum_address(self._client.factory_address)
+        decoder = EventDecoder(web3, FACTORY_EVENTS_ABI)
+        last: Optional[int] = None
+        while True:
+            await asyncio.sleep(self._poll)
+            if not self._subscribers:
+                # Nobody listening: stop following and restart from the head later.
+                last = None
+                continue
+            try:
+                head = int(await web3.eth.block_number)  # type: ignore[misc]
+                if last is None:
+                    last = self._block = head
+                    continue
+                if head <= last:
+                    continue
+                end = min(head, last + self._max_range)
+                logs = await web3.eth.get_logs(  # type: ignore[misc]
+                    {"address": address, "fromBlock": last + 1, "toBlock": end, "topics": [decoder.topics]}
+                )
+                events = [event for event in map(decoder.decode, logs) if event is not None]
+                touched = {event.chama_id for event in events}
+                cache = self._client.cache
+                for chama_id in touched:
+                    cache.invalidate_chama(chama_id)
+                for event in events:
+                    if event.name in ("ChamaCreated", "ChamaArchived"):
+                        cache.invalidate(COUNT_KEY)
+                        cache.invalidate(ACTIVE_KEY)
+                    for name in ("creator", "member"):
+                        if name in event.args:
+                            cache.invalidate(user_key(event.args[name]))
+                await self.publish_changes(touched, end)
+                last = end
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                logger.warning("Chama feed poll failed: %s", exc)
@@ -0,0 +1,73 @@
+"""
+Gunicorn settings for running the API on every core.
+
+    gunicorn -c gunicorn.conf.py main:app
+
+With ``PRELOAD_MODELS=1`` (the default) the master imports ``main`` and builds
+the Whisper, LLM and TTS services once, then forks ``WEB_CONCURRENCY``
+Uvicorn workers that share the weight pages copy-on-write. ``gc.freeze()``
+runs before the fork so the collector never writes to those objects' headers
+in the children. With ``PRELOAD_MODELS=0`` every worker builds its own copy at
+boot, in the background when ``WARMUP_MODELS=1``. CUDA cannot be used across a
+fork, so keep ``PRELOAD_MODELS=0`` on GPU hosts.
+
+Prometheus collectors switch to multiprocess mode: every process writes its
+samples to ``PROMETHEUS_MULTIPROC_DIR`` and ``/metrics`` aggregates them, so
+counters and histograms cover all workers. The directory is emptied here
+before the app (and ``prometheus_client``) is imported, so it never starts
+with files from a previous master.
+"""
+
+from __future__ import annotations
+
+import gc
+import os
+import shutil
+import sys
+import tempfile
+
+_metrics_dir = os.environ.setdefault(
+    "PROMETHEUS_MULTIPROC_DIR", os.path.join(tempfile.gettempdir(), "chamas-prometheus")
+)
+shutil.rmtree(_metrics_dir, ignore_errors=True)
+os.makedirs(_metrics_dir, exist_ok=True)
+
+bind = os.getenv("BIND", "0.0.0.0:8000")
+workers = int(os.getenv("WEB_CONCURRENCY", str(os.cpu_count() or 1)))
+worker_class = "uvicorn.workers.UvicornWorker"
+preload_app = os.getenv("PRELOAD_MODELS", "1") == "1"
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "120"))
+graceful_timeout = 30
+keepalive = 5
+
+
+def when_ready(server) -> None:
+    if preload_app:
+        import main
+
+        main.preload_models()
+        # Move everything built so far out of the collector's reach so that
+        # workers do not dirty shared pages by touching GC headers.
+        gc.freeze()
+
+
+def post_worker_init(worker) -> None:
+    # With WARMUP_MODELS=1 the worker loads its models in the background instead.
+    if not preload_app and os.getenv("WARMUP_MODELS", "1") != "1":
+        import main
+
+        main.preload_models()
+    # torch defaults to one thread per core in every worker; split the cores instead.
+    threads = int(os.getenv("TORCH_NUM_THREADS", str(max(1, (os.cpu_count() or 1) // workers))))
+    torch = sys.modules.get("torch")
+    if torch is not None:
+        torch.set_num_threads(threads)
+    else:
+        # Not imported yet (background warm-up); torch reads this when it is.
+        os.environ.setdefault("OMP_NUM_THREADS", str(threads))
+
+
+def child_exit(server, worker) -> None:
+    from prometheus_client import multiprocess
+
+    multiprocess.mark_process_dead(worker.pid)
@@ -0,0 +1,9 @@
+"""
+Load testing for the voice API without models, Redis or an RPC node.
+
+``stubs`` stands in for the backends with latencies drawn from configurable
+distributions, ``server`` runs the real API against them in process, and
+``driver`` replays a request trace at a target rate and reports latency
+percentiles, throughput and the per-stage split from ``Server-Timing``. Run
+it with ``scripts/load_test.py``.
+"""
@@ -0,0 +1,269 @@
+"""
+Open-loop replay of a request trace against ``/voice/process``, and its report.
+
+A trace is a list of ``TraceRequest``: when to send (seconds from the start),
+how long the clip is, and optionally its transcript, the conversation it
+belongs to and the caller's wallet. ``synthetic_trace`` draws one from a seed;
+``load_trace``/``save_trace`` read and write it as JSON lines, so a recorded
+trace or a synthetic one can be replayed unchanged:
+
+    {"at": 0.41, "seconds": 3.2, "transcript": "Salio la chama changu?", "session": "s7", "wallet": "0x…"}
+
+``audio`` may name a file to upload instead of a generated silent clip.
+
+Requests go out at their scheduled time whether or not earlier ones have
+finished, and latency is measured from that scheduled time. A server that
+falls behind therefore shows up in the percentiles instead of slowing the
+load down (no coordinated omission).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import math
+import random
+import time
+from collections import Counter
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+import aiohttp
+
+from .stubs import PHRASES, Distribution, make_wav
+
+
+@dataclass
+class TraceRequest:
+    at: float
+    seconds: float = 3.0
+    transcript: Optional[str] = None
+    session: Optional[str] = None
+    wallet: Optional[str] = None
+    language: str = "sw"
+    audio: Optional[str] = None
+
+
+@dataclass
+class Result:
+    scheduled: float
+    latency: float
+    status: int
+    send_lag: float = 0.0
+    stages: Dict[str, float] = field(default_factory=dict)
+    degraded: str = "none"
+    body_bytes: int = 0
+    error: Optional[str] = None
+
+
+def synthetic_trace(
+    rps: float,
+    duration: float,
+    seed: int = 0,
+    arrivals: str = "poisson",
+    clip_seconds: Optional[Distribution] = None,
+    followups: float = 0.3,
+    wallets: float = 0.5,
+) -> List[TraceRequest]:
+    """``rps`` requests a second for ``duration`` seconds; a ``followups`` share continue an earlier conversation."""
+    rng = random.Random(seed)
+    clip_seconds = clip_seconds or Distribution("lognormal", [4.0, 0.5], seed)
+    sessions: List[str] = []
+    session_wallets: Dict[str, Optional[str]] = {}
+    trace: List[TraceRequest] = []
+    at = 0.0
+    while True:
+        at += rng.expovariate(rps) if arrivals == "poisson" else 1.0 / rps
+        if at >= duration:
+            return trace
+        if sessions and rng.random() < followups:
+            session = rng.choice(sessions[-50:])
+        else:
+            session = f"s{len(sessions)}"
+            sessions.append(session)
+            session_wallets[session] = f"0x{rng.getrandbits(160):040x}" if rng.random() < wallets else None
+        trace.append(
+            TraceRequest(
+                at=round(at, 4),
+                seconds=round(min(30.0, max(0.5, clip_seconds.sample())), 2),
+                transcript=rng.choice(PHRASES),
+                session=session,
+                wallet=session_wallets[session],
+            )
+        )
+
+
+def load_trace(path: Path) -> List[TraceRequest]:
+    trace = []
+    with path.open(encoding="utf-8") as handle:
+        for line in handle:
+            if line.strip():
+                trace.append(TraceRequest(**json.loads(line)))
+    return sorted(trace, key=lambda request: request.at)
+
+
+def save_trace(trace: Sequence[TraceRequest], path: Path) -> None:
+    with path.open("w", encoding="utf-8") as handle:
+        for request in trace:
+            entry = {key: value for key, value in asdict(request).items() if value is not None}
+            handle.write(json.dumps(entry, ensure_ascii=False) + "\n")
+
+
+def parse_server_timing(header: str) -> Dict[str, float]:
+    """``asr;dur=812.4, llm;dur=640.0`` as seconds per name."""
+    stages: Dict[str, float] = {}
+    for entry in header.split(","):
+        name, _, params = entry.strip().partition(";")
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key == "dur" and name:
+                try:
+                    stages[name] = float(value) / 1000
+                except ValueError:
+                    pass
+    return stages
+
+
+async def wait_ready(url: str, timeout: float = 60.0) -> None:
+    deadline = time.monotonic() + timeout
+    async with aiohttp.ClientSession() as session:
+        while True:
+            try:
+                async with session.get(f"{url}/health/ready") as response:
+                    if response.status == 200:
+                        return
+            except aiohttp.ClientError:
+                pass
+            if time.monotonic() > deadline:
+                raise RuntimeError(f"{url} did not become ready within {timeout:.0f}s")
+            await asyncio.sleep(0.2)
+
+
+async def replay(
+    url: str, trace: Sequence[TraceRequest], connections: int = 256, timeout: float = 60.0
+) -> List[Result]:
+    """Send every request at its ``at`` offset and collect one ``Result`` each, in trace order."""
+    tokens: Dict[str, str] = {}
+    audio_files: Dict[str, bytes] = {}
+    connector = aiohttp.TCPConnector(limit=connections)
+    client_timeout = aiohttp.ClientTimeout(total=timeout)
+
+    async with aiohttp.ClientSession(connector=connector, timeout=client_timeout) as session:
+
+        async def send(request: TraceRequest, due: float) -> Result:
+            if request.audio:
+                if request.audio not in audio_files:
+                    audio_files[request.audio] = Path(request.audio).read_bytes()
+                payload = audio_files[request.audio]
+            else:
+                payload = make_wav(request.seconds, request.transcript)
+            form = aiohttp.FormData()
+            form.add_field("file", payload, filename=Path(request.audio or "clip.wav").name, content_type="audio/wav")
+            params = {"language": request.language}
+            if request.session and request.session in tokens:
+                params["session_id"] = tokens[request.session]
+            if request.wallet:
+                params["wallet_address"] = request.wallet
+            sent = time.perf_counter()
+            result = Result(scheduled=request.at, latency=0.0, status=0, send_lag=sent - due)
+            try:
+                async with session.post(f"{url}/voice/process", data=form, params=params) as response:
+                    body = await response.read()
+                    result.status = response.status
+                    result.body_bytes = len(body)
+                    result.stages = parse_server_timing(response.headers.get("Server-Timing", ""))
+                    result.degraded = response.headers.get("X-Degraded-Mode", "none")
+                    token = response.headers.get("X-Session-ID")
+                    if request.session and token:
+                        tokens.setdefault(request.session, token)
+            except (aiohttp.ClientError, asyncio.TimeoutError) as exc:
+                result.error = type(exc).__name__
+            result.latency = time.perf_counter() - due
+            return result
+
+        start = time.perf_counter()
+        tasks = []
+        for request in trace:
+            due = start + request.at
+            delay = due - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            tasks.append(asyncio.create_task(send(request, due)))
+        return list(await asyncio.gather(*tasks))
+
+
+def percentile(values: Sequence[float], q: float) -> float:
+    """Nearest-rank percentile; 0 for no values."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(q / 100 * len(ordered)) - 1)]
+
+
+def _spread_ms(values: Sequence[float]) -> Dict[str, float]:
+    return {
+        "p50": round(percentile(values, 50) * 1000, 1),
+        "p95": round(percentile(values, 95) * 1000, 1),
+        "p99": round(percentile(values, 99) * 1000, 1),
+        "max": round(max(values, default=0.0) * 1000, 1),
+    }
+
+
+def summarise(
+    results: Sequence[Result],
+    wall_seconds: float,
+    target_rps: Optional[float] = None,
+    loop_lag: Optional[Sequence[float]] = None,
+    backend_calls: Optional[Dict[str, int]] = None,
+) -> Dict[str, Any]:
+    ok = [result for result in results if result.status == 200]
+    stage_names: List[str] = []
+    for result in ok:
+        stage_names.extend(name for name in result.stages if name not in stage_names)
+    summary: Dict[str, Any] = {
+        "requests": len(results),
+        "targetRps": target_rps,
+        "wallSeconds": round(wall_seconds, 2),
+        "throughputRps": round(len(ok) / wall_seconds, 2) if wall_seconds > 0 else 0.0,
+        "statuses": dict(Counter(str(result.status or result.error) for result in results)),
+        "latencyMs": _spread_ms([result.latency for result in ok]),
+        "stagesMs": {
+            name: _spread_ms([result.stages[name] for result in ok if name in result.stages]) for name in stage_names
+        },
+        "degradedModes": dict(Counter(result.degraded for result in ok)),
+        "sendLagMs": _spread_ms([result.send_lag for result in results]),
+        "responseBytes": round(sum(result.body_bytes for result in ok) / len(ok)) if ok else 0,
+    }
+    if loop_lag is not None:
+        summary["eventLoopLagMs"] = _spread_ms(loop_lag)
+    if backend_calls is not None and results:
+        summary["backendCallsPerRequest"] = {
+            name: round(count / len(results), 2) for name, count in backend_calls.items()
+        }
+    return summary
+
+
+def format_report(summary: Dict[str, Any]) -> str:
+    def row(label: str, spread: Dict[str, float]) -> str:
+        return f"  {label:<24}{spread['p50']:>10.1f}{spread['p95']:>10.1f}{spread['p99']:>10.1f}{spread['max']:>10.1f}"
+
+    target = f" (target {summary['targetRps']:g}/s)" if summary.get("targetRps") else ""
+    lines = [
+        f"Requests       {summary['requests']} in {summary['wallSeconds']}s{target}",
+        f"Throughput     {summary['throughputRps']} successful/s",
+        f"Statuses       {', '.join(f'{key}: {value}' for key, value in sorted(summary['statuses'].items()))}",
+        f"Degraded       {', '.join(f'{key}: {value}' for key, value in sorted(summary['degradedModes'].items()))}",
+        f"Response size  {summary['responseBytes']} bytes on average",
+        "",
+        f"  {'ms':<24}{'p50':>10}{'p95':>10}{'p99':>10}{'max':>10}",
+        row("end to end", summary["latencyMs"]),
+    ]
+    lines.extend(row(name, spread) for name, spread in summary["stagesMs"].items())
+    lines.append(row("client send lag", summary["sendLagMs"]))
+    if "eventLoopLagMs" in summary:
+        lines.append(row("event loop lag", summary["eventLoopLagMs"]))
+    if "backendCallsPerRequest" in summary:
+        calls = ", ".join(f"{name} {count}" for name, count in summary["backendCallsPerRequest"].items())
+        lines.extend(["", f"Backend calls per request: {calls}"])
+    return "\n".join(lines)
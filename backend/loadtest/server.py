@@ -0,0 +1,151 @@
+"""
+The API with its backends swapped for ``loadtest.stubs``, served in process.
+
+``load_app`` must run before anything imports ``main``: the inference mode,
+rate limits and Redis URL are read when ``main`` is imported. The server runs
+uvicorn on its own thread and event loop, so the driver's client work stays
+off the loop being measured and ``LoopLagMonitor`` sees only the API's own
+stalls.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import functools
+import logging
+import os
+import socket
+import tempfile
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+from .stubs import Distribution, FakeASRService, FakeChamaClient, FakeLLMService, FakeRedis, FakeTTSService
+
+# Forced before main is imported: stubs only run inline, and the limiter must not be what saturates.
+ENVIRONMENT = {
+    "INFERENCE_MODE": "inline",
+    "RATE_LIMIT_VOICE": "1000000/second",
+    "RATE_LIMIT_DEFAULT": "1000000/second",
+    "CHAMA_INDEXER_ENABLED": "0",
+}
+UNSET = ("REDIS_URL", "PROMETHEUS_MULTIPROC_DIR")
+
+
+@dataclass
+class Stubs:
+    asr: FakeASRService
+    llm: FakeLLMService
+    tts: FakeTTSService
+    chain: FakeChamaClient
+    redis: FakeRedis
+
+    def calls(self) -> Dict[str, int]:
+        return {
+            "asr": self.asr.calls,
+            "llm": self.llm.calls,
+            "tts": self.tts.calls,
+            "chain": self.chain.calls,
+            "redis": self.redis.round_trips,
+        }
+
+
+def load_app(
+    asr: Distribution,
+    llm: Distribution,
+    tts: Distribution,
+    chain: Distribution,
+    redis: Distribution,
+    verbose: bool = False,
+) -> Tuple[Any, Stubs]:
+    """Import ``main`` with every backend replaced by a stub; returns the ASGI app and the stubs."""
+    os.environ.update(ENVIRONMENT)
+    for name in UNSET:
+        os.environ.pop(name, None)
+    os.environ.setdefault("HEALTH_PROBE_INTERVAL_SECONDS", "1")
+    os.environ.setdefault("BATCH_JOBS_DIR", os.path.join(tempfile.gettempdir(), "chamas-loadtest-batch"))
+
+    import main
+    from services.degradation import FALLBACK_ASR
+    from services.memory_service import ContextMemory
+    from services.rate_limit import RateLimiter
+
+    if not verbose:
+        # main logs every transcript and reply at INFO.
+        logging.getLogger("chamas").setLevel(logging.WARNING)
+
+    stubs = Stubs(
+        asr=FakeASRService(asr),
+        llm=FakeLLMService(llm),
+        tts=FakeTTSService(tts),
+        chain=FakeChamaClient(chain),
+        redis=FakeRedis(redis),
+    )
+    main.registry.register("asr", lambda: stubs.asr)
+    main.registry.register("llm", lambda: stubs.llm)
+    main.registry.register("tts", lambda: stubs.tts)
+    if main.inference.has_fallback_asr:
+        small = FakeASRService(asr, model_name="fake-asr-small", scale=1 / 3)
+        main.registry.register(FALLBACK_ASR, lambda: small)
+    main.registry.register("memory", functools.partial(ContextMemory, client=stubs.redis))
+    main.limiter = RateLimiter(client=stubs.redis)
+    main._chama_client = stubs.chain
+    return main.app, stubs
+
+
+class LoopLagMonitor:
+    """How late a periodic timer fires on the loop: time the loop spent blocked instead of running callbacks."""
+
+    def __init__(self, interval: float = 0.01) -> None:
+        self.interval = interval
+        self.samples: List[float] = []
+
+    async def run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            start = loop.time()
+            await asyncio.sleep(self.interval)
+            self.samples.append(max(0.0, loop.time() - start - self.interval))
+
+    def reset(self) -> None:
+        self.samples = []
+
+
+class InProcessServer:
+    """uvicorn serving ``app`` on 127.0.0.1 from a background thread."""
+
+    def __init__(self, app: Any, monitor: Optional[LoopLagMonitor] = None) -> None:
+        import uvicorn
+
+        self._server = uvicorn.Server(uvicorn.Config(app, log_level="warning", access_log=False, lifespan="on"))
+        self._monitor = monitor
+        self._socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self._socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self._socket.bind(("127.0.0.1", 0))
+        self._thread = threading.Thread(target=self._run, name="loadtest-server", daemon=True)
+        self.url = f"http://127.0.0.1:{self._socket.getsockname()[1]}"
+
+    def start(self, timeout: float = 30.0) -> str:
+        self._thread.start()
+        deadline = time.monotonic() + timeout
+        while not self._server.started:
+            if not self._thread.is_alive() or time.monotonic() > deadline:
+                raise RuntimeError("The in-process API server did not start")
+            time.sleep(0.05)
+        return self.url
+
+    def stop(self) -> None:
+        self._server.should_exit = True
+        self._thread.join(timeout=30)
+
+    def _run(self) -> None:
+        asyncio.run(self._serve())
+
+    async def _serve(self) -> None:
+        monitor = asyncio.create_task(self._monitor.run()) if self._monitor is not None else None
+        try:
+            await self._server.serve(sockets=[self._socket])
+        finally:
+            if monitor is not None:
+                monitor.cancel()
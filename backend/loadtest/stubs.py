@@ -0,0 +1,417 @@
+"""
+Stand-ins for the model services, Redis and the chain client.
+
+Each fake has the interface ``main`` uses and spends time according to a
+``Distribution``, so the orchestration layer (upload handling, scheduling,
+tracing, session memory, rate limiting, degradation) runs as in production
+while the expensive parts cost a known, repeatable amount. Model calls block
+their thread with ``time.sleep`` just as a real decode holds its thread, and
+run through ``asyncio.to_thread`` like the real services.
+
+Draws are keyed by the request content (transcript, prompt, text, wallet), so
+the same trace costs the same on every run whatever order requests finish in.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import functools
+import hashlib
+import math
+import random
+import struct
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from blockchain.chama_client import ChamaSummary
+from services.asr_service import ASRService, TranscriptionResult
+from services.llm_service import GenerationResult
+from services.rate_limit import TOKEN_BUCKET, audio_seconds
+from services.tts_service import TTSResult
+
+SAMPLE_RATE = 16000
+
+# Utterances for synthetic traces, covering every intent main._extract_intent knows.
+PHRASES = (
+    "Habari, nataka kujiunga na chama cha akiba cha kijiji chetu",
+    "Nawezaje kuchangia mchango wangu wa mwezi huu?",
+    "Salio la chama changu ni kiasi gani kwa sasa?",
+    "Niambie akiba ya chama chetu tafadhali",
+    "Mchango unaofuata ni lini na ni kiasi gani?",
+    "Chama ni nini na kinafanyaje kazi?",
+    "Sasa msee, niko na doh kidogo, nicheki vipi na chama",
+    "Je, naweza kukopa pesa kutoka kwa chama?",
+)
+
+
+class Distribution:
+    """
+    Random durations in seconds, written as ``kind:params``:
+
+    * ``fixed:0.2``
+    * ``uniform:0.1,0.3``
+    * ``normal:0.4,0.1`` (mean, standard deviation; negative draws become 0)
+    * ``lognormal:0.4,0.5`` (median, sigma of the underlying normal)
+    * ``exponential:0.2`` (mean)
+    """
+
+    KINDS = {"fixed": 1, "uniform": 2, "normal": 2, "lognormal": 2, "exponential": 1}
+
+    def __init__(self, kind: str, params: Sequence[float], seed: int = 0) -> None:
+        if kind not in self.KINDS or len(params) != self.KINDS[kind]:
+            raise ValueError(f"Unknown distribution {kind}:{','.join(map(str, params))}")
+        self.kind = kind
+        self.params = tuple(params)
+        self.seed = seed
+        self._rng = random.Random(seed)
+
+    @classmethod
+    def parse(cls, spec: str, seed: int = 0) -> "Distribution":
+        kind, _, raw = spec.strip().partition(":")
+        try:
+            params = [float(value) for value in raw.split(",") if value.strip()]
+        except ValueError as exc:
+            raise ValueError(f"Distribution must look like 'lognormal:0.4,0.5', got {spec!r}") from exc
+        return cls(kind, params, seed)
+
+    def sample(self, key: Optional[str] = None) -> float:
+        """One draw; with ``key`` the draw depends only on the key and the seed."""
+        rng = random.Random(f"{self.seed}|{key}") if key is not None else self._rng
+        a = self.params[0]
+        if self.kind == "fixed":
+            return a
+        if self.kind == "uniform":
+            return rng.uniform(a, self.params[1])
+        if self.kind == "normal":
+            return max(0.0, rng.gauss(a, self.params[1]))
+        if self.kind == "lognormal":
+            return rng.lognormvariate(math.log(a), self.params[1]) if a > 0 else 0.0
+        return rng.expovariate(1.0 / a) if a > 0 else 0.0
+
+    def __str__(self) -> str:
+        return f"{self.kind}:{','.join(f'{value:g}' for value in self.params)}"
+
+
+# --- audio -----------------------------------------------------------------
+
+
+def make_wav(seconds: float, transcript: Optional[str] = None) -> bytes:
+    """A silent 16 kHz mono WAV clip, with the words it "contains" in a LIST/INFO comment."""
+    data = bytes(2 * int(seconds * SAMPLE_RATE))
+    fmt = struct.pack("<HHIIHH", 1, 1, SAMPLE_RATE, SAMPLE_RATE * 2, 2, 16)
+    chunks = [b"fmt " + struct.pack("<I", len(fmt)) + fmt]
+    if transcript:
+        comment = transcript.encode("utf-8") + b"\x00"
+        comment += b"\x00" * (len(comment) & 1)
+        info = b"INFO" + b"ICMT" + struct.pack("<I", len(comment)) + comment
+        chunks.append(b"LIST" + struct.pack("<I", len(info)) + info)
+    chunks.append(b"data" + struct.pack("<I", len(data)) + data)
+    body = b"WAVE" + b"".join(chunks)
+    return b"RIFF" + struct.pack("<I", len(body)) + body
+
+
+def wav_transcript(payload: bytes) -> Optional[str]:
+    """The LIST/INFO comment written by ``make_wav``, if the clip has one."""
+    if payload[:4] != b"RIFF" or payload[8:12] != b"WAVE":
+        return None
+    offset = 12
+    while offset + 8 <= len(payload):
+        chunk, size = payload[offset : offset + 4], struct.unpack_from("<I", payload, offset + 4)[0]
+        if chunk == b"LIST" and payload[offset + 8 : offset + 12] == b"INFO":
+            inner, end = offset + 12, offset + 8 + size
+            while inner + 8 <= end:
+                name, length = payload[inner : inner + 4], struct.unpack_from("<I", payload, inner + 4)[0]
+                if name == b"ICMT":
+                    return payload[inner + 8 : inner + 8 + length].rstrip(b"\x00").decode("utf-8", "replace")
+                inner += 8 + length + (length & 1)
+        offset += 8 + size + (size & 1)
+    return None
+
+
+def _pick(options: Sequence[str], key: bytes) -> str:
+    return options[int.from_bytes(hashlib.blake2b(key, digest_size=4).digest(), "big") % len(options)]
+
+
+# --- model services ----------------------------------------------------------
+
+
+class _FakeService:
+    engine = "fake"
+
+    def __init__(self, latency: Distribution, model_name: str) -> None:
+        self.latency = latency
+        self.model_name = model_name
+        self.timings: Dict[str, float] = {}
+        self.calls = 0
+
+    @property
+    def is_ready(self) -> bool:
+        return True
+
+    @staticmethod
+    def backend_available() -> bool:
+        return True
+
+    def warm_up(self) -> None:
+        self.timings["warmup"] = 0.0
+
+    def _spend(self, seconds: float) -> None:
+        self.calls += 1
+        if seconds > 0:
+            time.sleep(seconds)
+
+
+class FakeASRService(_FakeService):
+    """``latency`` is seconds of compute per second of audio (the real-time factor), times ``scale``."""
+
+    def __init__(self, latency: Distribution, model_name: str = "fake-asr", scale: float = 1.0) -> None:
+        super().__init__(latency, model_name)
+        self.scale = scale
+
+    def transcribe(self, audio: Any, dialect_hint: Optional[str] = None) -> TranscriptionResult:
+        if isinstance(audio, Path):
+            payload = audio.read_bytes()
+            seconds = audio_seconds(payload)
+            text = wav_transcript(payload) or _pick(PHRASES, payload[:4096])
+        else:
+            seconds = len(audio) / SAMPLE_RATE
+            text = _pick(PHRASES, str(len(audio)).encode())
+        self._spend(self.latency.sample(f"{text}|{seconds:.3f}") * seconds * self.scale)
+        return TranscriptionResult(
+            text=text,
+            confidence=0.9,
+            dialect=ASRService._detect_dialect(text, fallback=dialect_hint),
+            raw={},
+            audio_seconds=seconds,
+        )
+
+    def transcribe_batch(self, audios: Sequence[Any], dialect_hint: Optional[str] = None) -> List[TranscriptionResult]:
+        return [self.transcribe(audio, dialect_hint=dialect_hint) for audio in audios]
+
+
+class FakeLLMService(_FakeService):
+    """``latency`` is seconds per call."""
+
+    def __init__(self, latency: Distribution, model_name: str = "fake-llm") -> None:
+        super().__init__(latency, model_name)
+
+    def complete(self, user_text: str, context: str, dialect: str) -> GenerationResult:
+        self._spend(self.latency.sample(f"{user_text}|{len(context)}"))
+        text = (
+            f"Asante kwa swali lako: \"{user_text}\". Chama chako kinaweza kukusaidia kuweka akiba pamoja "
+            "na wanachama wengine. Je, ungependa kujua zaidi kuhusu michango au kujiunga?"
+        )
+        prompt_chars = len(user_text) + len(context) + 400
+        return GenerationResult(text=text, prompt_tokens=prompt_chars // 4, output_tokens=len(text) // 4)
+
+
+class FakeTTSService(_FakeService):
+    """``latency`` is seconds per call; the audio is silent 16 kHz WAV, ``seconds_per_char`` long."""
+
+    def __init__(self, latency: Distribution, model_name: str = "fake-tts", seconds_per_char: float = 0.06) -> None:
+        super().__init__(latency, model_name)
+        self.seconds_per_char = seconds_per_char
+
+    def synthesise(self, text: str) -> TTSResult:
+        self._spend(self.latency.sample(text))
+        return TTSResult(audio=make_wav(len(text) * self.seconds_per_char), mime_type="audio/wav")
+
+
+# --- chain ---------------------------------------------------------------------
+
+
+class FakeChamaClient:
+    """Serves one to three made-up chamas per wallet after ``latency`` per read."""
+
+    def __init__(self, latency: Distribution) -> None:
+        self.latency = latency
+        self.calls = 0
+        self.web3 = None
+        self.factory_address = None
+
+    @property
+    def is_ready(self) -> bool:
+        return True
+
+    async def _read(self, key: str, count: bool = True) -> None:
+        self.calls += count
+        delay = self.latency.sample(key)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    async def healthcheck(self) -> bool:
+        await self._read("healthcheck", count=False)
+        return True
+
+    async def state_version(self) -> Optional[str]:
+        return None
+
+    async def get_user_chama_ids(self, address: str) -> List[int]:
+        await self._read(f"ids|{address}")
+        seed = int.from_bytes(hashlib.blake2b(address.lower().encode(), digest_size=4).digest(), "big")
+        return [1 + (seed + step * 7) % 50 for step in range(1 + seed % 3)]
+
+    async def get_chamas(self, chama_ids: Sequence[int]) -> List[ChamaSummary]:
+        await self._read(f"chamas|{','.join(map(str, chama_ids))}")
+        return [
+            ChamaSummary(
+                id=chama_id,
+                name=f"Chama {chama_id}",
+                owner="0x" + hashlib.sha1(str(chama_id).encode()).hexdigest(),
+                members=5 + chama_id % 20,
+                contribution_wei=(1 + chama_id % 5) * 10**16,
+                total_funds_wei=(5 + chama_id % 20) * (1 + chama_id % 5) * 10**16,
+                frequency=30,
+                active=True,
+            )
+            for chama_id in chama_ids
+        ]
+
+    async def close(self) -> None:
+        return None
+
+
+# --- redis -------------------------------------------------------------------
+
+
+class FakeRedis:
+    """
+    In-memory stand-in for the ``redis.asyncio`` client, covering the commands
+    ``ContextMemory`` uses and the rate limiter's token-bucket script. Every
+    round trip (``ping``, ``get``, ``execute``, a script call) waits ``latency``.
+    """
+
+    def __init__(self, latency: Optional[Distribution] = None) -> None:
+        self.latency = latency or Distribution("fixed", [0.0])
+        self.round_trips = 0
+        self._data: Dict[str, Any] = {}
+        self._expiry: Dict[str, float] = {}
+
+    async def _round_trip(self) -> None:
+        self.round_trips += 1
+        delay = self.latency.sample()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    async def ping(self) -> bool:
+        # Health probes ping on a timer; only request traffic counts as round trips.
+        delay = self.latency.sample()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        return True
+
+    def pipeline(self, transaction: bool = True) -> "FakePipeline":
+        return FakePipeline(self)
+
+    async def get(self, key: str) -> Optional[bytes]:
+        await self._round_trip()
+        return self._get(key)
+
+    def register_script(self, script: str) -> Any:
+        if script != TOKEN_BUCKET:
+            raise NotImplementedError("FakeRedis only runs the rate limiter's token-bucket script")
+        return self._token_bucket
+
+    async def aclose(self) -> None:
+        return None
+
+    async def _token_bucket(self, keys: Sequence[str], args: Sequence[float]) -> List[Any]:
+        await self._round_trip()
+        capacity, rate, cost, max_lease = (float(value) for value in args)
+        now = time.time()
+        state = self._value(keys[0]) or {}
+        tokens = min(capacity, state.get("tokens", capacity) + max(0.0, now - state.get("ts", now)) * rate)
+        allowed, retry, lease = 0, 0.0, 0
+        if tokens >= cost:
+            allowed = 1
+            tokens -= cost
+            spare = tokens - capacity / 2
+            if spare >= 1 and max_lease >= 1:
+                lease = int(min(max_lease, math.floor(spare)))
+                tokens -= lease
+        else:
+            retry = (cost - tokens) / rate
+        self._data[keys[0]] = {"tokens": tokens, "ts": now}
+        self._expiry[keys[0]] = now + capacity / rate + 1
+        return [allowed, str(retry).encode(), lease]
+
+    # Commands, applied when a pipeline executes.
+
+    def _value(self, key: str) -> Any:
+        deadline = self._expiry.get(key)
+        if deadline is not None and deadline <= time.time():
+            self._data.pop(key, None)
+            self._expiry.pop(key, None)
+        return self._data.get(key)
+
+    def _lpush(self, key: str, *values: Any) -> int:
+        items = self._value(key)
+        if items is None:
+            items = self._data[key] = []
+        for value in values:
+            items.insert(0, _encode(value))
+        return len(items)
+
+    def _ltrim(self, key: str, start: int, stop: int) -> bool:
+        items = self._value(key)
+        if items is not None:
+            self._data[key] = items[start : stop + 1 if stop != -1 else None]
+        return True
+
+    def _lrange(self, key: str, start: int, stop: int) -> List[bytes]:
+        items = self._value(key) or []
+        return list(items[start : stop + 1 if stop != -1 else None])
+
+    def _expire(self, key: str, seconds: float) -> bool:
+        if self._value(key) is None:
+            return False
+        self._expiry[key] = time.time() + seconds
+        return True
+
+    def _set(self, key: str, value: Any, ex: Optional[float] = None) -> bool:
+        self._data[key] = _encode(value)
+        if ex is not None:
+            self._expiry[key] = time.time() + ex
+        else:
+            self._expiry.pop(key, None)
+        return True
+
+    def _get(self, key: str) -> Optional[bytes]:
+        return self._value(key)
+
+    def _incr(self, key: str) -> int:
+        value = int(self._value(key) or 0) + 1
+        self._data[key] = _encode(value)
+        return value
+
+
+class FakePipeline:
+    """Queues commands and runs them together in one round trip, like a MULTI pipeline."""
+
+    def __init__(self, redis: FakeRedis) -> None:
+        self._redis = redis
+        self._commands: List[Tuple[str, Tuple[Any, ...], Dict[str, Any]]] = []
+
+    def _queue(self, name: str, *args: Any, **kwargs: Any) -> "FakePipeline":
+        self._commands.append((name, args, kwargs))
+        return self
+
+    lpush = functools.partialmethod(_queue, "_lpush")
+    ltrim = functools.partialmethod(_queue, "_ltrim")
+    lrange = functools.partialmethod(_queue, "_lrange")
+    expire = functools.partialmethod(_queue, "_expire")
+    set = functools.partialmethod(_queue, "_set")
+    get = functools.partialmethod(_queue, "_get")
+    incr = functools.partialmethod(_queue, "_incr")
+
+    async def execute(self) -> List[Any]:
+        await self._redis._round_trip()
+        commands, self._commands = self._commands, []
+        return [getattr(self._redis, name)(*args, **kwargs) for name, args, kwargs in commands]
+
+
+def _encode(value: Any) -> bytes:
+    if isinstance(value, bytes):
+        return value
+    return str(value).encode("utf-8")
@@ -4,49 +4,83 @@ FastAPI orchestration layer for the Chamas voice pipeline.
 
 from __future__ import annotations
 
-import gzip
+import asyncio
+import hashlib
+import hmac
+import importlib
+import json
 import logging
+import math
+import os
 import tempfile
 import time
 import uuid
+import zlib
+from contextlib import contextmanager
 from pathlib import Path
-from typing import AsyncIterator, Dict, Optional
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Sequence, Tuple
 from urllib.parse import quote
 
-from fastapi import Depends, FastAPI, File, HTTPException, Request, Response, UploadFile
+from fastapi import Depends, FastAPI, File, HTTPException, Query, Request, Response, UploadFile
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse, StreamingResponse
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
 from pydantic import BaseModel, Field, ValidationError, field_validator
-from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
-from slowapi import Limiter
-from slowapi.errors import RateLimitExceeded
-from slowapi.middleware import SlowAPIMiddleware
-from slowapi.util import get_remote_address
-
-from blockchain.chama_client import ChamaClient, ChamaSummary
-from services.asr_service import ASRService, TranscriptionResult
-from services.llm_service import LLMService
+from prometheus_client import CONTENT_TYPE_LATEST
+
+from blockchain.chama_client import ChamaClient, ChamaSummary, decode_cursor
+from blockchain.index_store import ChamaIndexStore, open_index_store
+from blockchain.indexer import ChamaIndexer
+from blockchain.membership import MembershipIndex
+from blockchain.subscription_hub import ChamaFeed
+from services.asr_service import TranscriptionResult
+from services.batch_jobs import (
+    ACTIVE as BATCH_ACTIVE,
+    ZIP_MAGIC,
+    BatchJobStore,
+    BatchRejected,
+    BatchRunner,
+    follow_results,
+)
+from services.degradation import FALLBACK_ASR, DegradationController, template_answer
+from services.health import HealthProber, Probe
+from services.inference_workers import (
+    SERVICES,
+    AudioDecodeError,
+    Inference,
+    InferenceUnavailable,
+    create_inference,
+)
 from services.memory_service import ContextMemory
 from services.metrics import (
-    asr_latency,
-    asr_wer,
-    intent_accuracy,
-    llm_latency,
+    degraded_responses,
+    observe_generation,
+    observe_synthesis,
+    observe_transcription,
+    render as render_metrics,
     session_active,
-    tts_latency,
+    voice_intents,
+    voice_latency,
     voice_requests,
 )
+from services.profiler import ContinuousProfiler, ProfilerBusy, capture as capture_profile
+from services.rate_limit import RateLimited, RateLimiter, audio_cost
+from services.registry import ServiceRegistry
 from services.security import decrypt_session, encrypt_session
-from services.tts_service import TTSService
+from services.tracing import Tracer, TracingMiddleware, span
+from services.warmup import TIMINGS, record as record_startup
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - not available on Windows
+    fcntl = None
 
 logger = logging.getLogger("chamas.voice")
 logging.basicConfig(level=logging.INFO)
 
 app = FastAPI(title="Chamas Voice API", version="0.1.0")
 
-limiter = Limiter(key_func=get_remote_address, default_limits=["10/minute"])
-app.state.limiter = limiter
-app.add_middleware(SlowAPIMiddleware)
+limiter = RateLimiter()
+degradation = DegradationController()
 
 app.add_middleware(
     CORSMiddleware,
@@ -61,17 +95,48 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+tracer = Tracer()
+# Added last so it wraps everything, CORS included.
+app.add_middleware(TracingMiddleware, tracer=tracer)
+
 
-@app.exception_handler(RateLimitExceeded)
-async def rate_limit_handler(request: Request, exc: RateLimitExceeded) -> JSONResponse:
+@app.exception_handler(RateLimited)
+async def rate_limit_handler(request: Request, exc: RateLimited) -> JSONResponse:
     return JSONResponse(
         status_code=429,
         content={"detail": "Rate limit exceeded. Tafadhali jaribu tena baada ya muda mfupi."},
+        headers={"Retry-After": str(max(1, math.ceil(exc.retry_after)))},
     )
 
 
+def _client_id(request: Request) -> str:
+    # Behind a load balancer, run uvicorn/gunicorn with --forwarded-allow-ips so
+    # this is the caller's address from X-Forwarded-For rather than the proxy's.
+    return request.client.host if request.client else "unknown"
+
+
+def require_admin(request: Request) -> None:
+    """Admin routes answer 404 unless ``ADMIN_TOKEN`` is set and sent as a bearer token."""
+    token = os.getenv("ADMIN_TOKEN")
+    if not token:
+        raise HTTPException(status_code=404, detail="Not Found")
+    scheme, _, supplied = request.headers.get("authorization", "").partition(" ")
+    if scheme.lower() != "bearer" or not hmac.compare_digest(supplied.encode(), token.encode()):
+        raise HTTPException(status_code=401, detail="Unauthorized", headers={"WWW-Authenticate": "Bearer"})
+
+
+def rate_limit(policy: str):
+    async def dependency(request: Request) -> None:
+        await limiter.acquire(limiter.policy(policy), _client_id(request))
+
+    return dependency
+
+
+MAX_VOICE_BYTES = 5 * 1024 * 1024
+
+
 class VoiceUpload(BaseModel):
-    file: bytes = Field(..., max_length=5 * 1024 * 1024)
+    file: bytes = Field(..., max_length=MAX_VOICE_BYTES)
     session_id: Optional[str] = Field(default=None, description="UUID v4 session identifier")
     language: str = Field(default="sw", pattern=r"^(sw|en)$")
 
@@ -101,72 +166,331 @@ class VoiceUpload(BaseModel):
         return value
 
 
-def get_asr() -> ASRService:
-    return ASRService()
+registry = ServiceRegistry()
+for _kind, _service in SERVICES.items():
+    registry.register(_kind, _service)
+registry.register("memory", ContextMemory)
+
+inference = create_inference(registry)
 
 
-def get_llm() -> LLMService:
-    return LLMService()
+def preload_models() -> None:
+    """Build the model-backed services now; gunicorn calls this before forking workers."""
+    inference.preload()
 
 
-def get_tts() -> TTSService:
-    return TTSService()
+def get_inference() -> Inference:
+    return inference
 
 
 def get_memory() -> ContextMemory:
-    return ContextMemory()
+    return registry.get("memory")
+
+
+_chama_client: Optional[ChamaClient] = None
+_index_store: Optional[ChamaIndexStore] = None
+_indexer: Optional[ChamaIndexer] = None
+_membership: Optional[MembershipIndex] = None
+_feed: Optional[ChamaFeed] = None
+
+# Comment line sent on idle /chamas/stream connections to keep proxies from closing them.
+FEED_HEARTBEAT_SECONDS = 15.0
 
 
 def get_chama_client() -> ChamaClient:
-    return ChamaClient()
+    # Shared so its HTTP session and read cache are reused across requests.
+    # Built on first use rather than at import so a preloading gunicorn master
+    # never opens the index database connection its workers would inherit.
+    global _chama_client, _index_store
+    if _chama_client is None:
+        _index_store = open_index_store()
+        _chama_client = ChamaClient(index_store=_index_store)
+    return _chama_client
+
+
+def get_feed() -> ChamaFeed:
+    global _feed
+    if _feed is None:
+        _feed = ChamaFeed(get_chama_client())
+    return _feed
+
+
+def get_membership() -> MembershipIndex:
+    global _membership
+    if _membership is None:
+        _membership = MembershipIndex(get_chama_client())
+    return _membership
+
+
+def _model_probe(kind: str) -> Probe:
+    async def probe() -> Tuple[bool, str]:
+        return inference.status(kind)
+
+    return probe
+
+
+async def _chama_probe() -> Tuple[bool, str]:
+    if _chain_task is None or not _chain_task.done():
+        return False, "starting"
+    chama = get_chama_client()
+    if not chama.is_ready:
+        return False, "unconfigured"
+    ok = await chama.healthcheck()
+    return ok, "ready" if ok else "unreachable"
+
+
+async def _memory_probe() -> Tuple[bool, str]:
+    ok = await get_memory().ping()
+    return ok, "ready" if ok else "unreachable"
 
 
-@app.get("/chamas")
+prober = HealthProber()
+for _kind in SERVICES:
+    prober.add(_kind, _model_probe(_kind))
+prober.add("chama", _chama_probe)
+prober.add("memory", _memory_probe)
+
+
+_indexer_lock: Optional[object] = None
+
+
+def _claim_indexer() -> bool:
+    """Let one worker per host run the indexer; the others serve reads from its store."""
+    global _indexer_lock
+    if fcntl is None:
+        return True
+    path = os.getenv("CHAMA_INDEXER_LOCK", os.path.join(tempfile.gettempdir(), "chamas-indexer.lock"))
+    handle = open(path, "a")
+    try:
+        fcntl.flock(handle, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        handle.close()
+        return False
+    # Held, not closed, for the life of the worker; the OS releases it on exit.
+    _indexer_lock = handle
+    return True
+
+
+_chain_task: Optional[asyncio.Task] = None
+_continuous_profiler = ContinuousProfiler.from_env()
+
+# /voice/process turns in flight in this process; bulk jobs hold back while there are any.
+_interactive_turns = 0
+
+
+@contextmanager
+def _interactive_turn() -> Iterator[None]:
+    global _interactive_turns
+    _interactive_turns += 1
+    try:
+        yield
+    finally:
+        _interactive_turns -= 1
+
+
+async def _batch_reply(transcription: TranscriptionResult) -> Tuple[str, str]:
+    intent = _extract_intent(transcription.text)
+    text = await _render_response(
+        transcription=transcription, context="", intent=intent, chama_info=None, inference=inference, priority="bulk"
+    )
+    return intent, text
+
+
+batch_store = BatchJobStore()
+batch_runner = BatchRunner(batch_store, inference, _batch_reply, busy=lambda: _interactive_turns > 0)
+
+
+async def _start_chain() -> None:
+    """Import web3 off the event loop, then build the chain client, feed and indexer."""
+    start = time.perf_counter()
+    await asyncio.to_thread(importlib.import_module, "web3")
+    record_startup("chama", {"import": time.perf_counter() - start})
+    try:
+        _start_chain_services()
+    except Exception:
+        logger.exception("Could not start the chain client; reads will retry it")
+
+
+def _start_chain_services() -> None:
+    global _indexer
+    chama = get_chama_client()
+    feed = get_feed()
+    if (
+        os.getenv("CHAMA_INDEXER_ENABLED", "0") == "1"
+        and _index_store is not None
+        and chama.web3 is not None
+        and _claim_indexer()
+    ):
+        _indexer = ChamaIndexer(chama, _index_store)
+        get_membership().attach(_indexer)
+        feed.attach(_indexer)
+        _indexer.start()
+    feed.start()
+
+
+@app.on_event("startup")
+async def start_background() -> None:
+    # Nothing slow runs here, so the port opens and /health/live answers at
+    # once; models and the chain client come up in the background.
+    global _chain_task
+    _chain_task = asyncio.create_task(_start_chain())
+    inference.start()
+    prober.start()
+    batch_runner.start()
+    if _continuous_profiler is not None:
+        _continuous_profiler.start()
+
+
+@app.on_event("shutdown")
+async def close_chama_client() -> None:
+    await batch_runner.stop()
+    await prober.stop()
+    await inference.stop()
+    if _chain_task is not None and not _chain_task.done():
+        _chain_task.cancel()
+        await asyncio.gather(_chain_task, return_exceptions=True)
+    tracer.shutdown()
+    if _continuous_profiler is not None:
+        await asyncio.to_thread(_continuous_profiler.stop)
+    if _feed is not None:
+        await _feed.stop()
+    if _indexer is not None:
+        await _indexer.stop()
+    if _chama_client is not None:
+        await _chama_client.close()
+
+
+def _decode_cursor(cursor: str) -> int:
+    try:
+        return decode_cursor(cursor)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail="Invalid cursor.") from exc
+
+
+def _checked_address(value: Optional[str], field: str) -> Optional[str]:
+    if value is None:
+        return None
+    if not ChamaClient.is_address(value):
+        raise HTTPException(status_code=422, detail=f"{field} must be a valid address.")
+    return value.lower()
+
+
+@app.get("/chamas", dependencies=[Depends(rate_limit("default"))])
 async def list_chamas(
-    limit: int = 6,
+    request: Request,
+    limit: int = Query(6, ge=1, le=100),
+    cursor: Optional[str] = None,
+    active: Optional[bool] = None,
+    owner: Optional[str] = None,
+    member: Optional[str] = None,
     chama: ChamaClient = Depends(get_chama_client),
-) -> Dict[str, object]:
+) -> Response:
+    if not chama.is_ready:
+        raise HTTPException(status_code=503, detail="Blockchain client not configured.")
+
+    before = _decode_cursor(cursor) if cursor else None
+    owner = _checked_address(owner, "owner")
+    member = _checked_address(member, "member")
+
+    # The ETag covers the chain/index state and the normalised query, so a
+    # poll that matches it is answered without reading any chamas.
+    version = await chama.state_version()
+    query = f"{limit}|{before}|{active}|{owner}|{member}"
+    etag = f'W/"{hashlib.sha1(f"{version}|{query}".encode("utf-8")).hexdigest()[:20]}"' if version else None
+    headers = {"Cache-Control": "no-cache"}
+    if etag is not None:
+        headers["ETag"] = etag
+        if etag in request.headers.get("if-none-match", ""):
+            return Response(status_code=304, headers=headers)
+
+    body, complete = await chama.page_json(
+        limit=limit, before=before, active=active, owner=owner, member=member, version=version
+    )
+    if not complete:
+        # Some chamas could not be read; a validator would keep this page for the whole block.
+        headers.pop("ETag", None)
+    elif etag is None:
+        headers["ETag"] = f'W/"{hashlib.sha1(body).hexdigest()[:20]}"'
+        if headers["ETag"] in request.headers.get("if-none-match", ""):
+            return Response(status_code=304, headers=headers)
+    return Response(body, media_type="application/json", headers=headers)
+
+
+@app.get("/chamas/stream", dependencies=[Depends(rate_limit("default"))])
+async def stream_chamas(
+    request: Request,
+    chama: ChamaClient = Depends(get_chama_client),
+    feed: ChamaFeed = Depends(get_feed),
+) -> StreamingResponse:
+    """Server-sent events with changed chamas; replaces polling ``/chamas``."""
     if not chama.is_ready:
         raise HTTPException(status_code=503, detail="Blockchain client not configured.")
 
-    summaries = await chama.list_chamas(limit=limit)
-    return {"chamas": [summary.to_dict() for summary in summaries]}
+    async def events() -> AsyncIterator[bytes]:
+        # Subscribed only once the body is iterated, so a client gone before then leaves nothing behind.
+        subscription = feed.subscribe()
+        try:
+            yield _sse("ready", {"block": feed.block_number})
+            while not await request.is_disconnected():
+                message = await subscription.next(FEED_HEARTBEAT_SECONDS)
+                if message is None:
+                    yield b": ping\n\n"
+                else:
+                    yield _sse(message["type"], message)
+        finally:
+            feed.unsubscribe(subscription)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+def _sse(event: str, payload: Dict[str, object]) -> bytes:
+    return f"event: {event}\ndata: {json.dumps(payload, separators=(',', ':'))}\n\n".encode("utf-8")
 
 
 @app.post("/voice/process")
-@limiter.limit("10/minute")
 async def process_voice(
     request: Request,
     file: UploadFile = File(...),
     session_id: Optional[str] = None,
     language: str = "sw",
-    asr: ASRService = Depends(get_asr),
-    llm: LLMService = Depends(get_llm),
-    tts: TTSService = Depends(get_tts),
+    wallet_address: Optional[str] = None,
+    inference: Inference = Depends(get_inference),
     memory: ContextMemory = Depends(get_memory),
     chama: ChamaClient = Depends(get_chama_client),
+    membership: MembershipIndex = Depends(get_membership),
 ):
-    if not asr.is_ready:
+    # A saturated or missing LLM/TTS stage degrades the answer instead of failing it.
+    if not inference.is_ready("asr") and not (inference.has_fallback_asr and inference.is_ready(FALLBACK_ASR)):
         raise HTTPException(status_code=503, detail="ASR service is not ready.")
-    if not llm.is_ready:
-        raise HTTPException(status_code=503, detail="LLM service is not ready.")
-    if not tts.is_ready:
-        raise HTTPException(status_code=503, detail="TTS service is not ready.")
+    modes: List[str] = []
 
-    tmp_path: Optional[Path] = None
     encoding_header = request.headers.get("content-encoding", "").lower()
 
-    with session_active.track_inprogress():
+    with session_active.track_inprogress(), _interactive_turn():
+        started = time.perf_counter()
         try:
-            payload = await file.read()
+            # The base token is charged before the body is read, so a throttled client costs no read or inflate.
+            with span("ratelimit"):
+                await limiter.acquire(limiter.policy("voice"), _client_id(request))
+            with span("upload"):
+                payload = await file.read()
             if "gzip" in encoding_header:
-                try:
-                    payload = gzip.decompress(payload)
-                except OSError as exc:  # pragma: no cover - invalid gzip
-                    voice_requests.labels(status="invalid").inc()
-                    raise HTTPException(status_code=400, detail="Invalid gzip audio payload") from exc
+                with span("decompress"):
+                    payload = _gunzip(payload, MAX_VOICE_BYTES)
+            # The rest of the cost depends on the clip's length.
+            extra_cost = audio_cost(payload) - 1.0
+            if extra_cost > 0:
+                with span("ratelimit.audio"):
+                    await limiter.acquire(limiter.policy("voice"), _client_id(request), extra_cost)
 
             candidate_session = decrypt_session(session_id) if session_id else None
+            if wallet_address is not None and not ChamaClient.is_address(wallet_address):
+                voice_requests.labels(status="invalid").inc()
+                raise HTTPException(status_code=422, detail="wallet_address must be a valid address.")
 
             try:
                 voice_upload = VoiceUpload(file=payload, session_id=candidate_session, language=language)
@@ -175,41 +499,73 @@ async def process_voice(
                 raise HTTPException(status_code=422, detail=exc.errors()) from exc
 
             session = voice_upload.session_id or str(uuid.uuid4())
-            tmp_path = _save_temp_file(payload, Path(file.filename or "audio.wav").suffix or ".wav")
-
+            small_asr = degradation.shed("asr", inference)
+            if small_asr:
+                modes.append("small-asr")
             asr_start = time.perf_counter()
-            transcription = asr.transcribe(tmp_path)
-            asr_latency.observe(time.perf_counter() - asr_start)
-            asr_wer.set(max(0.0, 1 - transcription.confidence))
+            try:
+                with span("asr", bytes=len(payload)):
+                    transcription = await inference.transcribe(
+                        payload, Path(file.filename or "audio.wav").suffix or ".wav", fallback=small_asr
+                    )
+            except AudioDecodeError as exc:
+                voice_requests.labels(status="invalid").inc()
+                raise HTTPException(status_code=422, detail=f"Could not decode audio: {exc}") from exc
+            asr_seconds = time.perf_counter() - asr_start
+            if not small_asr:
+                degradation.observe("asr", asr_seconds)
+            # Model time only: the scheduler and worker queues are in inference_scheduler_wait/queue_wait.
+            observe_transcription(
+                transcription.compute_seconds,
+                transcription.audio_seconds,
+                transcription.confidence,
+                transcription.dialect,
+                *inference.labels(FALLBACK_ASR if small_asr else "asr"),
+            )
 
             logger.info("ASR => %s", transcription.text)
 
-            context = memory.recent_context(session)
+            with span("memory.context"):
+                context, bound_wallet = await memory.context_and_wallet(session)
+            wallet = wallet_address or bound_wallet
             intent = _extract_intent(transcription.text)
-            intent_accuracy.set(0.87)
-            chama_info = await _resolve_intent(intent=intent, chama_client=chama)
-
-            llm_start = time.perf_counter()
-            ai_response = _render_response(
-                transcription=transcription,
-                context=context,
-                intent=intent,
-                chama_info=chama_info,
-                llm=llm,
-            )
-            llm_latency.observe(time.perf_counter() - llm_start)
-
-            memory.append_turn(
-                session_id=session,
-                user_text=transcription.text,
-                ai_text=ai_response,
-                dialect=transcription.dialect,
-            )
-            memory.append_intent(session_id=session, intent=intent, confidence=0.85)
-
-            tts_start = time.perf_counter()
-            tts_result = tts.synthesise(ai_response)
-            tts_latency.observe(time.perf_counter() - tts_start)
+            voice_intents.labels(intent=intent, dialect=transcription.dialect).inc()
+            with span("chain", intent=intent):
+                chama_info = await _resolve_intent(
+                    intent=intent, wallet=wallet, chama_client=chama, membership=membership
+                )
+
+            with span("llm"):
+                ai_response = await _render_response(
+                    transcription=transcription,
+                    context=context,
+                    intent=intent,
+                    chama_info=chama_info,
+                    inference=inference,
+                    modes=modes,
+                )
+
+            with span("memory.record"):
+                await memory.record_exchange(
+                    session_id=session,
+                    user_text=transcription.text,
+                    ai_text=ai_response,
+                    dialect=transcription.dialect,
+                    intent=intent,
+                    confidence=0.85,
+                    wallet=wallet_address if wallet_address and wallet_address != bound_wallet else None,
+                )
+
+            tts_result = None
+            if degradation.shed("tts", inference):
+                modes.append("text-only")
+            else:
+                tts_start = time.perf_counter()
+                with span("tts"):
+                    tts_result = await inference.synthesise(ai_response)
+                tts_seconds = time.perf_counter() - tts_start
+                degradation.observe("tts", tts_seconds)
+                observe_synthesis(tts_seconds, len(ai_response), *inference.labels("tts"))
 
             headers = {
                 "X-Session-ID": encrypt_session(session),
@@ -218,11 +574,27 @@ async def process_voice(
                 "X-Confidence": f"{transcription.confidence:.2f}",
                 "X-Response-Text": quote(ai_response),
                 "X-Transcript": quote(transcription.text),
+                "X-Degraded-Mode": ",".join(modes) or "none",
             }
 
             logger.info("LLM <= %s", ai_response)
             voice_requests.labels(status="success").inc()
-
+            voice_latency.observe(time.perf_counter() - started)
+            for mode in modes:
+                degraded_responses.labels(mode=mode).inc()
+
+            if tts_result is None:
+                return JSONResponse(
+                    {
+                        "transcript": transcription.text,
+                        "response": ai_response,
+                        "intent": intent,
+                        "dialect": transcription.dialect,
+                        "confidence": round(transcription.confidence, 2),
+                        "degradedMode": modes,
+                    },
+                    headers=headers,
+                )
             return StreamingResponse(
                 _iter_audio(tts_result.audio),
                 media_type=tts_result.mime_type,
@@ -232,40 +604,83 @@ async def process_voice(
             if exc.status_code >= 500:
                 voice_requests.labels(status="error").inc()
             raise
+        except RateLimited:
+            voice_requests.labels(status="limited").inc()
+            raise
+        except InferenceUnavailable as exc:
+            voice_requests.labels(status="error").inc()
+            logger.warning("Inference unavailable: %s", exc)
+            raise HTTPException(status_code=503, detail=str(exc)) from exc
         except Exception as exc:
             voice_requests.labels(status="error").inc()
             logger.exception("Voice pipeline error: %s", exc)
             raise
-        finally:
-            if tmp_path is not None:
-                tmp_path.unlink(missing_ok=True)
-
-
-def _save_temp_file(content: bytes, suffix: str) -> Path:
-    tmp = tempfile.NamedTemporaryFile(delete=False, suffix=suffix)
-    tmp.write(content)
-    tmp.close()
-    return Path(tmp.name)
 
 
-def _render_response(
+def _gunzip(payload: bytes, limit: int) -> bytes:
+    """Inflate a gzip body, refusing to produce more than ``limit`` bytes."""
+    inflater = zlib.decompressobj(16 + zlib.MAX_WBITS)
+    try:
+        out = inflater.decompress(payload, limit + 1)
+    except zlib.error as exc:
+        voice_requests.labels(status="invalid").inc()
+        raise HTTPException(status_code=400, detail="Invalid gzip audio payload") from exc
+    if len(out) > limit:
+        voice_requests.labels(status="invalid").inc()
+        raise HTTPException(status_code=413, detail=f"Audio is larger than {limit} bytes once decompressed.")
+    if not inflater.eof:
+        voice_requests.labels(status="invalid").inc()
+        raise HTTPException(status_code=400, detail="Invalid gzip audio payload")
+    return out
+
+
+async def _render_response(
     transcription: TranscriptionResult,
     context: str,
     intent: str,
-    chama_info: Optional[ChamaSummary],
-    llm: LLMService,
+    chama_info: Optional[Sequence[ChamaSummary]],
+    inference: Inference,
+    priority: str = "interactive",
+    modes: Optional[List[str]] = None,
 ) -> str:
+    """The reply text; with ``modes`` given, an overloaded LLM is replaced by a template and noted there."""
     if intent == "check_balance" and chama_info is not None:
-        return (
-            f"Kwa sasa chama {chama_info.name} kina wanachama {chama_info.members} "
-            f"na michango ya {chama_info.contribution} ETH. Je, ungependa kuchangia sasa?"
+        if not chama_info:
+            return "Sijapata chama chochote kwenye pochi yako. Je, ungependa kujiunga na chama?"
+        if len(chama_info) == 1:
+            summary = chama_info[0]
+            return (
+                f"Kwa sasa chama {summary.name} kina wanachama {summary.members} "
+                f"na akiba ya {_format_eth(summary.total_funds_eth)} ETH. Je, ungependa kuchangia sasa?"
+            )
+        details = "; ".join(
+            f"{summary.name}: wanachama {summary.members}, akiba {_format_eth(summary.total_funds_eth)} ETH"
+            for summary in chama_info
         )
+        return f"Uko kwenye chama {len(chama_info)}. {details}. Je, ungependa kuchangia sasa?"
+
+    if modes is not None and degradation.shed("llm", inference):
+        modes.append("template-answer")
+        return template_answer(intent)
 
-    return llm.generate(
+    llm_start = time.perf_counter()
+    generation = await inference.generate(
         user_text=transcription.text,
         context=context,
         dialect=transcription.dialect,
+        priority=priority,
     )
+    llm_seconds = time.perf_counter() - llm_start
+    if modes is not None:
+        degradation.observe("llm", llm_seconds)
+    observe_generation(
+        llm_seconds,
+        generation.prompt_tokens,
+        generation.output_tokens,
+        intent,
+        *inference.labels("llm"),
+    )
+    return generation.text
 
 
 def _extract_intent(text: str) -> str:
@@ -279,18 +694,98 @@ def _extract_intent(text: str) -> str:
     return "general_query"
 
 
-async def _resolve_intent(intent: str, chama_client: ChamaClient) -> Optional[ChamaSummary]:
-    if intent != "check_balance":
+def _format_eth(amount: object) -> str:
+    return f"{float(amount):.4f}".rstrip("0").rstrip(".")
+
+
+async def _resolve_intent(
+    intent: str,
+    wallet: Optional[str],
+    chama_client: ChamaClient,
+    membership: MembershipIndex,
+) -> Optional[List[ChamaSummary]]:
+    """The speaker's chamas for balance questions; ``None`` when they cannot be looked up."""
+    if intent != "check_balance" or wallet is None:
         return None
     if not chama_client.is_ready:
         return None
     try:
-        return await chama_client.get_chama(1)
+        return await membership.chamas_for(wallet)
     except Exception as exc:
         logger.warning("Failed to fetch chama info: %s", exc)
         return None
 
 
+def _public_job(status: Dict[str, Any]) -> Dict[str, Any]:
+    job = {key: value for key, value in status.items() if key != "pid"}
+    job["resultsUrl"] = f"/batch/jobs/{status['id']}/results"
+    return job
+
+
+def _batch_job(job_id: str) -> Dict[str, Any]:
+    status = batch_store.status(job_id)
+    if status is None:
+        raise HTTPException(status_code=404, detail="Batch job not found.")
+    return status
+
+
+async def _read_uploads(files: List[UploadFile]) -> List[Tuple[str, bytes]]:
+    """Read the uploads into memory once their declared sizes fit the job limits."""
+    declared = []
+    for index, upload in enumerate(files):
+        archive = await upload.read(len(ZIP_MAGIC)) == ZIP_MAGIC
+        await upload.seek(0)
+        declared.append((upload.filename or f"clip-{index}", upload.size, archive))
+    batch_store.check_sizes(declared)
+    return [(name, await upload.read()) for (name, _, _), upload in zip(declared, files)]
+
+
+@app.post("/batch/jobs", status_code=202, dependencies=[Depends(rate_limit("batch"))])
+async def create_batch_job(
+    files: List[UploadFile] = File(...),
+    respond: bool = Query(True, description="Add the intent and the assistant's reply to each transcript"),
+    synthesise: bool = Query(False, description="Add base64 TTS audio of each reply; implies respond"),
+    inference: Inference = Depends(get_inference),
+) -> Dict[str, Any]:
+    """Queue recorded clips, or zip archives of them, for bulk transcription."""
+    if not inference.is_ready("asr"):
+        raise HTTPException(status_code=503, detail="ASR service is not ready.")
+    try:
+        uploads = await _read_uploads(files)
+        # Inflating archives is CPU and memory heavy; keep it off the event loop.
+        clips = await asyncio.to_thread(batch_store.unpack, uploads)
+    except BatchRejected as exc:
+        raise HTTPException(status_code=exc.status_code, detail=str(exc)) from exc
+    options = {"respond": respond or synthesise, "synthesise": synthesise}
+    status = await asyncio.to_thread(batch_store.create, clips, options)
+    batch_runner.submit(status["id"])
+    return _public_job(status)
+
+
+@app.get("/batch/jobs/{job_id}", dependencies=[Depends(rate_limit("default"))])
+async def get_batch_job(job_id: str) -> Dict[str, Any]:
+    return _public_job(_batch_job(job_id))
+
+
+@app.get("/batch/jobs/{job_id}/results", dependencies=[Depends(rate_limit("default"))])
+async def get_batch_results(job_id: str) -> StreamingResponse:
+    """One JSON line per clip, streamed as clips finish until the job ends."""
+    _batch_job(job_id)
+    return StreamingResponse(
+        follow_results(batch_store, job_id),
+        media_type="application/x-ndjson",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@app.delete("/batch/jobs/{job_id}", dependencies=[Depends(rate_limit("default"))])
+async def cancel_batch_job(job_id: str) -> Dict[str, Any]:
+    status = _batch_job(job_id)
+    if status["status"] in BATCH_ACTIVE:
+        status = batch_store.cancel(job_id)
+    return _public_job(status)
+
+
 def _iter_audio(payload: bytes) -> AsyncIterator[bytes]:
     async def generator() -> AsyncIterator[bytes]:
         yield payload
@@ -300,22 +795,60 @@ def _iter_audio(payload: bytes) -> AsyncIterator[bytes]:
 
 @app.get("/metrics")
 async def metrics() -> Response:
-    return Response(generate_latest(), media_type=CONTENT_TYPE_LATEST)
+    return Response(render_metrics(), media_type=CONTENT_TYPE_LATEST)
 
 
 @app.get("/health")
-async def health(
-    asr: ASRService = Depends(get_asr),
-    llm: LLMService = Depends(get_llm),
-    tts: TTSService = Depends(get_tts),
-    chama: ChamaClient = Depends(get_chama_client),
+async def health() -> Dict[str, object]:
+    snapshot = prober.snapshot()
+    return {name: snapshot[name].ok if name in snapshot else False for name in ("asr", "llm", "tts", "chama")}
+
+
+@app.get("/debug/traces", dependencies=[Depends(require_admin)])
+async def debug_traces(
+    limit: int = Query(50, ge=1, le=500),
+    min_ms: float = Query(0.0, ge=0.0),
 ) -> Dict[str, object]:
-    chama_ok = chama.is_ready and await chama.healthcheck()
-    return {
-        "asr": asr.is_ready,
-        "llm": llm.is_ready,
-        "tts": tts.is_ready,
-        "chama": chama_ok,
-    }
+    if os.getenv("TRACE_DEBUG_ENDPOINT", "0") != "1":
+        raise HTTPException(status_code=404, detail="Not Found")
+    return {"traces": tracer.recent(limit=limit, min_ms=min_ms)}
+
+
+@app.get("/admin/profile", dependencies=[Depends(require_admin)])
+async def admin_profile(
+    seconds: float = Query(10.0, gt=0, le=120),
+    hz: float = Query(100.0, ge=1, le=1000),
+    idle: bool = Query(False, description="Keep stacks of threads blocked waiting for work"),
+) -> PlainTextResponse:
+    """Sample every thread of this worker and return collapsed stacks for a flamegraph."""
+    try:
+        stacks, samples = await asyncio.to_thread(capture_profile, seconds, hz, idle)
+    except ProfilerBusy as exc:
+        raise HTTPException(status_code=409, detail=str(exc)) from exc
+    filename = f"profile-{os.getpid()}-{int(time.time())}.folded"
+    return PlainTextResponse(
+        stacks,
+        headers={
+            "Content-Disposition": f'attachment; filename="{filename}"',
+            "X-Profile-Samples": str(samples),
+            "X-Profile-Pid": str(os.getpid()),
+        },
+    )
+
+
+@app.get("/health/live")
+async def health_live() -> Dict[str, str]:
+    return {"status": "ok"}
+
+
+@app.get("/health/ready")
+async def health_ready() -> JSONResponse:
+    now = time.time()
+    components = {name: status.to_dict(now) for name, status in prober.snapshot().items()}
+    ready = prober.ready and inference.warmed
+    return JSONResponse(
+        {"ready": ready, "components": components, "startup": TIMINGS},
+        status_code=200 if ready else 503,
+    )
 
 
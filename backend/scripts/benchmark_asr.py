@@ -0,0 +1,273 @@
+"""
+Compare the Whisper variants we serve on WER per dialect, real-time factor, memory and load time.
+
+Each variant runs ``ASRService`` over the held-out split of
+``data/swahili_asr_dataset`` (written by ``collect_swahili_data.py``) in a
+fresh process, so peak RSS and load time are its own. A variant is a model
+size or checkpoint path, optionally with the decode path it is served
+through: ``base`` transcribes clip by clip like ``/voice/process``,
+``base:batch`` uses ``transcribe_batch`` like bulk jobs
+(``--batch-size`` clips per call). The default is ``base``, ``base:batch``
+and ``ASR_FALLBACK_MODEL`` when it is set.
+
+Transcripts and references are lowercased and stripped of punctuation before
+scoring. WER is reported overall and per dialect: the dataset's ``dialect``
+column when it has one, otherwise the dialect ``ASRService`` detects in the
+reference text. RTF is decode seconds per second of audio (below 1 is faster
+than real time), measured after the service's warm-up.
+
+    python scripts/benchmark_asr.py --variants tiny,base,base:batch,small --limit 500 \\
+        --json asr-benchmark.json --markdown asr-benchmark.md
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import re
+import resource
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import numpy as np  # noqa: E402
+
+from services.asr_service import SAMPLE_RATE, ASRService  # noqa: E402
+
+DATASET_PATH = Path(__file__).resolve().parent.parent / "data" / "swahili_asr_dataset"
+MODES = ("single", "batch")
+PUNCTUATION = re.compile(r"[^\w\s']+")
+
+
+def normalise(text: str) -> str:
+    return " ".join(PUNCTUATION.sub(" ", text.lower()).split())
+
+
+def parse_variant(variant: str) -> Tuple[str, str]:
+    model, _, mode = variant.partition(":")
+    mode = mode or "single"
+    if not model or mode not in MODES:
+        raise ValueError(f"Variant must look like 'base' or 'base:batch', got {variant!r}")
+    return model, mode
+
+
+def iter_clips(path: Path, split: str, limit: Optional[int]) -> Iterator[Tuple[np.ndarray, str, Optional[str]]]:
+    """``(16 kHz float32 samples, reference text, dialect or None)`` per row of the split."""
+    from datasets import DatasetDict, load_from_disk
+
+    dataset = load_from_disk(str(path))
+    if isinstance(dataset, DatasetDict):
+        dataset = dataset[split]
+    if limit is not None:
+        dataset = dataset.select(range(min(limit, len(dataset))))
+    has_dialect = "dialect" in dataset.column_names
+    for row in dataset:
+        audio = row["audio"]
+        if isinstance(audio, dict):
+            samples = np.asarray(audio["array"], dtype=np.float32)
+            if audio.get("sampling_rate", SAMPLE_RATE) != SAMPLE_RATE:
+                import librosa
+
+                samples = librosa.resample(samples, orig_sr=audio["sampling_rate"], target_sr=SAMPLE_RATE)
+        else:
+            samples = np.asarray(audio, dtype=np.float32)
+        yield samples, row["text"], row["dialect"] if has_dialect else None
+
+
+def _peak_rss_mib() -> float:
+    # ru_maxrss is KiB on Linux and bytes on macOS.
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def run_variant(variant: str, dataset: str, split: str, limit: Optional[int], batch_size: int) -> Dict[str, Any]:
+    """Load the variant, transcribe the split and return raw timings and transcripts; runs in a child process."""
+    model, mode = parse_variant(variant)
+    service = ASRService(model_size=model)
+    if not service.is_ready:
+        return {"variant": variant, "error": "whisper is not installed"}
+    service.warm_up()
+    report: Dict[str, Any] = {
+        "variant": variant,
+        "model": model,
+        "mode": mode,
+        "importSeconds": round(service.timings.get("import", 0.0), 3),
+        "loadSeconds": round(service.timings.get("load", 0.0), 3),
+        "warmupSeconds": round(service.timings.get("warmup", 0.0), 3),
+        "peakRssAfterLoadMiB": _peak_rss_mib(),
+    }
+
+    hypotheses: List[str] = []
+    references: List[str] = []
+    dialects: List[str] = []
+    latencies: List[float] = []
+    audio_seconds = 0.0
+    decode_seconds = 0.0
+    pending: List[Tuple[np.ndarray, str, Optional[str]]] = []
+
+    def flush() -> None:
+        nonlocal decode_seconds
+        audios = [samples for samples, _, _ in pending]
+        start = time.perf_counter()
+        if mode == "batch":
+            results = service.transcribe_batch(audios)
+        else:
+            results = [service.transcribe(audios[0])]
+        elapsed = time.perf_counter() - start
+        decode_seconds += elapsed
+        for (_, reference, dialect), result in zip(pending, results):
+            hypotheses.append(result.text)
+            references.append(reference)
+            dialects.append(dialect or ASRService._detect_dialect(reference))
+            # A batched clip's result is ready when the whole batch is.
+            latencies.append(elapsed)
+        pending.clear()
+
+    for clip in iter_clips(Path(dataset), split, limit):
+        audio_seconds += len(clip[0]) / SAMPLE_RATE
+        pending.append(clip)
+        if len(pending) >= (batch_size if mode == "batch" else 1):
+            flush()
+    if pending:
+        flush()
+
+    report.update(
+        {
+            "clips": len(references),
+            "audioSeconds": round(audio_seconds, 1),
+            "decodeSeconds": round(decode_seconds, 2),
+            "rtf": round(decode_seconds / audio_seconds, 4) if audio_seconds else None,
+            "latencyP50Ms": round(float(np.percentile(latencies, 50)) * 1000, 1) if latencies else None,
+            "latencyP95Ms": round(float(np.percentile(latencies, 95)) * 1000, 1) if latencies else None,
+            "peakRssMiB": _peak_rss_mib(),
+            "hypotheses": hypotheses,
+            "references": references,
+            "dialects": dialects,
+        }
+    )
+    try:
+        import torch
+
+        report["device"] = "cuda" if torch.cuda.is_available() else "cpu"
+        if torch.cuda.is_available():
+            report["peakGpuMiB"] = round(torch.cuda.max_memory_allocated() / (1024 * 1024), 1)
+    except ImportError:
+        pass
+    return report
+
+
+def score(report: Dict[str, Any], metric: Any) -> None:
+    """Replace the transcripts in ``report`` with WER overall and per dialect."""
+    hypotheses = [normalise(text) for text in report.pop("hypotheses")]
+    references = [normalise(text) for text in report.pop("references")]
+    dialects = report.pop("dialects")
+
+    def wer(indices: Sequence[int]) -> Optional[float]:
+        # jiwer rejects empty references.
+        kept = [index for index in indices if references[index]]
+        if not kept:
+            return None
+        value = metric.compute(
+            predictions=[hypotheses[index] for index in kept], references=[references[index] for index in kept]
+        )
+        return round(float(value), 4)
+
+    report["wer"] = wer(range(len(references)))
+    report["werByDialect"] = {
+        dialect: wer([index for index, value in enumerate(dialects) if value == dialect])
+        for dialect in sorted(set(dialects))
+    }
+    report["clipsByDialect"] = {dialect: dialects.count(dialect) for dialect in sorted(set(dialects))}
+
+
+def markdown(reports: Sequence[Dict[str, Any]]) -> str:
+    dialects = sorted({dialect for report in reports for dialect in report.get("werByDialect", {})})
+
+    def cell(value: Any, suffix: str = "") -> str:
+        return "–" if value is None else f"{value}{suffix}"
+
+    header = ["Variant", "Load s", "Warm-up s", "Peak RSS MiB", "RTF", "p50 ms", "p95 ms", "WER"]
+    header += [f"WER {dialect} (n)" for dialect in dialects]
+    lines = ["| " + " | ".join(header) + " |", "|" + "---|" * len(header)]
+    for report in reports:
+        if "error" in report:
+            cells = [report["variant"], *["–"] * (len(header) - 2), report["error"]]
+            lines.append("| " + " | ".join(cells) + " |")
+            continue
+        row = [
+            report["variant"],
+            cell(report["loadSeconds"]),
+            cell(report["warmupSeconds"]),
+            cell(report["peakRssMiB"]),
+            cell(report["rtf"]),
+            cell(report["latencyP50Ms"]),
+            cell(report["latencyP95Ms"]),
+            cell(report["wer"]),
+        ]
+        row += [
+            f"{cell(report['werByDialect'].get(dialect))} ({report['clipsByDialect'].get(dialect, 0)})"
+            for dialect in dialects
+        ]
+        lines.append("| " + " | ".join(str(value) for value in row) + " |")
+    return "\n".join(lines)
+
+
+def default_variants() -> List[str]:
+    variants = ["base", "base:batch"]
+    fallback = os.getenv("ASR_FALLBACK_MODEL")
+    if fallback:
+        variants.append(fallback)
+    return variants
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--variants", help="Comma-separated model[:single|batch] list")
+    parser.add_argument("--dataset", type=Path, default=DATASET_PATH)
+    parser.add_argument("--split", default="test")
+    parser.add_argument("--limit", type=int, help="Only the first N clips of the split")
+    parser.add_argument("--batch-size", type=int, default=int(os.getenv("BATCH_ASR_SIZE", "8")))
+    parser.add_argument("--json", type=Path, help="Write the full report here")
+    parser.add_argument("--markdown", type=Path, help="Write the table here as well as printing it")
+    args = parser.parse_args()
+
+    variants = [variant.strip() for variant in args.variants.split(",")] if args.variants else default_variants()
+    for variant in variants:
+        parse_variant(variant)
+    if not args.dataset.exists():
+        parser.error(f"{args.dataset} not found; run scripts/collect_swahili_data.py first")
+
+    from evaluate import load
+
+    # Loaded once for every variant and dialect.
+    metric = load("wer")
+
+    reports = []
+    for variant in variants:
+        print(f"Benchmarking {variant}...", flush=True)
+        # A fresh process per variant, so RSS and load time are not inherited from the one before.
+        with ProcessPoolExecutor(max_workers=1, mp_context=get_context("spawn")) as pool:
+            report = pool.submit(
+                run_variant, variant, str(args.dataset), args.split, args.limit, args.batch_size
+            ).result()
+        if "error" not in report:
+            score(report, metric)
+        reports.append(report)
+
+    table = markdown(reports)
+    print(table)
+    if args.markdown:
+        args.markdown.write_text(table + "\n", encoding="utf-8")
+    if args.json:
+        summary = {"dataset": str(args.dataset), "split": args.split, "variants": reports}
+        args.json.write_text(json.dumps(summary, indent=2, ensure_ascii=False), encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,180 @@
+"""
+Measure ChamaSummary memory and /chamas serialisation cost at 1k/10k chamas.
+
+Compares the previous representation (a dataclass with four ``Decimal``
+fields and a ``raw`` dict copy, returned as dicts for FastAPI to run through
+``jsonable_encoder`` and ``json.dumps``) with the slotted integer-wei
+``ChamaSummary`` whose JSON is encoded once, and with a stored page body.
+
+    python scripts/benchmark_chama_serialisation.py [--sizes 1000 10000]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass
+from decimal import Decimal
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Tuple
+
+from fastapi.encoders import jsonable_encoder
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from blockchain.chama_client import ChamaClient, ChamaSummary  # noqa: E402
+
+OWNER = "0x5B38Da6a701c568545dCfcB03FcB875f56beddC4"
+
+
+@dataclass
+class LegacySummary:
+    id: int
+    name: str
+    owner: str
+    members: int
+    contribution_wei: Decimal
+    contribution_eth: Decimal
+    total_funds_wei: Decimal
+    total_funds_eth: Decimal
+    frequency: int
+    active: bool
+    raw: Dict[str, Any]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "name": self.name,
+            "owner": self.owner,
+            "members": self.members,
+            "active": self.active,
+            "contributionWei": str(self.contribution_wei),
+            "contributionEth": float(self.contribution_eth),
+            "totalFundsWei": str(self.total_funds_wei),
+            "totalFundsEth": float(self.total_funds_eth),
+            "contributionFrequency": self.frequency,
+        }
+
+
+def payloads(count: int) -> List[Dict[str, Any]]:
+    return [
+        {
+            "id": index,
+            "name": f"Chama {index}",
+            "owner": OWNER,
+            "memberCount": index % 30,
+            "contributionAmount": 10**17 + index,
+            "contributionFrequency": 604800,
+            "totalFunds": 10**18 * (index % 50),
+            "active": index % 7 != 0,
+        }
+        for index in range(1, count + 1)
+    ]
+
+
+def build_legacy(rows: List[Dict[str, Any]]) -> List[LegacySummary]:
+    summaries = []
+    for row in rows:
+        contribution_wei = Decimal(row["contributionAmount"])
+        total_funds_wei = Decimal(row["totalFunds"])
+        summaries.append(
+            LegacySummary(
+                id=row["id"],
+                name=row["name"],
+                owner=row["owner"],
+                members=row["memberCount"],
+                contribution_wei=contribution_wei,
+                contribution_eth=ChamaClient._from_wei(contribution_wei),
+                total_funds_wei=total_funds_wei,
+                total_funds_eth=ChamaClient._from_wei(total_funds_wei),
+                frequency=row["contributionFrequency"],
+                active=row["active"],
+                raw=dict(row),
+            )
+        )
+    return summaries
+
+
+def build_compact(rows: List[Dict[str, Any]]) -> List[ChamaSummary]:
+    return [
+        ChamaSummary(
+            id=row["id"],
+            name=row["name"],
+            owner=row["owner"],
+            members=row["memberCount"],
+            contribution_wei=row["contributionAmount"],
+            total_funds_wei=row["totalFunds"],
+            frequency=row["contributionFrequency"],
+            active=row["active"],
+        )
+        for row in rows
+    ]
+
+
+def measure_memory(build: Callable[[List[Dict[str, Any]]], List[Any]], rows: List[Dict[str, Any]]) -> int:
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    kept = build(rows)
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    del kept
+    return sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+
+
+def timed(fn: Callable[[], Any], repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat
+
+
+def legacy_response(summaries: List[LegacySummary]) -> bytes:
+    content = jsonable_encoder({"chamas": [summary.to_dict() for summary in summaries]})
+    return json.dumps(content, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def compact_response(summaries: List[ChamaSummary]) -> bytes:
+    return b'{"chamas":[' + b",".join(summary.to_json() for summary in summaries) + b'],"nextCursor":null}'
+
+
+def run(size: int, repeat: int) -> List[Tuple[str, str]]:
+    rows = payloads(size)
+    legacy = build_legacy(rows)
+    compact = build_compact(rows)
+    assert json.loads(legacy_response(legacy))["chamas"] == json.loads(compact_response(compact))["chamas"]
+
+    def cold() -> bytes:
+        for summary in compact:
+            summary._json = None
+        return compact_response(compact)
+
+    compact_response(compact)
+    page = compact_response(compact)
+    pages = {("v", size): page}
+    return [
+        ("memory, Decimal + raw dict", f"{measure_memory(build_legacy, rows) / size:.0f} B/chama"),
+        ("memory, slotted int wei", f"{measure_memory(build_compact, rows) / size:.0f} B/chama"),
+        ("to_dict + jsonable_encoder + dumps", f"{timed(lambda: legacy_response(legacy), repeat) * 1e3:.2f} ms"),
+        ("to_json per summary (cold)", f"{timed(cold, repeat) * 1e3:.2f} ms"),
+        ("join cached summary JSON", f"{timed(lambda: compact_response(compact), repeat) * 1e3:.2f} ms"),
+        ("stored page body", f"{timed(lambda: pages[('v', size)], repeat) * 1e6:.2f} µs"),
+    ]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    for size in args.sizes:
+        print(f"{size} chamas")
+        for label, value in run(size, args.repeat):
+            print(f"  {label:<38}{value:>14}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""
+Compare the legacy JSON session encoding with the compact binary format.
+
+Reports encoded bytes per session and decode time for one voice request
+(a full turns list plus the intents list). When ``REDIS_URL`` is set the
+script also writes both variants to Redis and reports ``MEMORY USAGE``.
+
+    python scripts/benchmark_session_codec.py [--iterations 2000]
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Dict, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from services.memory_service import MAX_INTENTS, MAX_TURNS  # noqa: E402
+from services.session_codec import (  # noqa: E402
+    decode_intent,
+    decode_turn,
+    encode_intent,
+    encode_intent_json,
+    encode_turn,
+    encode_turn_json,
+)
+from services.session_store import IntentRecord, Turn  # noqa: E402
+
+USER_TEXT = "Habari, nataka kujua salio la chama chetu cha akiba na lini mchango unaofuata"
+AI_TEXT = (
+    "Kwa sasa chama Umoja kina wanachama 12 na michango ya 0.0500 ETH. "
+    "Mchango unaofuata ni Ijumaa. Je, ungependa kuchangia sasa au kuona historia ya michango?"
+)
+
+
+def build_session() -> Dict[str, List]:
+    now = time.time()
+    turns = [Turn(user=USER_TEXT, ai=AI_TEXT * (1 + i % 3), dialect="kiswahili_sanifu", ts=now - i) for i in range(MAX_TURNS)]
+    intents = [IntentRecord(intent="check_balance", confidence=0.85, ts=now - i) for i in range(MAX_INTENTS)]
+    return {"turns": turns, "intents": intents}
+
+
+def encode_session(session: Dict[str, List], turn_encoder: Callable, intent_encoder: Callable) -> Dict[str, List]:
+    return {
+        "turns": [turn_encoder(turn) for turn in session["turns"]],
+        "intents": [intent_encoder(intent) for intent in session["intents"]],
+    }
+
+
+def session_bytes(encoded: Dict[str, List]) -> int:
+    return sum(len(entry) for entries in encoded.values() for entry in entries)
+
+
+def time_decode(encoded: Dict[str, List], iterations: int) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        for entry in encoded["turns"]:
+            decode_turn(entry)
+        for entry in encoded["intents"]:
+            decode_intent(entry)
+    return (time.perf_counter() - start) / iterations
+
+
+def redis_memory(encoded: Dict[str, List], prefix: str) -> int:
+    import redis  # type: ignore
+
+    client = redis.from_url(os.environ["REDIS_URL"])
+    total = 0
+    for name, entries in encoded.items():
+        key = f"bench:{prefix}:{name}"
+        client.delete(key)
+        client.rpush(key, *entries)
+        total += int(client.memory_usage(key) or 0)
+        client.delete(key)
+    return total
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--iterations", type=int, default=2000)
+    args = parser.parse_args()
+
+    session = build_session()
+    variants = {
+        "json (legacy)": encode_session(session, encode_turn_json, encode_intent_json),
+        "compact v1": encode_session(session, encode_turn, encode_intent),
+    }
+
+    print(f"{'format':<16}{'bytes/session':>16}{'decode µs/request':>20}{'redis bytes':>14}")
+    for label, encoded in variants.items():
+        size = session_bytes(encoded)
+        decode_us = time_decode(encoded, args.iterations) * 1e6
+        memory = redis_memory(encoded, label.split()[0]) if os.getenv("REDIS_URL") else None
+        memory_col = f"{memory:>14}" if memory is not None else f"{'-':>14}"
+        print(f"{label:<16}{size:>16}{decode_us:>20.1f}{memory_col}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+Measure per-request session-token crypto overhead.
+
+Compares the previous behaviour (a Fernet decrypt of the incoming token and a
+fresh encrypt for the response on every request) with ``SessionTokens``,
+which verifies and re-issues from its caches after the first request.
+
+    python scripts/benchmark_session_crypto.py [--requests 20000]
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+import uuid
+from pathlib import Path
+
+from cryptography.fernet import Fernet
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from services.security import SessionTokens  # noqa: E402
+
+
+def per_request_baseline(requests: int) -> float:
+    fernet = Fernet(Fernet.generate_key())
+    token = fernet.encrypt(str(uuid.uuid4()).encode("utf-8"))
+    start = time.perf_counter()
+    for _ in range(requests):
+        session_id = fernet.decrypt(token)
+        token = fernet.encrypt(session_id)
+    return (time.perf_counter() - start) / requests
+
+
+def per_request_cached(requests: int, rotated: bool = False) -> float:
+    old_key, new_key = Fernet.generate_key(), Fernet.generate_key()
+    session_id = str(uuid.uuid4())
+    if rotated:
+        token = Fernet(old_key).encrypt(session_id.encode("utf-8")).decode("utf-8")
+        tokens = SessionTokens([new_key.decode(), old_key.decode()])
+    else:
+        tokens = SessionTokens([new_key.decode()])
+        token = tokens.issue(session_id)
+    start = time.perf_counter()
+    for _ in range(requests):
+        token = tokens.issue(tokens.verify(token) or session_id)
+    return (time.perf_counter() - start) / requests
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=20000)
+    args = parser.parse_args()
+
+    rows = [
+        ("decrypt + encrypt per request", per_request_baseline(args.requests)),
+        ("SessionTokens, cached", per_request_cached(args.requests)),
+        ("SessionTokens, after key rotation", per_request_cached(args.requests, rotated=True)),
+    ]
+    for label, seconds in rows:
+        print(f"{label:<36}{seconds * 1e6:>10.2f} µs/request")
+
+
+if __name__ == "__main__":
+    main()
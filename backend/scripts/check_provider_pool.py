@@ -0,0 +1,104 @@
+"""
+Drive ChamaClient reads through the RPC provider pool and report per-endpoint health.
+
+Sends ``--reads`` uncached ``read_chain`` calls (``--concurrency`` at a time)
+across the given endpoints and prints read latency percentiles, the failed
+reads, and each endpoint's latency EWMA, error EWMA, routing score and the
+hedge outcomes. Pair it with ``scripts/rpc_fault_proxy.py`` to watch traffic
+move away from a degraded node:
+
+    python scripts/check_provider_pool.py \\
+        --rpc-urls http://127.0.0.1:9001,http://127.0.0.1:9002 --factory 0x... --reads 200
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from blockchain.chama_client import ChamaClient  # noqa: E402
+from services.metrics import rpc_hedged_requests  # noqa: E402
+
+
+def _hedges() -> str:
+    counts = {
+        sample.labels["winner"]: int(sample.value)
+        for metric in rpc_hedged_requests.collect()
+        for sample in metric.samples
+        if sample.name.endswith("_total")
+    }
+    return ", ".join(f"{winner}={count}" for winner, count in sorted(counts.items())) or "none"
+
+
+async def run(args: argparse.Namespace) -> int:
+    client = ChamaClient(rpc_url=args.rpc_urls, factory_address=args.factory, read_mode="batch")
+    pool = client.provider_pool
+    if pool is None:
+        print("No RPC URLs configured.")
+        return 1
+
+    latencies: List[float] = []
+    failures = 0
+    semaphore = asyncio.Semaphore(args.concurrency)
+
+    async def one_read(index: int) -> None:
+        nonlocal failures
+        async with semaphore:
+            start = time.perf_counter()
+            try:
+                summaries = await client.read_chain([index % args.chamas + 1])
+            except Exception:
+                summaries = []
+            if not summaries:
+                failures += 1
+                return
+            latencies.append(time.perf_counter() - start)
+
+    try:
+        await asyncio.gather(*(one_read(index) for index in range(args.reads)))
+    finally:
+        await client.close()
+
+    if latencies:
+        ordered = sorted(latencies)
+        p99 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))]
+        print(
+            f"reads={len(latencies)} failed={failures} "
+            f"p50={statistics.median(ordered) * 1000:.1f}ms p99={p99 * 1000:.1f}ms"
+        )
+    else:
+        print(f"reads=0 failed={failures}")
+    print(f"hedges: {_hedges()}")
+    print(f"{'endpoint':<28}{'latency_ewma':>14}{'error_ewma':>12}{'score':>10}")
+    for endpoint in pool.endpoints:
+        print(
+            f"{endpoint.label:<28}{endpoint.latency * 1000:>12.1f}ms"
+            f"{endpoint.error_rate:>12.2f}{endpoint.score * 1000:>10.1f}"
+        )
+    return 0 if failures == 0 else 1
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--rpc-urls",
+        default=os.getenv("SEPOLIA_RPC_URLS") or os.getenv("SEPOLIA_RPC_URL", "http://127.0.0.1:8545"),
+        help="Comma-separated RPC endpoints",
+    )
+    parser.add_argument("--factory", default=os.getenv("CHAMA_FACTORY_ADDRESS"), required=not os.getenv("CHAMA_FACTORY_ADDRESS"))
+    parser.add_argument("--reads", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--chamas", type=int, default=5, help="Read ids 1..N in rotation")
+    raise SystemExit(asyncio.run(run(parser.parse_args())))
+
+
+if __name__ == "__main__":
+    main()
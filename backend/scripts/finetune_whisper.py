@@ -9,6 +9,7 @@ from typing import Dict
 
 import torch
 from datasets import load_from_disk
+from evaluate import load as load_metric
 from transformers import (
     Seq2SeqTrainer,
     Seq2SeqTrainingArguments,
@@ -23,9 +24,7 @@ OUTPUT_DIR = Path(__file__).resolve().parent.parent / "models" / "whisper-swahil
 
 
 def compute_metrics(pred) -> Dict[str, float]:
-    from evaluate import load
-
-    metric = load("wer")
+    metric = wer_metric  # type: ignore[name-defined]
     pred_ids = pred.predictions
     label_ids = pred.label_ids
 
@@ -57,6 +56,8 @@ if __name__ == "__main__":
     feature_extractor = WhisperFeatureExtractor.from_pretrained(model_id)
     tokenizer = WhisperTokenizer.from_pretrained(model_id, language="swahili", task="transcribe")
     processor = WhisperProcessor.from_pretrained(model_id, language="swahili", task="transcribe")
+    # Loaded once here; compute_metrics runs after every evaluation.
+    wer_metric = load_metric("wer")
 
     dataset = dataset.map(
         prepare_dataset,
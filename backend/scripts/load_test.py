@@ -0,0 +1,166 @@
+"""
+Load-test /voice/process at a target request rate and report where the time goes.
+
+By default the API runs in process with every backend stubbed out
+(``loadtest.stubs``): Whisper, the LLM and TTS sleep for times drawn from
+``--asr``/``--llm``/``--tts``, chain reads for ``--chain`` and Redis round
+trips for ``--redis``. What is left to measure is the orchestration layer
+itself. With the stubs fixed, a slower run means the request path got slower:
+a blocking call on the event loop shows up as event-loop lag, and an extra
+copy or round trip shows up in the stage split or the backend calls per
+request. ``--url`` drives a running deployment instead, with its real
+backends.
+
+The trace is synthetic and seeded (``--rps``, ``--duration``, ``--seed``), or
+replayed from JSON lines with ``--trace``; ``--save-trace`` writes the
+synthetic one out for later replays. ``--max-p95-ms`` and
+``--max-loop-lag-ms`` make the script exit non-zero when exceeded, for CI.
+
+    python scripts/load_test.py --rps 20 --duration 30
+    python scripts/load_test.py --trace traces/peak.jsonl --json report.json --max-p95-ms 3000
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from loadtest.driver import (  # noqa: E402
+    Result,
+    TraceRequest,
+    format_report,
+    load_trace,
+    replay,
+    save_trace,
+    summarise,
+    synthetic_trace,
+    wait_ready,
+)
+from loadtest.stubs import Distribution  # noqa: E402
+
+
+async def run(
+    url: str, trace: List[TraceRequest], connections: int, timeout: float, on_ready: Callable[[], None]
+) -> Tuple[List[Result], float]:
+    await wait_ready(url)
+    on_ready()
+    start = time.perf_counter()
+    results = await replay(url, trace, connections=connections, timeout=timeout)
+    return results, time.perf_counter() - start
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rps", type=float, default=2.0, help="Target requests per second")
+    parser.add_argument("--duration", type=float, default=30.0, help="Seconds of synthetic traffic")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--arrivals", choices=("poisson", "constant"), default="poisson")
+    parser.add_argument("--clip-seconds", default="lognormal:4,0.5", help="Clip length distribution")
+    parser.add_argument("--followups", type=float, default=0.3, help="Share of requests continuing a session")
+    parser.add_argument("--wallets", type=float, default=0.5, help="Share of sessions with a wallet address")
+    parser.add_argument("--trace", type=Path, help="Replay this JSON-lines trace instead of a synthetic one")
+    parser.add_argument("--save-trace", type=Path, help="Write the trace that is sent as JSON lines")
+    parser.add_argument("--url", help="Drive this running API instead of an in-process one with stubs")
+    parser.add_argument("--asr", default="lognormal:0.08,0.3", help="Stub ASR seconds per second of audio")
+    parser.add_argument("--llm", default="lognormal:0.3,0.4", help="Stub LLM seconds per call")
+    parser.add_argument("--tts", default="lognormal:0.15,0.3", help="Stub TTS seconds per call")
+    parser.add_argument("--chain", default="lognormal:0.05,0.5", help="Stub chain seconds per read")
+    parser.add_argument("--redis", default="fixed:0.0005", help="Stub Redis seconds per round trip")
+    parser.add_argument("--connections", type=int, default=256, help="Client connection limit")
+    parser.add_argument("--timeout", type=float, default=60.0, help="Per-request timeout in seconds")
+    parser.add_argument("--json", type=Path, help="Also write the summary here as JSON")
+    parser.add_argument("--max-p95-ms", type=float, help="Fail when end-to-end p95 exceeds this")
+    parser.add_argument("--max-loop-lag-ms", type=float, help="Fail when event-loop lag p99 exceeds this")
+    parser.add_argument("--verbose", action="store_true", help="Keep the API's per-request INFO logs")
+    args = parser.parse_args()
+
+    if args.trace:
+        trace = load_trace(args.trace)
+    else:
+        trace = synthetic_trace(
+            args.rps,
+            args.duration,
+            seed=args.seed,
+            arrivals=args.arrivals,
+            clip_seconds=Distribution.parse(args.clip_seconds, args.seed),
+            followups=args.followups,
+            wallets=args.wallets,
+        )
+    if args.save_trace:
+        save_trace(trace, args.save_trace)
+    if not trace:
+        parser.error("The trace is empty")
+
+    server = monitor = stubs = None
+    url = args.url
+    if url is None:
+        # Imported here: loading the app reads its configuration from the environment.
+        from loadtest.server import InProcessServer, LoopLagMonitor, load_app
+
+        app, stubs = load_app(
+            asr=Distribution.parse(args.asr, args.seed),
+            llm=Distribution.parse(args.llm, args.seed),
+            tts=Distribution.parse(args.tts, args.seed),
+            chain=Distribution.parse(args.chain, args.seed),
+            redis=Distribution.parse(args.redis, args.seed),
+            verbose=args.verbose,
+        )
+        monitor = LoopLagMonitor()
+        server = InProcessServer(app, monitor)
+        url = server.start()
+        print(
+            f"Stubs: asr {args.asr} per audio second, llm {args.llm}, tts {args.tts}, "
+            f"chain {args.chain}, redis {args.redis}"
+        )
+
+    calls_before: Optional[Dict[str, int]] = None
+
+    def on_ready() -> None:
+        # Start counting once startup and warm-up are over.
+        nonlocal calls_before
+        if stubs is not None:
+            calls_before = stubs.calls()
+        if monitor is not None:
+            monitor.reset()
+
+    try:
+        results, wall = asyncio.run(run(url.rstrip("/"), trace, args.connections, args.timeout, on_ready))
+    finally:
+        if server is not None:
+            server.stop()
+
+    backend_calls = None
+    if stubs is not None and calls_before is not None:
+        backend_calls = {name: count - calls_before[name] for name, count in stubs.calls().items()}
+    target_rps = None if args.trace else args.rps
+    summary: Dict[str, Any] = summarise(
+        results,
+        wall,
+        target_rps=target_rps,
+        loop_lag=monitor.samples if monitor is not None else None,
+        backend_calls=backend_calls,
+    )
+    print(format_report(summary))
+    if args.json:
+        args.json.write_text(json.dumps(summary, indent=2), encoding="utf-8")
+
+    failed = False
+    if args.max_p95_ms is not None and summary["latencyMs"]["p95"] > args.max_p95_ms:
+        print(f"FAIL: p95 {summary['latencyMs']['p95']} ms exceeds {args.max_p95_ms} ms", file=sys.stderr)
+        failed = True
+    lag = summary.get("eventLoopLagMs")
+    if args.max_loop_lag_ms is not None and lag is not None and lag["p99"] > args.max_loop_lag_ms:
+        print(f"FAIL: event-loop lag p99 {lag['p99']} ms exceeds {args.max_loop_lag_ms} ms", file=sys.stderr)
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
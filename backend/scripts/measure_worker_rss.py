@@ -0,0 +1,146 @@
+"""
+Measure per-worker memory of the gunicorn deployment with and without model preloading.
+
+Starts ``gunicorn -c gunicorn.conf.py main:app`` with ``PRELOAD_MODELS=1``
+(models built in the master and shared copy-on-write) and with
+``PRELOAD_MODELS=0`` (each worker builds its own), waits until memory stops
+growing, and reads ``/proc/<pid>/smaps_rollup`` for the master and every
+worker. RSS counts shared pages in full for each process; PSS divides them
+between the processes that map them, so total PSS is the real footprint and
+a worker's private memory is what one more worker costs. Linux only.
+
+    python scripts/measure_worker_rss.py --workers 4
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import signal
+import subprocess
+import sys
+import time
+import urllib.request
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+BACKEND = Path(__file__).resolve().parent.parent
+FIELDS = ("Rss", "Pss", "Private_Clean", "Private_Dirty")
+
+
+def rollup(pid: int) -> Dict[str, int]:
+    """Memory totals for ``pid`` in KiB."""
+    values = dict.fromkeys(FIELDS, 0)
+    with open(f"/proc/{pid}/smaps_rollup") as handle:
+        for line in handle:
+            name, _, rest = line.partition(":")
+            if name in values:
+                values[name] = int(rest.split()[0])
+    return values
+
+
+def children(pid: int) -> List[int]:
+    found = []
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat") as handle:
+                # The command name may contain spaces; fields after ")" are fixed.
+                ppid = int(handle.read().rsplit(")", 1)[1].split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+        if ppid == pid:
+            found.append(int(entry))
+    return found
+
+
+def wait_ready(url: str, timeout: float) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with urllib.request.urlopen(url, timeout=2) as response:
+                if response.status == 200:
+                    return
+        except OSError:
+            pass
+        time.sleep(0.5)
+    raise TimeoutError(f"{url} did not answer within {timeout:g}s")
+
+
+def settle(master: int, workers: int, timeout: float) -> Tuple[Dict[str, int], List[Dict[str, int]]]:
+    """Sample until all workers exist and total PSS changes by under 1% twice in a row."""
+    deadline = time.monotonic() + timeout
+    previous, steady = 0, 0
+    while True:
+        pids = children(master)
+        master_usage = rollup(master)
+        worker_usage = [rollup(pid) for pid in pids]
+        total = master_usage["Pss"] + sum(usage["Pss"] for usage in worker_usage)
+        if len(pids) >= workers and previous and abs(total - previous) < previous * 0.01:
+            steady += 1
+        else:
+            steady = 0
+        if steady >= 2 or time.monotonic() > deadline:
+            return master_usage, worker_usage
+        previous = total
+        time.sleep(1.0)
+
+
+def measure(preload: bool, args: argparse.Namespace) -> Dict[str, float]:
+    env = dict(os.environ, PRELOAD_MODELS="1" if preload else "0", WEB_CONCURRENCY=str(args.workers))
+    env["BIND"] = f"127.0.0.1:{args.port}"
+    server = subprocess.Popen(
+        [sys.executable, "-m", "gunicorn", "-c", "gunicorn.conf.py", "main:app"],
+        cwd=BACKEND,
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=None if args.verbose else subprocess.DEVNULL,
+    )
+    try:
+        wait_ready(f"http://127.0.0.1:{args.port}/health/live", args.timeout)
+        master, workers = settle(server.pid, args.workers, args.timeout)
+    finally:
+        server.send_signal(signal.SIGTERM)
+        server.wait(timeout=60)
+
+    mib = 1024.0
+    count = max(1, len(workers))
+    return {
+        "workers": len(workers),
+        "master_rss": master["Rss"] / mib,
+        "worker_rss": sum(usage["Rss"] for usage in workers) / count / mib,
+        "worker_pss": sum(usage["Pss"] for usage in workers) / count / mib,
+        "worker_private": sum(usage["Private_Clean"] + usage["Private_Dirty"] for usage in workers) / count / mib,
+        "total_pss": (master["Pss"] + sum(usage["Pss"] for usage in workers)) / mib,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--port", type=int, default=8799)
+    parser.add_argument("--timeout", type=float, default=600.0, help="Seconds to wait for boot and for memory to settle")
+    parser.add_argument("--verbose", action="store_true", help="Show gunicorn's log output")
+    args = parser.parse_args()
+
+    if not Path("/proc/self/smaps_rollup").exists():
+        raise SystemExit("This script reads /proc/<pid>/smaps_rollup and needs Linux 4.14 or newer.")
+
+    results = {"preload": measure(True, args), "per-worker": measure(False, args)}
+    print(
+        f"{'mode':<12}{'workers':>8}{'master RSS':>12}{'worker RSS':>12}"
+        f"{'worker PSS':>12}{'private':>10}{'total PSS':>11}   (MiB)"
+    )
+    for mode, row in results.items():
+        print(
+            f"{mode:<12}{row['workers']:>8}{row['master_rss']:>12.0f}{row['worker_rss']:>12.0f}"
+            f"{row['worker_pss']:>12.0f}{row['worker_private']:>10.0f}{row['total_pss']:>11.0f}"
+        )
+    saved = results["per-worker"]["worker_private"] - results["preload"]["worker_private"]
+    footprint = results["per-worker"]["total_pss"] - results["preload"]["total_pss"]
+    print(f"private memory saved per worker: {saved:.0f} MiB; total footprint saved: {footprint:.0f} MiB")
+
+
+if __name__ == "__main__":
+    main()
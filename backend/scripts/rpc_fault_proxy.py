@@ -0,0 +1,97 @@
+"""
+Fault-injecting JSON-RPC proxy for exercising the RPC provider pool.
+
+Forwards requests to an upstream node (e.g. ``npx hardhat node``) after
+injecting latency, HTTP errors or dropped connections, so several proxies in
+front of one or more local nodes behave like a mixed-quality provider set:
+
+    python scripts/rpc_fault_proxy.py --port 9001 --upstream http://127.0.0.1:8545
+    python scripts/rpc_fault_proxy.py --port 9002 --upstream http://127.0.0.1:8545 \\
+        --delay-ms 800 --jitter-ms 400 --error-rate 0.2 --drop-rate 0.05
+
+Then run the checker against both:
+
+    python scripts/check_provider_pool.py \\
+        --rpc-urls http://127.0.0.1:9001,http://127.0.0.1:9002 --factory 0x...
+
+Faults can be changed while running: ``GET /faults?delay_ms=0&error_rate=1``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import random
+from typing import Dict
+
+import aiohttp
+from aiohttp import web
+
+
+def build_app(upstream: str, faults: Dict[str, float]) -> web.Application:
+    stats = {"requests": 0, "errors": 0, "drops": 0}
+
+    async def proxy(request: web.Request) -> web.StreamResponse:
+        stats["requests"] += 1
+        delay = faults["delay_ms"] + random.uniform(0, faults["jitter_ms"])
+        if delay:
+            await asyncio.sleep(delay / 1000)
+        roll = random.random()
+        if roll < faults["drop_rate"]:
+            stats["drops"] += 1
+            # Close without a reply, like a node that resets the connection.
+            request.transport.close()  # type: ignore[union-attr]
+            return web.Response(status=499)
+        if roll < faults["drop_rate"] + faults["error_rate"]:
+            stats["errors"] += 1
+            return web.Response(status=int(faults["error_status"]), text="injected fault")
+
+        body = await request.read()
+        session: aiohttp.ClientSession = request.app["session"]
+        async with session.post(upstream, data=body, headers={"Content-Type": "application/json"}) as reply:
+            return web.Response(status=reply.status, body=await reply.read(), content_type="application/json")
+
+    async def update_faults(request: web.Request) -> web.Response:
+        for key in faults:
+            if key in request.query:
+                faults[key] = float(request.query[key])
+        return web.json_response({**faults, **stats})
+
+    async def open_session(app: web.Application) -> None:
+        app["session"] = aiohttp.ClientSession()
+
+    async def close_session(app: web.Application) -> None:
+        await app["session"].close()
+
+    app = web.Application()
+    app.router.add_post("/", proxy)
+    app.router.add_get("/faults", update_faults)
+    app.on_startup.append(open_session)
+    app.on_cleanup.append(close_session)
+    return app
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--port", type=int, default=9001)
+    parser.add_argument("--upstream", default="http://127.0.0.1:8545")
+    parser.add_argument("--delay-ms", type=float, default=0.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--error-status", type=int, default=503)
+    parser.add_argument("--drop-rate", type=float, default=0.0)
+    args = parser.parse_args()
+
+    faults = {
+        "delay_ms": args.delay_ms,
+        "jitter_ms": args.jitter_ms,
+        "error_rate": args.error_rate,
+        "error_status": float(args.error_status),
+        "drop_rate": args.drop_rate,
+    }
+    print(f"Proxying :{args.port} -> {args.upstream} with {faults}")
+    web.run_app(build_app(args.upstream, faults), port=args.port, print=None)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+Check that batched ChamaClient reads match one-call-per-chama reads.
+
+Runs ``list_chamas`` in every read mode against the same node and compares the
+results and the number of RPC HTTP requests each mode spent. Point it at a
+local Hardhat node (``npx hardhat node`` in ``contracts/``) with a factory
+deployed, or at Sepolia:
+
+    python scripts/verify_batched_reads.py --rpc-url http://127.0.0.1:8545 \\
+        --factory 0x... --limit 50 --modes fanout batch
+
+Multicall3 is only present on local nodes if it has been deployed there; pass
+``--multicall`` with its address to include that mode.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import sys
+from pathlib import Path
+from typing import Dict, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from blockchain.chama_client import READ_MODES, ChamaClient  # noqa: E402
+from services.metrics import rpc_requests  # noqa: E402
+
+
+def _requests_sent() -> float:
+    return sum(
+        sample.value
+        for metric in rpc_requests.collect()
+        for sample in metric.samples
+        if sample.name.endswith("_total")
+    )
+
+
+async def run(args: argparse.Namespace) -> int:
+    results: Dict[str, List[dict]] = {}
+    for mode in args.modes:
+        client = ChamaClient(
+            rpc_url=args.rpc_url,
+            factory_address=args.factory,
+            read_mode=mode,
+            batch_size=args.batch_size,
+            multicall_address=args.multicall,
+        )
+        before = _requests_sent()
+        try:
+            summaries = await client.list_chamas(limit=args.limit)
+        finally:
+            await client.close()
+        spent = _requests_sent() - before
+        results[mode] = [summary.to_dict() for summary in summaries]
+        print(f"{mode:<10} chamas={len(summaries):<6} rpc_requests={spent:.0f}")
+
+    reference_mode = args.modes[0]
+    mismatches = [mode for mode, rows in results.items() if rows != results[reference_mode]]
+    if mismatches:
+        print(f"MISMATCH against {reference_mode}: {', '.join(mismatches)}")
+        return 1
+    print("All modes returned identical chamas.")
+    return 0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rpc-url", default=os.getenv("SEPOLIA_RPC_URL", "http://127.0.0.1:8545"))
+    parser.add_argument("--factory", default=os.getenv("CHAMA_FACTORY_ADDRESS"), required=not os.getenv("CHAMA_FACTORY_ADDRESS"))
+    parser.add_argument("--limit", type=int, default=50)
+    parser.add_argument("--batch-size", type=int, default=100)
+    parser.add_argument("--multicall", default=None, help="Multicall3 address (enables the multicall mode)")
+    parser.add_argument("--modes", nargs="+", choices=READ_MODES, default=None)
+    args = parser.parse_args()
+    if args.modes is None:
+        args.modes = ["fanout", "batch"] + (["multicall"] if args.multicall else [])
+    raise SystemExit(asyncio.run(run(args)))
+
+
+if __name__ == "__main__":
+    main()
@@ -9,16 +9,27 @@ text-based input when necessary.
 
 from __future__ import annotations
 
+import functools
+import importlib.util
+import time
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Any, Dict, List, Optional, Sequence, Union
 
-try:
-    import torch  # type: ignore
-    import whisper  # type: ignore
-except Exception:  # pragma: no cover - whisper is optional at runtime
-    torch = None
-    whisper = None
+from .tracing import span
+
+SAMPLE_RATE = 16000
+
+
+@functools.lru_cache(maxsize=None)
+def _import_whisper():
+    """``(torch, whisper)``, imported on first model load so importing this module stays cheap; None if missing."""
+    try:
+        import torch  # type: ignore
+        import whisper  # type: ignore
+    except Exception:  # pragma: no cover - whisper is optional at runtime
+        return None
+    return torch, whisper
 
 
 SWAHILI_KEYWORDS = {
@@ -50,6 +61,9 @@ class TranscriptionResult:
     confidence: float
     dialect: str
     raw: Dict[str, object]
+    audio_seconds: float = 0.0
+    # Model time for this clip, without scheduler or worker queueing; set by ``services.inference_workers``.
+    compute_seconds: float = 0.0
 
 
 class ASRService:
@@ -65,33 +79,76 @@ class ASRService:
         suppress_initial_prompt: bool = True,
     ) -> None:
         self._language = language
+        self._model_size = model_size
         self._model = None
+        self._whisper = None
+        self._torch = None
         self._suppress_initial_prompt = suppress_initial_prompt
+        # Seconds spent per startup phase ("import", "load", "warmup").
+        self.timings: Dict[str, float] = {}
 
-        if whisper is None:
+        start = time.perf_counter()
+        imported = _import_whisper()
+        self.timings["import"] = time.perf_counter() - start
+        if imported is None:
             return
+        torch, whisper = imported
+        self._whisper = whisper
+        self._torch = torch
 
-        device = "cuda" if torch and torch.cuda.is_available() else "cpu"  # type: ignore[union-attr]
+        start = time.perf_counter()
+        device = "cuda" if torch.cuda.is_available() else "cpu"
         self._model = whisper.load_model(model_size, device=device)
+        self.timings["load"] = time.perf_counter() - start
 
     @property
     def is_ready(self) -> bool:
         return self._model is not None
 
-    def transcribe(self, audio_path: Path, dialect_hint: Optional[str] = None) -> TranscriptionResult:
+    @property
+    def engine(self) -> str:
+        return "whisper" if self._model is not None else "none"
+
+    @property
+    def model_name(self) -> str:
+        return self._model_size if self._model is not None else "none"
+
+    @staticmethod
+    def backend_available() -> bool:
+        """Whether a model could be loaded, without loading it."""
+        return importlib.util.find_spec("whisper") is not None
+
+    def warm_up(self) -> None:
+        """Transcribe a second of silence so the first request does not pay for lazy kernel setup."""
+        if self._model is None:
+            return
+        import numpy as np
+
+        start = time.perf_counter()
+        self.transcribe(np.zeros(SAMPLE_RATE, dtype=np.float32))
+        self.timings["warmup"] = time.perf_counter() - start
+
+    def transcribe(self, audio: Union[Path, Any], dialect_hint: Optional[str] = None) -> TranscriptionResult:
+        """Transcribe an audio file, or 16 kHz mono float32 samples as a numpy array."""
         if self._model is None:
             raise RuntimeError(
                 "Whisper model not initialised. Install the 'whisper' dependency or "
                 "provide a custom ASR backend."
             )
 
-        result = self._model.transcribe(  # type: ignore[union-attr]
-            str(audio_path),
-            language=self._language,
-            task="transcribe",
-            temperature=0.0,
-            initial_prompt=None if self._suppress_initial_prompt else "",
-        )
+        if isinstance(audio, Path):
+            # Decode here rather than inside Whisper so the clip length is known.
+            with span("whisper.load_audio"):
+                audio = self._whisper.load_audio(str(audio))  # type: ignore[union-attr]
+
+        with span("whisper.transcribe"):
+            result = self._model.transcribe(  # type: ignore[union-attr]
+                audio,
+                language=self._language,
+                task="transcribe",
+                temperature=0.0,
+                initial_prompt=None if self._suppress_initial_prompt else "",
+            )
 
         text = result.get("text", "").strip()
         confidence = self._extract_confidence(result)
@@ -102,8 +159,61 @@ class ASRService:
             confidence=confidence,
             dialect=dialect,
             raw=result,
+            audio_seconds=len(audio) / SAMPLE_RATE,
         )
 
+    def transcribe_batch(
+        self, audios: Sequence[Any], dialect_hint: Optional[str] = None
+    ) -> List[TranscriptionResult]:
+        """Transcribe several 16 kHz float32 clips, decoding those up to 30 s as one batch.
+
+        Tuned for throughput rather than per-clip latency: clips that fit one
+        Whisper window share a single batched decoder pass, without timestamp
+        tokens or temperature fallback. Longer clips go through ``transcribe``.
+        """
+        if self._model is None:
+            raise RuntimeError(
+                "Whisper model not initialised. Install the 'whisper' dependency or "
+                "provide a custom ASR backend."
+            )
+        whisper, torch = self._whisper, self._torch
+        results: List[Optional[TranscriptionResult]] = [None] * len(audios)
+        short = [index for index, audio in enumerate(audios) if len(audio) <= whisper.audio.N_SAMPLES]
+        for index, audio in enumerate(audios):
+            if len(audio) > whisper.audio.N_SAMPLES:
+                results[index] = self.transcribe(audio, dialect_hint=dialect_hint)
+        if short:
+            model = self._model
+            with span("whisper.decode_batch", clips=len(short)):
+                mel = torch.stack(
+                    [
+                        whisper.log_mel_spectrogram(whisper.pad_or_trim(audios[index]), model.dims.n_mels)
+                        for index in short
+                    ]
+                ).to(model.device)
+                options = whisper.DecodingOptions(
+                    language=self._language,
+                    task="transcribe",
+                    temperature=0.0,
+                    without_timestamps=True,
+                    fp16=model.device.type == "cuda",
+                )
+                decoded = whisper.decode(model, mel, options)
+            for index, result in zip(short, decoded):
+                text = result.text.strip()
+                results[index] = TranscriptionResult(
+                    text=text,
+                    confidence=max(0.0, min(1.0, 1 + result.avg_logprob)),
+                    dialect=self._detect_dialect(text, fallback=dialect_hint),
+                    raw={
+                        "text": result.text,
+                        "avg_logprob": result.avg_logprob,
+                        "no_speech_prob": result.no_speech_prob,
+                    },
+                    audio_seconds=len(audios[index]) / SAMPLE_RATE,
+                )
+        return results  # type: ignore[return-value]
+
     @staticmethod
     def _extract_confidence(result: Dict[str, object]) -> float:
         segments = result.get("segments")
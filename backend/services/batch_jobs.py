@@ -0,0 +1,371 @@
+"""
+Bulk transcription jobs for recorded voice notes.
+
+``POST /batch/jobs`` takes a list of clips, or zip archives of them, writes
+them under ``BATCH_JOBS_DIR`` and answers at once with a job id. A
+``BatchRunner`` in the accepting process works through its jobs one at a
+time, ``BATCH_ASR_SIZE`` clips per batched ASR call, and appends one JSON
+line per clip to the job's ``results.ndjson``: the transcript and, when
+asked for, the intent, the LLM reply and base64 TTS audio. Status and
+progress live in ``status.json`` beside it, so any worker on the host can
+answer ``GET /batch/jobs/{id}`` and stream the results as they are written.
+
+Bulk work stays out of the interactive latency budget: it never runs more
+than one batch at a time per process, it waits (up to
+``BATCH_MAX_DEFER_SECONDS`` per batch) while ``/voice/process`` requests
+are in flight, and in worker mode ``BATCH_ASR_WORKERS`` gives it separate ASR
+processes. Jobs are kept for ``BATCH_RETENTION_SECONDS``. A job whose process
+exits before it finishes is reported as ``interrupted``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import base64
+import io
+import json
+import logging
+import os
+import re
+import shutil
+import tempfile
+import time
+import uuid
+import zipfile
+from pathlib import Path
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Sequence, Tuple
+
+from .asr_service import TranscriptionResult
+from .metrics import batch_clips, batch_jobs
+
+logger = logging.getLogger("chamas.batch")
+
+ACTIVE = ("queued", "running")
+ZIP_MAGIC = b"PK\x03\x04"
+_JOB_ID = re.compile(r"^[0-9a-f]{32}$")
+
+# (intent, reply text) for a transcript.
+Reply = Callable[[TranscriptionResult], Awaitable[Tuple[str, str]]]
+
+
+class BatchRejected(ValueError):
+    """The upload cannot become a job; ``status_code`` says why."""
+
+    def __init__(self, message: str, status_code: int = 400) -> None:
+        super().__init__(message)
+        self.status_code = status_code
+
+
+def _alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class BatchJobStore:
+    """Job inputs, status and results on local disk, shared by the workers of one host."""
+
+    def __init__(
+        self,
+        root: Optional[str] = None,
+        max_clips: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+        max_clip_bytes: Optional[int] = None,
+        retention_seconds: Optional[float] = None,
+    ) -> None:
+        self.root = Path(root or os.getenv("BATCH_JOBS_DIR", os.path.join(tempfile.gettempdir(), "chamas-batch")))
+        self.max_clips = max_clips or int(os.getenv("BATCH_MAX_CLIPS", "200"))
+        self.max_bytes = max_bytes or int(os.getenv("BATCH_MAX_BYTES", str(100 * 1024 * 1024)))
+        self.max_clip_bytes = max_clip_bytes or int(os.getenv("BATCH_MAX_CLIP_BYTES", str(5 * 1024 * 1024)))
+        self.retention_seconds = retention_seconds or float(os.getenv("BATCH_RETENTION_SECONDS", "86400"))
+
+    def check_sizes(self, uploads: Sequence[Tuple[str, Optional[int], bool]]) -> None:
+        """Reject ``(name, declared size, is zip)`` uploads before any is read; raises ``BatchRejected``."""
+        total = 0
+        for name, size, archive in uploads:
+            if size is None:
+                continue
+            if not archive and size > self.max_clip_bytes:
+                raise BatchRejected(f"{name} is larger than {self.max_clip_bytes} bytes.", 413)
+            total += size
+        if total > self.max_bytes:
+            raise BatchRejected(f"A job takes at most {self.max_bytes} bytes of audio.", 413)
+
+    def unpack(self, uploads: Sequence[Tuple[str, bytes]]) -> List[Tuple[str, bytes]]:
+        """Clips from the uploaded files, with zip archives expanded; raises ``BatchRejected``."""
+        clips: List[Tuple[str, bytes]] = []
+        total = 0
+        for name, payload in uploads:
+            if payload[: len(ZIP_MAGIC)] == ZIP_MAGIC:
+                entries = self._unzip(name, payload, self.max_bytes - total)
+            else:
+                entries = [(name, payload)]
+            for entry_name, data in entries:
+                if not data:
+                    continue
+                if len(data) > self.max_clip_bytes:
+                    raise BatchRejected(f"{entry_name} is larger than {self.max_clip_bytes} bytes.", 413)
+                total += len(data)
+                clips.append((entry_name, data))
+        if not clips:
+            raise BatchRejected("No audio clips in the upload.")
+        if len(clips) > self.max_clips:
+            raise BatchRejected(f"A job takes at most {self.max_clips} clips.", 413)
+        if total > self.max_bytes:
+            raise BatchRejected(f"A job takes at most {self.max_bytes} bytes of audio.", 413)
+        return clips
+
+    @staticmethod
+    def _unzip(name: str, payload: bytes, budget: int) -> List[Tuple[str, bytes]]:
+        try:
+            archive = zipfile.ZipFile(io.BytesIO(payload))
+        except zipfile.BadZipFile as exc:
+            raise BatchRejected(f"{name} is not a valid zip archive.") from exc
+        members = [
+            info
+            for info in archive.infolist()
+            if not info.is_dir() and not info.filename.startswith("__MACOSX/")
+            and not os.path.basename(info.filename).startswith(".")
+        ]
+        # Checked against the declared sizes before anything is inflated.
+        if sum(info.file_size for info in members) > budget:
+            raise BatchRejected("The archive expands past the job size limit.", 413)
+        return [(f"{name}/{info.filename}", archive.read(info)) for info in members]
+
+    def create(self, clips: Sequence[Tuple[str, bytes]], options: Dict[str, bool]) -> Dict[str, Any]:
+        self.purge_expired()
+        job_id = uuid.uuid4().hex
+        directory = self.root / job_id
+        (directory / "clips").mkdir(parents=True)
+        names = []
+        for index, (name, data) in enumerate(clips):
+            (directory / "clips" / f"{index:05d}").write_bytes(data)
+            names.append(name)
+        (directory / "names.json").write_text(json.dumps(names), encoding="utf-8")
+        (directory / "results.ndjson").touch()
+        status = {
+            "id": job_id,
+            "status": "queued",
+            "total": len(clips),
+            "completed": 0,
+            "failed": 0,
+            "options": options,
+            "createdAt": time.time(),
+            "startedAt": None,
+            "finishedAt": None,
+            "error": None,
+            "pid": os.getpid(),
+        }
+        self._write_status(job_id, status)
+        return status
+
+    def status(self, job_id: str) -> Optional[Dict[str, Any]]:
+        if not _JOB_ID.match(job_id):
+            return None
+        try:
+            status = json.loads((self.root / job_id / "status.json").read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+        if status["status"] in ACTIVE:
+            try:
+                cancelled_at = (self.root / job_id / "cancelled").stat().st_mtime
+            except FileNotFoundError:
+                if not _alive(status["pid"]):
+                    status["status"] = "interrupted"
+            else:
+                status.update(status="cancelled", finishedAt=cancelled_at)
+        return status
+
+    def cancel(self, job_id: str) -> Dict[str, Any]:
+        """Cancel an active job from any worker.
+
+        The cancel is a marker file rather than a field in ``status.json``, so
+        a concurrent ``update`` from the runner cannot overwrite it.
+        """
+        (self.root / job_id / "cancelled").touch()
+        status = self.status(job_id)
+        if status is None:
+            raise KeyError(job_id)
+        return status
+
+    def cancelled(self, job_id: str) -> bool:
+        return (self.root / job_id / "cancelled").exists()
+
+    def update(self, job_id: str, **fields: Any) -> Dict[str, Any]:
+        status = self.status(job_id)
+        if status is None:
+            raise KeyError(job_id)
+        if status["status"] == "cancelled":
+            # The marker decides the outcome; keep the runner's progress counters only.
+            fields.pop("status", None)
+            fields.pop("finishedAt", None)
+        status.update(fields)
+        self._write_status(job_id, status)
+        return status
+
+    def _write_status(self, job_id: str, status: Dict[str, Any]) -> None:
+        path = self.root / job_id / "status.json"
+        tmp = path.with_suffix(f".{os.getpid()}.tmp")
+        tmp.write_text(json.dumps(status), encoding="utf-8")
+        os.replace(tmp, path)
+
+    def clips(self, job_id: str) -> List[Tuple[int, str, Path]]:
+        directory = self.root / job_id
+        names = json.loads((directory / "names.json").read_text(encoding="utf-8"))
+        return [
+            (index, name, directory / "clips" / f"{index:05d}")
+            for index, name in enumerate(names)
+            if (directory / "clips" / f"{index:05d}").exists()
+        ]
+
+    def append_results(self, job_id: str, entries: Sequence[Dict[str, Any]]) -> None:
+        lines = "".join(json.dumps(entry, separators=(",", ":")) + "\n" for entry in entries)
+        with open(self.root / job_id / "results.ndjson", "a", encoding="utf-8") as handle:
+            handle.write(lines)
+
+    def results_path(self, job_id: str) -> Path:
+        return self.root / job_id / "results.ndjson"
+
+    def purge_expired(self) -> None:
+        if not self.root.exists():
+            return
+        cutoff = time.time() - self.retention_seconds
+        for directory in self.root.iterdir():
+            status = self.status(directory.name)
+            if status is None or status["status"] in ACTIVE or status["createdAt"] >= cutoff:
+                continue
+            shutil.rmtree(directory, ignore_errors=True)
+
+
+async def follow_results(store: BatchJobStore, job_id: str, poll_seconds: float = 0.5) -> AsyncIterator[bytes]:
+    """Complete NDJSON lines of a job's results, waiting for new ones until the job ends."""
+    offset = 0
+    path = store.results_path(job_id)
+    while True:
+        status = store.status(job_id)
+        finished = status is None or status["status"] not in ACTIVE
+        with open(path, "rb") as handle:
+            handle.seek(offset)
+            chunk = handle.read()
+        complete = chunk[: chunk.rfind(b"\n") + 1]
+        if complete:
+            offset += len(complete)
+            yield complete
+        elif finished:
+            return
+        else:
+            await asyncio.sleep(poll_seconds)
+
+
+class BatchRunner:
+    """Works through this process's jobs one batch at a time, behind interactive traffic."""
+
+    def __init__(
+        self,
+        store: BatchJobStore,
+        inference: Any,
+        reply: Reply,
+        busy: Callable[[], bool],
+        batch_size: Optional[int] = None,
+        max_defer_seconds: Optional[float] = None,
+    ) -> None:
+        self._store = store
+        self._inference = inference
+        self._reply = reply
+        self._busy = busy
+        self._batch_size = batch_size or int(os.getenv("BATCH_ASR_SIZE", "8"))
+        self._max_defer = (
+            max_defer_seconds if max_defer_seconds is not None else float(os.getenv("BATCH_MAX_DEFER_SECONDS", "2"))
+        )
+        self._queue: "asyncio.Queue[str]" = asyncio.Queue()
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    def submit(self, job_id: str) -> None:
+        self._queue.put_nowait(job_id)
+
+    async def _run(self) -> None:
+        while True:
+            job_id = await self._queue.get()
+            try:
+                await self._process(job_id)
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                logger.exception("Batch job %s failed", job_id)
+                self._store.update(job_id, status="failed", error=str(exc), finishedAt=time.time())
+                batch_jobs.labels(status="failed").inc()
+
+    async def _process(self, job_id: str) -> None:
+        status = self._store.update(job_id, status="running", startedAt=time.time())
+        if status["status"] == "cancelled":
+            return
+        options = status["options"]
+        clips = self._store.clips(job_id)
+        completed = failed = 0
+        for start in range(0, len(clips), self._batch_size):
+            if self._store.cancelled(job_id):
+                batch_jobs.labels(status="cancelled").inc()
+                return
+            await self._yield_to_interactive()
+            chunk = clips[start : start + self._batch_size]
+            payloads = await asyncio.to_thread(lambda: [path.read_bytes() for _, _, path in chunk])
+            try:
+                results = await self._inference.transcribe_batch(payloads)
+            except Exception as exc:
+                results = [exc] * len(chunk)
+            entries = []
+            for (index, name, _), result in zip(chunk, results):
+                entry = await self._entry(index, name, result, options)
+                failed += "error" in entry
+                completed += "error" not in entry
+                batch_clips.labels(status="failed" if "error" in entry else "ok").inc()
+                entries.append(entry)
+            self._store.append_results(job_id, entries)
+            for _, _, path in chunk:
+                path.unlink(missing_ok=True)
+            self._store.update(job_id, completed=completed, failed=failed)
+        self._store.update(job_id, status="done", finishedAt=time.time())
+        batch_jobs.labels(status="done").inc()
+
+    async def _yield_to_interactive(self) -> None:
+        deadline = time.monotonic() + self._max_defer
+        while self._busy() and time.monotonic() < deadline:
+            await asyncio.sleep(0.05)
+
+    async def _entry(self, index: int, name: str, result: Any, options: Dict[str, bool]) -> Dict[str, Any]:
+        entry: Dict[str, Any] = {"index": index, "name": name}
+        if isinstance(result, BaseException):
+            entry["error"] = str(result) or type(result).__name__
+            return entry
+        entry.update(
+            transcript=result.text,
+            dialect=result.dialect,
+            confidence=round(result.confidence, 3),
+            audioSeconds=round(result.audio_seconds, 2),
+        )
+        if not options.get("respond") or not result.text:
+            return entry
+        try:
+            entry["intent"], entry["response"] = await self._reply(result)
+            if options.get("synthesise"):
+                speech = await self._inference.synthesise(entry["response"], priority="bulk")
+                entry["audio"] = base64.b64encode(speech.audio).decode("ascii")
+                entry["mimeType"] = speech.mime_type
+        except Exception as exc:
+            # The transcript still stands; only the reply is missing.
+            entry["responseError"] = str(exc) or type(exc).__name__
+        return entry
@@ -0,0 +1,131 @@
+"""
+Stage-level load shedding for ``/voice/process``.
+
+Rather than blocking behind a saturated stage or failing the whole turn with a
+503, ``DegradationController`` sheds the optional part of that stage:
+
+* ``tts`` → ``text-only``: the transcript and answer come back as JSON with no audio.
+* ``llm`` → ``template-answer``: a canned answer for the recognised intent instead of a generation.
+* ``asr`` → ``small-asr``: the ``ASR_FALLBACK_MODEL`` Whisper checkpoint, when one is configured.
+
+A stage counts as overloaded when its scheduler has ``DEGRADE_MAX_BACKLOG``
+or more jobs waiting per slot, or when the EWMA of its latency reaches its
+budget (``DEGRADE_ASR_LATENCY_SECONDS`` 1.5, ``DEGRADE_LLM_LATENCY_SECONDS``
+1.5, ``DEGRADE_TTS_LATENCY_SECONDS`` 0.75, the SLOs in ``services.metrics``).
+A stage that is not ready is shed the same way. Once shed, a stage stays shed
+for at least ``DEGRADE_HOLD_SECONDS``. It is then tried again when its backlog
+has fallen below half the threshold, with its latency history cleared, since
+a stage that was skipped has no fresh latency to judge it by.
+
+Responses carry ``X-Degraded-Mode`` (``none`` or a comma-separated list of
+the modes above). ``degraded_responses_total{mode}`` counts them and
+``degradation_active{mode}`` shows which stages are currently shed.
+``DEGRADATION_ENABLED=0`` turns shedding under load off; stages that are not
+ready are still shed.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import time
+from typing import Any, Callable, Dict, Optional
+
+from .metrics import degradation_active
+
+logger = logging.getLogger("chamas.degradation")
+
+STAGE_MODES = {"asr": "small-asr", "llm": "template-answer", "tts": "text-only"}
+DEFAULT_LATENCY_BUDGETS = {"asr": 1.5, "llm": 1.5, "tts": 0.75}
+FALLBACK_ASR = "asr_fallback"
+
+TEMPLATE_ANSWERS = {
+    "join_chama": (
+        "Ili kujiunga na chama, fungua ukurasa wa chama unachopenda na ubonyeze 'Jiunge', "
+        "kisha uthibitishe kwenye pochi yako."
+    ),
+    "contribute": (
+        "Kuchangia, chagua chama chako, weka kiasi na ubonyeze 'Changia', kisha uthibitishe kwenye pochi yako."
+    ),
+    "check_balance": (
+        "Siwezi kupata akiba ya chama chako kwa sasa. Unganisha pochi yako na uangalie ukurasa wa chama, "
+        "au jaribu tena baada ya muda mfupi."
+    ),
+    "general_query": (
+        "Samahani, huduma ina shughuli nyingi kwa sasa. Unaweza kuuliza kuhusu kujiunga na chama, "
+        "kuchangia au akiba ya chama chako."
+    ),
+}
+
+
+def template_answer(intent: str) -> str:
+    return TEMPLATE_ANSWERS.get(intent, TEMPLATE_ANSWERS["general_query"])
+
+
+class _Stage:
+    __slots__ = ("latency", "shed_since")
+
+    def __init__(self) -> None:
+        self.latency = 0.0
+        self.shed_since: Optional[float] = None
+
+
+class DegradationController:
+    def __init__(
+        self,
+        enabled: Optional[bool] = None,
+        max_backlog: Optional[float] = None,
+        hold_seconds: Optional[float] = None,
+        latency_budgets: Optional[Dict[str, float]] = None,
+        alpha: float = 0.3,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._clock = clock
+        self.enabled = enabled if enabled is not None else os.getenv("DEGRADATION_ENABLED", "1") == "1"
+        self._max_backlog = max_backlog or float(os.getenv("DEGRADE_MAX_BACKLOG", "2"))
+        self._hold = hold_seconds if hold_seconds is not None else float(os.getenv("DEGRADE_HOLD_SECONDS", "15"))
+        self._budgets = latency_budgets or {
+            stage: float(os.getenv(f"DEGRADE_{stage.upper()}_LATENCY_SECONDS", str(default)))
+            for stage, default in DEFAULT_LATENCY_BUDGETS.items()
+        }
+        self._alpha = alpha
+        self._stages = {stage: _Stage() for stage in STAGE_MODES}
+
+    def observe(self, stage: str, seconds: float) -> None:
+        state = self._stages[stage]
+        state.latency += self._alpha * (seconds - state.latency)
+
+    def shed(self, stage: str, inference: Any) -> bool:
+        """Whether this turn should skip or downgrade ``stage``."""
+        if stage == "asr":
+            fallback = inference.has_fallback_asr and inference.is_ready(FALLBACK_ASR)
+            if not fallback:
+                return False
+            if not inference.is_ready("asr"):
+                return True
+        elif not inference.is_ready(stage):
+            return True
+        if not self.enabled:
+            return False
+        return self._overloaded(stage, inference.backlog(stage))
+
+    def _overloaded(self, stage: str, backlog: float) -> bool:
+        state = self._stages[stage]
+        now = self._clock()
+        if state.shed_since is None:
+            if backlog < self._max_backlog and state.latency < self._budgets[stage]:
+                return False
+            state.shed_since = now
+            degradation_active.labels(mode=STAGE_MODES[stage]).set(1)
+            logger.warning(
+                "Shedding %s (%s): backlog %.1f per slot, latency %.2fs",
+                stage, STAGE_MODES[stage], backlog, state.latency,
+            )
+            return True
+        if now - state.shed_since < self._hold or backlog >= self._max_backlog / 2:
+            return True
+        state.shed_since = None
+        state.latency = 0.0
+        degradation_active.labels(mode=STAGE_MODES[stage]).set(0)
+        logger.info("Restoring %s", stage)
+        return False
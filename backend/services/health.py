@@ -0,0 +1,128 @@
+"""
+Background health prober behind ``/health``, ``/health/ready`` and ``/health/live``.
+
+Each component registers an async probe. A background task runs every probe
+every ``HEALTH_PROBE_INTERVAL_SECONDS`` (each bounded by
+``HEALTH_PROBE_TIMEOUT_SECONDS``) and stores the result, so health endpoints
+only read the last snapshot: polling them never loads a model or blocks on an
+RPC. Probes for model-backed services inspect an already built instance via
+``ServiceRegistry.peek`` and otherwise only check that a backend is
+installed or configured.
+
+Readiness requires the components in ``HEALTH_REQUIRED_COMPONENTS``, by default
+the ones ``/voice/process`` cannot answer without: ``asr``, plus ``memory`` when
+sessions live in Redis.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import time
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
+
+from .metrics import component_healthy, component_probe_latency
+
+logger = logging.getLogger("chamas.health")
+
+# A probe returns (ok, state); state is a short word such as "ready" or "cold".
+Probe = Callable[[], Awaitable[Tuple[bool, str]]]
+
+
+@dataclass
+class ComponentStatus:
+    ok: bool
+    state: str
+    checked_at: float
+    latency_seconds: float
+    error: Optional[str] = None
+
+    def to_dict(self, now: float) -> Dict[str, object]:
+        return {
+            "ok": self.ok,
+            "state": self.state,
+            "ageSeconds": round(now - self.checked_at, 3),
+            "latencyMs": round(self.latency_seconds * 1000, 2),
+            "error": self.error,
+        }
+
+
+def default_required() -> List[str]:
+    required = ["asr"]
+    if os.getenv("REDIS_URL"):
+        required.append("memory")
+    return required
+
+
+class HealthProber:
+    def __init__(
+        self,
+        interval_seconds: Optional[float] = None,
+        timeout_seconds: Optional[float] = None,
+        required: Optional[Iterable[str]] = None,
+    ) -> None:
+        self._interval = interval_seconds or float(os.getenv("HEALTH_PROBE_INTERVAL_SECONDS", "15"))
+        self._timeout = timeout_seconds or float(os.getenv("HEALTH_PROBE_TIMEOUT_SECONDS", "3"))
+        if required is None:
+            configured = os.getenv("HEALTH_REQUIRED_COMPONENTS")
+            required = configured.split(",") if configured is not None else default_required()
+        self._required = {name.strip() for name in required if name.strip()}
+        self._probes: Dict[str, Probe] = {}
+        self._snapshot: Dict[str, ComponentStatus] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    def add(self, name: str, probe: Probe) -> None:
+        self._probes[name] = probe
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(), name="health-prober")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def refresh(self) -> None:
+        names = list(self._probes)
+        results = await asyncio.gather(*(self._probe(name) for name in names))
+        self._snapshot.update(zip(names, results))
+
+    def snapshot(self) -> Dict[str, ComponentStatus]:
+        return dict(self._snapshot)
+
+    @property
+    def ready(self) -> bool:
+        """True once every component has been probed and all required ones are ok."""
+        if any(name not in self._snapshot for name in self._probes):
+            return False
+        # A required component without a probe result is not ok.
+        return all(name in self._snapshot and self._snapshot[name].ok for name in self._required)
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.refresh()
+            except Exception as exc:  # pragma: no cover - probes handle their own errors
+                logger.warning("Health probe pass failed: %s", exc)
+            await asyncio.sleep(self._interval)
+
+    async def _probe(self, name: str) -> ComponentStatus:
+        start = time.perf_counter()
+        error: Optional[str] = None
+        try:
+            ok, state = await asyncio.wait_for(self._probes[name](), self._timeout)
+        except asyncio.TimeoutError:
+            ok, state, error = False, "timeout", f"no answer within {self._timeout:g}s"
+        except Exception as exc:
+            ok, state, error = False, "error", str(exc) or type(exc).__name__
+        latency = time.perf_counter() - start
+        component_healthy.labels(component=name).set(1 if ok else 0)
+        component_probe_latency.labels(component=name).set(latency)
+        return ComponentStatus(ok=ok, state=state, checked_at=time.time(), latency_seconds=latency, error=error)
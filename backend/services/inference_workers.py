@@ -0,0 +1,729 @@
+"""
+ASR, LLM and TTS inference, in the API process or in dedicated worker processes.
+
+``INFERENCE_MODE=inline`` (the default) runs the services from the process
+``ServiceRegistry``, as the API always has. ``INFERENCE_MODE=workers`` keeps the
+API process light: it never imports torch or loads a model, and forwards jobs
+to ``INFERENCE_ASR_WORKERS`` / ``INFERENCE_LLM_WORKERS`` /
+``INFERENCE_TTS_WORKERS`` spawned processes (one each by default), so a long
+decode cannot hold the GIL that request handling needs.
+
+Audio never travels as pickled bytes. The API decodes uploads with ffmpeg
+straight into a ``SharedMemory`` block of 16 kHz float32 PCM that the ASR
+worker maps as a numpy array. TTS workers write the synthesised audio into a
+block that the API copies once and unlinks. Only block names and small
+results cross the pipes.
+
+Each worker has its own job and result pipe, read by the event loop with
+``add_reader``. Jobs wait in a ``services.scheduler`` queue, shortest
+estimated job first, and each is handed to the ready worker with the fewest in
+flight once one is free; at most ``INFERENCE_MAX_QUEUE`` per worker wait. A worker that exits fails its in-flight jobs
+with ``InferenceUnavailable`` and is restarted. Restarts back off when a
+worker keeps dying soon after it starts. Workers run their warm-up inference
+(``services.warmup``) before they report ready.
+
+``ASR_FALLBACK_MODEL`` (e.g. ``tiny``) loads a second, smaller Whisper model
+as ``asr_fallback`` (``ASR_FALLBACK_WORKERS`` processes in worker mode) that
+``services.degradation`` switches to when the main ASR queue is overloaded.
+
+``transcribe_batch`` serves bulk jobs (``services.batch_jobs``): clips are
+decoded separately and transcribed in one batched Whisper pass. In worker
+mode ``BATCH_ASR_WORKERS`` (default 0) gives bulk jobs their own ASR
+processes so they never queue behind, or ahead of, interactive requests.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import functools
+import itertools
+import logging
+import os
+import signal
+import tempfile
+import time
+from multiprocessing import get_context
+from multiprocessing.connection import Connection
+from multiprocessing.shared_memory import SharedMemory
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from .asr_service import ASRService, TranscriptionResult
+from .degradation import FALLBACK_ASR
+from .llm_service import GenerationResult, LLMService
+from .metrics import inference_queue_depth, inference_queue_wait, inference_worker_restarts, inference_workers_ready
+from .rate_limit import audio_seconds
+from .registry import ServiceRegistry
+from .scheduler import JobScheduler, QueueFull
+from .tracing import record as record_span, span
+from .tts_service import TTSResult, TTSService
+from .warmup import ModelWarmup, record, warmup_enabled
+
+logger = logging.getLogger("chamas.inference")
+
+SERVICES = {"asr": ASRService, "llm": LLMService, "tts": TTSService}
+SAMPLE_RATE = 16000
+# A worker that dies within this many seconds of starting counts as a crash loop.
+CRASH_LOOP_SECONDS = 30.0
+MAX_RESTART_DELAY = 30.0
+# How often, and for how long, an exited worker is polled until its exit code is in.
+REAP_INTERVAL = 0.05
+REAP_SECONDS = 1.0
+
+
+class InferenceUnavailable(RuntimeError):
+    """No worker could run the job: none ready, all at their queue limit, or it died mid-job."""
+
+
+class InferenceError(RuntimeError):
+    """The job raised inside the worker."""
+
+
+class AudioDecodeError(ValueError):
+    """ffmpeg could not decode the uploaded audio."""
+
+
+# --- worker process -------------------------------------------------------
+
+
+def _run_asr(
+    service: ASRService, payload: Union[Tuple[str, int, Optional[str]], List[Tuple[str, int, Optional[str]]]]
+) -> Union[TranscriptionResult, List[TranscriptionResult]]:
+    # A list of clips is a bulk job, transcribed as one batch.
+    clips = payload if isinstance(payload, list) else [payload]
+    blocks = [SharedMemory(name=name) for name, _, _ in clips]
+    try:
+        audios = [
+            np.ndarray((samples,), dtype=np.float32, buffer=block.buf)
+            for block, (_, samples, _) in zip(blocks, clips)
+        ]
+        if isinstance(payload, list):
+            results = service.transcribe_batch(audios)
+        else:
+            results = [service.transcribe(audios[0], dialect_hint=payload[2])]
+        del audios
+    finally:
+        for block in blocks:
+            _close(block)
+    # Whisper's raw output carries per-token segments; the API only reads the summary.
+    summaries = [
+        TranscriptionResult(
+            text=result.text,
+            confidence=result.confidence,
+            dialect=result.dialect,
+            raw={},
+            audio_seconds=result.audio_seconds,
+        )
+        for result in results
+    ]
+    return summaries if isinstance(payload, list) else summaries[0]
+
+
+def _run_llm(service: LLMService, payload: Tuple[str, str, str]) -> GenerationResult:
+    user_text, context, dialect = payload
+    return service.complete(user_text=user_text, context=context, dialect=dialect)
+
+
+def _run_tts(service: TTSService, text: str) -> Tuple[str, int, str]:
+    result = service.synthesise(text)
+    size = len(result.audio)
+    block = SharedMemory(create=True, size=max(1, size))
+    block.buf[:size] = result.audio
+    block.close()
+    # The API process unlinks the block once it has copied the audio out.
+    return block.name, size, result.mime_type
+
+
+_HANDLERS = {"asr": _run_asr, "llm": _run_llm, "tts": _run_tts}
+
+
+def _worker_main(kind: str, jobs: Connection, results: Connection, options: Dict[str, Any]) -> None:
+    # Ctrl-C reaches the whole process group; the API shuts workers down itself.
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    service = SERVICES[kind](**options)
+    handler = _HANDLERS[kind]
+    try:
+        if service.is_ready and warmup_enabled():
+            service.warm_up()
+        ready = (service.is_ready, service.timings, (service.engine, service.model_name))
+        results.send((None, True, ready, 0.0))
+        while True:
+            message = jobs.recv()
+            if message is None:
+                return
+            job_id, payload = message
+            start = time.perf_counter()
+            try:
+                value = handler(service, payload)
+            except Exception as exc:
+                results.send((job_id, False, f"{type(exc).__name__}: {exc}", time.perf_counter() - start))
+            else:
+                results.send((job_id, True, value, time.perf_counter() - start))
+    except (EOFError, BrokenPipeError, ConnectionResetError):
+        # The API process closed its ends: it is shutting down or gone.
+        return
+
+
+def _close(block: SharedMemory) -> None:
+    try:
+        block.close()
+    except BufferError:  # pragma: no cover - a view outlived the job; GC releases it
+        pass
+
+
+def _unlink(name: str) -> None:
+    try:
+        block = SharedMemory(name=name)
+    except FileNotFoundError:
+        return
+    block.close()
+    block.unlink()
+
+
+# --- API process ----------------------------------------------------------
+
+
+class _Slot:
+    __slots__ = ("index", "process", "jobs", "results", "inflight", "ready", "reported", "started_at", "crashes")
+
+    def __init__(self, index: int) -> None:
+        self.index = index
+        self.process: Any = None
+        self.jobs: Optional[Connection] = None
+        self.results: Optional[Connection] = None
+        self.inflight = 0
+        self.ready = False
+        # Set once the first process in this slot has loaded (or failed to load) its model.
+        self.reported = False
+        self.started_at = 0.0
+        self.crashes = 0
+
+
+class InferencePool:
+    def __init__(
+        self,
+        kind: str,
+        size: int,
+        max_queue: int,
+        timeout_seconds: float,
+        name: Optional[str] = None,
+        options: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        self.kind = kind
+        # Keyword arguments for the service constructor in the worker, e.g. a model size.
+        self._options = options or {}
+        # Label for metrics, spans and logs; differs from kind for a second pool of the same service.
+        self.name = name or kind
+        self._context = get_context("spawn")
+        self._slots = [_Slot(index) for index in range(max(1, size))]
+        self._max_queue = max_queue
+        self._timeout = timeout_seconds
+        self._pending: Dict[int, Tuple[asyncio.Future, _Slot]] = {}
+        self._ids = itertools.count(1)
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._closing = False
+        # (engine, model) reported by the workers once they have loaded.
+        self.labels: Tuple[str, str] = ("none", "none")
+        # One job per worker at a time; the rest wait here in cost order rather than FIFO in a pipe.
+        self._scheduler = JobScheduler(self.name, size, max_pending=max_queue * max(1, size))
+
+    @property
+    def is_ready(self) -> bool:
+        return any(slot.ready for slot in self._slots)
+
+    @property
+    def warmed(self) -> bool:
+        return all(slot.reported for slot in self._slots)
+
+    @property
+    def backlog(self) -> float:
+        """Jobs waiting for a worker, per worker."""
+        return self._scheduler.pending / self._scheduler.slots
+
+    def status(self) -> Tuple[bool, str]:
+        if self.is_ready:
+            return True, "ready"
+        if any(slot.process is not None and not slot.reported for slot in self._slots):
+            return False, "starting"
+        if any(slot.process is not None for slot in self._slots):
+            return False, "unavailable"
+        return False, "down"
+
+    def start(self) -> None:
+        self._loop = asyncio.get_running_loop()
+        for slot in self._slots:
+            self._spawn(slot)
+
+    async def stop(self) -> None:
+        self._closing = True
+        processes = []
+        for slot in self._slots:
+            if slot.process is None:
+                continue
+            processes.append(slot.process)
+            try:
+                slot.jobs.send(None)  # type: ignore[union-attr]
+            except (OSError, ValueError):
+                pass
+            self._detach(slot)
+        for process in processes:
+            await asyncio.to_thread(process.join, 5)
+            if process.is_alive():
+                process.terminate()
+        self._fail_pending(None, f"{self.name} workers shut down")
+
+    async def submit(self, payload: Any, units: float = 0.0, priority: str = "interactive") -> Any:
+        """Run a job once the scheduler gives it a worker; ``units`` is its size for cost estimates."""
+        value, _ = await self.submit_timed(payload, units, priority)
+        return value
+
+    async def submit_timed(
+        self, payload: Any, units: float = 0.0, priority: str = "interactive"
+    ) -> Tuple[Any, float]:
+        """``submit``, plus the compute seconds the worker reported for the job."""
+        try:
+            return await self._scheduler.run(units, lambda: self._dispatch(payload), priority)
+        except QueueFull as exc:
+            raise InferenceUnavailable(f"The {self.name} queue is full.") from exc
+
+    async def _dispatch(self, payload: Any) -> Tuple[Any, float]:
+        candidates = [slot for slot in self._slots if slot.ready and slot.inflight < self._max_queue]
+        if not candidates:
+            raise InferenceUnavailable(f"No {self.name} worker is available.")
+        slot = min(candidates, key=lambda candidate: candidate.inflight)
+        assert self._loop is not None and slot.jobs is not None
+        job_id = next(self._ids)
+        future = self._loop.create_future()
+        try:
+            slot.jobs.send((job_id, payload))
+        except (OSError, ValueError) as exc:
+            raise InferenceUnavailable(f"{self.name} worker {slot.index} is gone.") from exc
+        self._pending[job_id] = (future, slot)
+        self._set_inflight(slot, slot.inflight + 1)
+        start = time.perf_counter()
+        try:
+            value, seconds = await asyncio.wait_for(future, self._timeout)
+            # The worker reports its compute time; the rest was queueing and transfer.
+            waited = max(0.0, time.perf_counter() - start - seconds)
+            inference_queue_wait.labels(stage=self.name).observe(waited)
+            record_span(f"{self.name}.queue", waited)
+            record_span(f"{self.name}.compute", seconds, worker=slot.index)
+            return value, seconds
+        except asyncio.TimeoutError as exc:
+            raise InferenceUnavailable(f"{self.name} job timed out after {self._timeout:g}s.") from exc
+        finally:
+            # The worker may still finish it; _on_result then discards the reply.
+            self._pending.pop(job_id, None)
+
+    def _spawn(self, slot: _Slot) -> None:
+        if self._closing or self._loop is None:
+            return
+        job_reader, job_writer = self._context.Pipe(duplex=False)
+        result_reader, result_writer = self._context.Pipe(duplex=False)
+        process = self._context.Process(
+            target=_worker_main,
+            args=(self.kind, job_reader, result_writer, self._options),
+            name=f"inference-{self.name}-{slot.index}",
+            daemon=True,
+        )
+        process.start()
+        # The child holds the other ends; closing ours makes its exit visible as EOF.
+        job_reader.close()
+        result_writer.close()
+        slot.process, slot.jobs, slot.results = process, job_writer, result_reader
+        slot.ready = False
+        slot.started_at = time.monotonic()
+        self._set_inflight(slot, 0)
+        self._loop.add_reader(result_reader.fileno(), self._on_result, slot)
+        self._loop.add_reader(process.sentinel, self._on_exit, slot)
+
+    def _detach(self, slot: _Slot) -> None:
+        assert self._loop is not None
+        if slot.results is not None:
+            self._loop.remove_reader(slot.results.fileno())
+            slot.results.close()
+        if slot.process is not None:
+            self._loop.remove_reader(slot.process.sentinel)
+        if slot.jobs is not None:
+            slot.jobs.close()
+        slot.jobs = slot.results = None
+        slot.ready = False
+        self._update_ready()
+
+    def _on_result(self, slot: _Slot) -> None:
+        assert slot.results is not None
+        try:
+            message = slot.results.recv()
+        except (EOFError, OSError):
+            # The worker is gone; its sentinel fires next and _on_exit restarts it.
+            self._loop.remove_reader(slot.results.fileno())  # type: ignore[union-attr]
+            return
+        self._handle(slot, message)
+
+    def _handle(self, slot: _Slot, message: Tuple[Optional[int], bool, Any, float]) -> None:
+        job_id, ok, value, seconds = message
+        if job_id is None:
+            ready, timings, labels = value
+            slot.ready = bool(ready)
+            slot.reported = True
+            record(self.name, timings)
+            if slot.ready:
+                self.labels = labels
+            if not slot.ready:
+                logger.warning("%s worker %d started without a usable model", self.name, slot.index)
+            self._update_ready()
+            return
+        self._set_inflight(slot, max(0, slot.inflight - 1))
+        entry = self._pending.pop(job_id, None)
+        if entry is None or entry[0].done():
+            if ok and self.kind == "tts":
+                _unlink(value[0])
+            return
+        future = entry[0]
+        if ok:
+            future.set_result((value, seconds))
+        else:
+            future.set_exception(InferenceError(value))
+
+    def _on_exit(self, slot: _Slot) -> None:
+        # Replies written just before the exit are still in the pipe. Its writer
+        # is gone, so recv() returns what is there or hits EOF; it never waits.
+        try:
+            while slot.results is not None and slot.results.poll():
+                self._handle(slot, slot.results.recv())
+        except (EOFError, OSError):
+            pass
+        process = slot.process
+        self._detach(slot)
+        slot.process = None
+        self._reap(slot, process, time.monotonic() + REAP_SECONDS)
+
+    def _reap(self, slot: _Slot, process: Any, deadline: float) -> None:
+        # The sentinel fires as the child exits and reaping it can lag by a
+        # moment; poll for the exit code instead of blocking the loop on join.
+        process.join(0)
+        if process.exitcode is None and time.monotonic() < deadline:
+            self._loop.call_later(REAP_INTERVAL, self._reap, slot, process, deadline)  # type: ignore[union-attr]
+            return
+        self._set_inflight(slot, 0)
+        self._fail_pending(slot, f"{self.name} worker {slot.index} exited with code {process.exitcode}")
+        if self._closing:
+            return
+        inference_worker_restarts.labels(kind=self.name).inc()
+        if time.monotonic() - slot.started_at < CRASH_LOOP_SECONDS:
+            slot.crashes += 1
+        else:
+            slot.crashes = 0
+        delay = min(MAX_RESTART_DELAY, 0.5 * 2 ** slot.crashes) if slot.crashes else 0.0
+        logger.warning(
+            "%s worker %d exited with code %s; restarting in %.1fs", self.name, slot.index, process.exitcode, delay
+        )
+        self._loop.call_later(delay, self._spawn, slot)  # type: ignore[union-attr]
+
+    def _fail_pending(self, slot: Optional[_Slot], reason: str) -> None:
+        for job_id, (future, owner) in list(self._pending.items()):
+            if slot is None or owner is slot:
+                del self._pending[job_id]
+                if not future.done():
+                    future.set_exception(InferenceUnavailable(reason))
+
+    def _set_inflight(self, slot: _Slot, value: int) -> None:
+        slot.inflight = value
+        inference_queue_depth.labels(kind=self.name, worker=str(slot.index)).set(value)
+
+    def _update_ready(self) -> None:
+        inference_workers_ready.labels(kind=self.name).set(sum(slot.ready for slot in self._slots))
+
+
+class InlineInference:
+    """Runs the registry's services in the API process."""
+
+    def __init__(self, registry: ServiceRegistry) -> None:
+        self._registry = registry
+        self._kinds = list(SERVICES)
+        fallback_model = os.getenv("ASR_FALLBACK_MODEL")
+        if fallback_model:
+            registry.register(FALLBACK_ASR, functools.partial(ASRService, model_size=fallback_model))
+            self._kinds.append(FALLBACK_ASR)
+        self._warmup = ModelWarmup(registry, self._kinds) if warmup_enabled() else None
+        # One call per service at a time, off the event loop, shortest first.
+        self._schedulers = {kind: JobScheduler(kind, 1) for kind in self._kinds}
+        self._building: Dict[str, asyncio.Future] = {}
+
+    def start(self) -> None:
+        if self._warmup is not None:
+            self._warmup.start()
+
+    async def stop(self) -> None:
+        if self._warmup is not None:
+            await self._warmup.stop()
+
+    def preload(self) -> None:
+        for kind in self._kinds:
+            record(kind, self._registry.get(kind).timings)
+
+    @property
+    def warmed(self) -> bool:
+        return self._warmup is None or self._warmup.done
+
+    def is_ready(self, kind: str) -> bool:
+        if self._warmup is not None and self._warmup.state(kind) in ("pending", "warming"):
+            # Loading happens in the background; never block the event loop on it.
+            return False
+        instance = self._registry.peek(kind)
+        if instance is None:
+            # No warm-up built it: load it in a thread and answer not ready until it exists.
+            self._build(kind)
+            return False
+        return instance.is_ready
+
+    def status(self, kind: str) -> Tuple[bool, str]:
+        if self._warmup is not None and self._warmup.state(kind) in ("pending", "warming"):
+            return False, "warming"
+        instance = self._registry.peek(kind)
+        if instance is None:
+            # Not built yet: report whether it could be, never load it here.
+            available = SERVICES[kind.split("_")[0]].backend_available()
+            return available, "cold" if available else "unavailable"
+        return instance.is_ready, "ready" if instance.is_ready else "unavailable"
+
+    @property
+    def has_fallback_asr(self) -> bool:
+        return FALLBACK_ASR in self._kinds
+
+    def backlog(self, kind: str) -> float:
+        """Calls waiting for the service, per call it runs at a time."""
+        return self._schedulers[kind].pending / self._schedulers[kind].slots
+
+    def labels(self, kind: str) -> Tuple[str, str]:
+        """``(engine, model)`` of the built service, for metric labels."""
+        instance = self._registry.peek(kind)
+        return (instance.engine, instance.model_name) if instance is not None else ("none", "none")
+
+    async def transcribe(self, payload: bytes, suffix: str, fallback: bool = False) -> TranscriptionResult:
+        with span("asr.tempfile"):
+            tmp = tempfile.NamedTemporaryFile(delete=False, suffix=suffix)
+            tmp.write(payload)
+            tmp.close()
+        path = Path(tmp.name)
+        kind = FALLBACK_ASR if fallback else "asr"
+        service = await self._service(kind)
+
+        async def job() -> TranscriptionResult:
+            start = time.perf_counter()
+            result = await asyncio.to_thread(service.transcribe, path)
+            result.compute_seconds = time.perf_counter() - start
+            return result
+
+        try:
+            return await self._schedulers[kind].run(audio_seconds(payload), job)
+        finally:
+            path.unlink(missing_ok=True)
+
+    async def transcribe_batch(self, payloads: Sequence[bytes]) -> List[Union[TranscriptionResult, Exception]]:
+        """Transcribe several clips in one batch; a clip that cannot be decoded gets its error instead."""
+        decoded = await asyncio.gather(*(decode_samples(payload) for payload in payloads), return_exceptions=True)
+        audios = [audio for audio in decoded if not isinstance(audio, BaseException)]
+        # Off the event loop: a batch takes far longer than one interactive clip.
+        service = await self._service("asr")
+        transcribed = iter(
+            await self._schedulers["asr"].run(
+                sum(len(audio) for audio in audios) / SAMPLE_RATE,
+                lambda: asyncio.to_thread(service.transcribe_batch, audios),
+                "bulk",
+            )
+            if audios
+            else []
+        )
+        return [audio if isinstance(audio, BaseException) else next(transcribed) for audio in decoded]
+
+    async def generate(
+        self, user_text: str, context: str, dialect: str, priority: str = "interactive"
+    ) -> GenerationResult:
+        service = await self._service("llm")
+        return await self._schedulers["llm"].run(
+            len(user_text) + len(context),
+            lambda: asyncio.to_thread(service.complete, user_text=user_text, context=context, dialect=dialect),
+            priority,
+        )
+
+    async def synthesise(self, text: str, priority: str = "interactive") -> TTSResult:
+        service = await self._service("tts")
+        return await self._schedulers["tts"].run(
+            len(text), lambda: asyncio.to_thread(service.synthesise, text), priority
+        )
+
+    async def _service(self, kind: str) -> Any:
+        instance = self._registry.peek(kind)
+        if instance is None:
+            instance = await asyncio.to_thread(self._registry.get, kind)
+        return instance
+
+    def _build(self, kind: str) -> None:
+        if kind in self._building:
+            return
+        future = asyncio.ensure_future(asyncio.to_thread(self._registry.get, kind))
+        self._building[kind] = future
+        future.add_done_callback(functools.partial(self._built, kind))
+
+    def _built(self, kind: str, future: asyncio.Future) -> None:
+        del self._building[kind]
+        if future.cancelled():
+            return
+        if future.exception() is not None:
+            # Left out of the registry, so the next is_ready call tries again.
+            logger.error("Building %s failed: %s", kind, future.exception())
+            return
+        record(kind, future.result().timings)
+
+
+class WorkerInference:
+    """Forwards jobs to per-service worker process pools."""
+
+    def __init__(self, sizes: Optional[Dict[str, int]] = None) -> None:
+        max_queue = int(os.getenv("INFERENCE_MAX_QUEUE", "8"))
+        timeout = float(os.getenv("INFERENCE_TIMEOUT_SECONDS", "120"))
+        sizes = sizes or {kind: int(os.getenv(f"INFERENCE_{kind.upper()}_WORKERS", "1")) for kind in SERVICES}
+        self._pools = {kind: InferencePool(kind, sizes[kind], max_queue, timeout) for kind in SERVICES}
+        fallback_model = os.getenv("ASR_FALLBACK_MODEL")
+        if fallback_model:
+            self._pools[FALLBACK_ASR] = InferencePool(
+                "asr",
+                int(os.getenv("ASR_FALLBACK_WORKERS", "1")),
+                max_queue,
+                timeout,
+                name=FALLBACK_ASR,
+                options={"model_size": fallback_model},
+            )
+        batch_workers = int(os.getenv("BATCH_ASR_WORKERS", "0"))
+        self._batch_pool = (
+            InferencePool("asr", batch_workers, max_queue, timeout, name="asr_batch") if batch_workers > 0 else None
+        )
+
+    def _all_pools(self) -> List[InferencePool]:
+        return [*self._pools.values(), *([self._batch_pool] if self._batch_pool is not None else [])]
+
+    def start(self) -> None:
+        for pool in self._all_pools():
+            pool.start()
+
+    async def stop(self) -> None:
+        await asyncio.gather(*(pool.stop() for pool in self._all_pools()))
+
+    def preload(self) -> None:
+        # Models live in the worker processes, which load them when they start.
+        pass
+
+    @property
+    def warmed(self) -> bool:
+        return all(pool.warmed for pool in self._pools.values())
+
+    def is_ready(self, kind: str) -> bool:
+        return self._pools[kind].is_ready
+
+    def status(self, kind: str) -> Tuple[bool, str]:
+        return self._pools[kind].status()
+
+    @property
+    def has_fallback_asr(self) -> bool:
+        return FALLBACK_ASR in self._pools
+
+    def backlog(self, kind: str) -> float:
+        return self._pools[kind].backlog
+
+    def labels(self, kind: str) -> Tuple[str, str]:
+        return self._pools[kind].labels
+
+    async def transcribe(self, payload: bytes, suffix: str, fallback: bool = False) -> TranscriptionResult:
+        with span("asr.decode"):
+            block, samples = await decode_pcm(payload)
+        try:
+            result, seconds = await self._pools[FALLBACK_ASR if fallback else "asr"].submit_timed(
+                (block.name, samples, None), samples / SAMPLE_RATE
+            )
+        finally:
+            block.close()
+            block.unlink()
+        result.compute_seconds = seconds
+        return result
+
+    async def transcribe_batch(self, payloads: Sequence[bytes]) -> List[Union[TranscriptionResult, Exception]]:
+        """Transcribe several clips in one batch; a clip that cannot be decoded gets its error instead."""
+        decoded = await asyncio.gather(*(decode_pcm(payload) for payload in payloads), return_exceptions=True)
+        blocks = [item for item in decoded if not isinstance(item, BaseException)]
+        pool = self._batch_pool or self._pools["asr"]
+        try:
+            batch = [(block.name, samples, None) for block, samples in blocks]
+            units = sum(samples for _, samples in blocks) / SAMPLE_RATE
+            transcribed = iter(await pool.submit(batch, units, "bulk") if batch else [])
+        finally:
+            for block, _ in blocks:
+                block.close()
+                block.unlink()
+        return [item if isinstance(item, BaseException) else next(transcribed) for item in decoded]
+
+    async def generate(
+        self, user_text: str, context: str, dialect: str, priority: str = "interactive"
+    ) -> GenerationResult:
+        return await self._pools["llm"].submit((user_text, context, dialect), len(user_text) + len(context), priority)
+
+    async def synthesise(self, text: str, priority: str = "interactive") -> TTSResult:
+        name, size, mime_type = await self._pools["tts"].submit(text, len(text), priority)
+        block = SharedMemory(name=name)
+        try:
+            audio = bytes(block.buf[:size])
+        finally:
+            block.close()
+            block.unlink()
+        return TTSResult(audio=audio, mime_type=mime_type)
+
+
+Inference = Union[InlineInference, WorkerInference]
+
+
+def create_inference(registry: ServiceRegistry) -> Inference:
+    mode = os.getenv("INFERENCE_MODE", "inline").lower()
+    if mode == "workers":
+        return WorkerInference()
+    if mode != "inline":
+        raise ValueError(f"INFERENCE_MODE must be 'inline' or 'workers', got {mode!r}")
+    return InlineInference(registry)
+
+
+async def _decode_s16(payload: bytes) -> bytes:
+    """Decode any ffmpeg-readable audio into 16 kHz mono signed 16-bit samples."""
+    try:
+        process = await asyncio.create_subprocess_exec(
+            "ffmpeg", "-nostdin", "-threads", "0", "-i", "pipe:0",
+            "-f", "s16le", "-ac", "1", "-acodec", "pcm_s16le", "-ar", str(SAMPLE_RATE), "-",
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+        )
+    except FileNotFoundError as exc:
+        raise InferenceUnavailable("ffmpeg is required to decode audio in worker mode.") from exc
+    out, err = await process.communicate(payload)
+    if process.returncode != 0:
+        lines: List[str] = err.decode("utf-8", errors="replace").strip().splitlines()
+        raise AudioDecodeError(lines[-1] if lines else "ffmpeg could not decode the audio")
+    return out
+
+
+async def decode_samples(payload: bytes) -> np.ndarray:
+    """Decode any ffmpeg-readable audio into 16 kHz mono float32 samples."""
+    out = await _decode_s16(payload)
+    return np.frombuffer(out, dtype=np.int16, count=len(out) // 2).astype(np.float32) / 32768.0
+
+
+async def decode_pcm(payload: bytes) -> Tuple[SharedMemory, int]:
+    """Decode any ffmpeg-readable audio into a shared block of 16 kHz mono float32 samples."""
+    out = await _decode_s16(payload)
+    samples = len(out) // 2
+    block = SharedMemory(create=True, size=max(1, samples * 4))
+    pcm = np.ndarray((samples,), dtype=np.float32, buffer=block.buf)
+    pcm[:] = np.frombuffer(out, dtype=np.int16, count=samples)
+    pcm /= 32768.0
+    del pcm
+    return block, samples
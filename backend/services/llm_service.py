@@ -9,22 +9,35 @@ hackathon while ensuring the interface remains stable for the frontend.
 
 from __future__ import annotations
 
+import functools
+import importlib.util
 import os
+import time
 from dataclasses import dataclass
 from typing import Dict, Optional
 
-try:
-    import torch  # type: ignore
-    from transformers import AutoModelForCausalLM, AutoTokenizer  # type: ignore
-except Exception:  # pragma: no cover - transformers optional
-    torch = None
-    AutoModelForCausalLM = None
-    AutoTokenizer = None
+from .tracing import span
 
-try:
-    from openai import OpenAI  # type: ignore
-except Exception:  # pragma: no cover - openai optional
-    OpenAI = None
+
+@functools.lru_cache(maxsize=None)
+def _import_openai():
+    """The openai client library, imported when the service is built; None if missing."""
+    try:
+        import openai  # type: ignore
+    except Exception:  # pragma: no cover - openai optional
+        return None
+    return openai
+
+
+@functools.lru_cache(maxsize=None)
+def _import_transformers():
+    """``(torch, transformers)``, imported when a local model is built; None if missing."""
+    try:
+        import torch  # type: ignore
+        import transformers  # type: ignore
+    except Exception:  # pragma: no cover - transformers optional
+        return None
+    return torch, transformers
 
 
 DEFAULT_SYSTEM_PROMPT = (
@@ -34,6 +47,13 @@ DEFAULT_SYSTEM_PROMPT = (
 )
 
 
+@dataclass
+class GenerationResult:
+    text: str
+    prompt_tokens: int = 0
+    output_tokens: int = 0
+
+
 @dataclass
 class GenerationConfig:
     max_new_tokens: int = 180
@@ -54,25 +74,36 @@ class LLMService:
         self._hf_model = None
         self._hf_tokenizer = None
         self._client = None
+        self._torch = None
         self._model_id = model_id or os.getenv("CHAMAS_LLM_MODEL", "meta-llama/Llama-3.1-8B-Instruct")
+        # Seconds spent per startup phase ("import", "load", "warmup").
+        self.timings: Dict[str, float] = {}
 
         api_key = os.getenv("OPENAI_API_KEY")
         base_url = os.getenv("OPENAI_BASE_URL")
 
-        if api_key and OpenAI is not None:
-            self._client = OpenAI(api_key=api_key, base_url=base_url or None)  # type: ignore[arg-type]
-
-        if self._client is None and AutoTokenizer is not None and AutoModelForCausalLM is not None:
+        start = time.perf_counter()
+        openai = _import_openai() if api_key else None
+        if openai is not None:
+            self._client = openai.OpenAI(api_key=api_key, base_url=base_url or None)  # type: ignore[arg-type]
+            self.timings["import"] = time.perf_counter() - start
+
+        imported = _import_transformers() if self._client is None else None
+        if imported is not None:
+            torch, transformers = imported
+            self._torch = torch
+            self.timings["import"] = time.perf_counter() - start
+            start = time.perf_counter()
             try:
                 kwargs: Dict[str, object] = {}
-                if torch is not None:
-                    kwargs["torch_dtype"] = torch.float16 if torch.cuda.is_available() else torch.float32  # type: ignore[union-attr]
-                    if torch.cuda.is_available():
-                        kwargs["device_map"] = "auto"  # type: ignore[assignment]
+                kwargs["torch_dtype"] = torch.float16 if torch.cuda.is_available() else torch.float32
+                if torch.cuda.is_available():
+                    kwargs["device_map"] = "auto"  # type: ignore[assignment]
 
-                self._hf_tokenizer = AutoTokenizer.from_pretrained(self._model_id)
-                self._hf_model = AutoModelForCausalLM.from_pretrained(self._model_id, **kwargs)
+                self._hf_tokenizer = transformers.AutoTokenizer.from_pretrained(self._model_id)
+                self._hf_model = transformers.AutoModelForCausalLM.from_pretrained(self._model_id, **kwargs)
                 self._hf_model.eval()
+                self.timings["load"] = time.perf_counter() - start
             except Exception:
                 # Model not available (gated, network issue, etc.) - will use fallback
                 self._hf_tokenizer = None
@@ -82,21 +113,57 @@ class LLMService:
     def is_ready(self) -> bool:
         return bool(self._client or self._hf_model)
 
+    @property
+    def engine(self) -> str:
+        if self._client is not None:
+            return "openai"
+        return "transformers" if self._hf_model is not None else "fallback"
+
+    @property
+    def model_name(self) -> str:
+        return self._model_id if self.is_ready else "none"
+
+    @staticmethod
+    def backend_available() -> bool:
+        """Whether a client or local model could be set up, without loading it."""
+        if os.getenv("OPENAI_API_KEY") and importlib.util.find_spec("openai") is not None:
+            return True
+        return importlib.util.find_spec("transformers") is not None
+
+    def warm_up(self) -> None:
+        """Run a short local generation; a remote client has nothing to warm and is not billed for one."""
+        if self._hf_model is None or self._hf_tokenizer is None:
+            return
+        start = time.perf_counter()
+        self._generate_locally(self._build_prompt("Habari", "", "kiswahili_sanifu"), max_new_tokens=8)
+        self.timings["warmup"] = time.perf_counter() - start
+
     def generate(
         self,
         user_text: str,
         context: str = "",
         dialect: str = "kiswahili_sanifu",
     ) -> str:
+        return self.complete(user_text=user_text, context=context, dialect=dialect).text
+
+    def complete(
+        self,
+        user_text: str,
+        context: str = "",
+        dialect: str = "kiswahili_sanifu",
+    ) -> GenerationResult:
+        """Like ``generate``, with the prompt and output token counts when the engine reports them."""
         prompt = self._build_prompt(user_text=user_text, context=context, dialect=dialect)
 
         if self._client is not None:
-            return self._generate_via_client(prompt)
+            with span("llm.remote"):
+                return self._generate_via_client(prompt)
 
         if self._hf_model is not None and self._hf_tokenizer is not None:
-            return self._generate_locally(prompt)
+            with span("llm.local"):
+                return self._generate_locally(prompt)
 
-        return self._fallback_response(user_text=user_text)
+        return GenerationResult(text=self._fallback_response(user_text=user_text))
 
     def _build_prompt(self, user_text: str, context: str, dialect: str) -> str:
         dialect_instruction = {
@@ -118,7 +185,7 @@ class LLMService:
 
         return "\n\n".join(pieces)
 
-    def _generate_via_client(self, prompt: str) -> str:
+    def _generate_via_client(self, prompt: str) -> GenerationResult:
         assert self._client is not None  # for type-checkers
 
         completion = self._client.responses.create(  # type: ignore[attr-defined]
@@ -136,30 +203,40 @@ class LLMService:
                     value = getattr(content, "text", None)
                     if value:
                         first_text += value
-        return first_text.strip() or self._fallback_response(user_text=prompt)
+        usage = getattr(completion, "usage", None)
+        return GenerationResult(
+            text=first_text.strip() or self._fallback_response(user_text=prompt),
+            prompt_tokens=int(getattr(usage, "input_tokens", 0) or 0),
+            output_tokens=int(getattr(usage, "output_tokens", 0) or 0),
+        )
 
-    def _generate_locally(self, prompt: str) -> str:
+    def _generate_locally(self, prompt: str, max_new_tokens: Optional[int] = None) -> GenerationResult:
         assert self._hf_model is not None and self._hf_tokenizer is not None
 
         inputs = self._hf_tokenizer(prompt, return_tensors="pt")
 
-        if torch is not None and torch.cuda.is_available():  # type: ignore[union-attr]
+        if self._torch.cuda.is_available():  # type: ignore[union-attr]
             inputs = {key: tensor.to("cuda") for key, tensor in inputs.items()}
 
-        with torch.no_grad():  # type: ignore[union-attr]
+        with self._torch.no_grad():  # type: ignore[union-attr]
             output = self._hf_model.generate(
                 **inputs,
-                max_new_tokens=self._generation.max_new_tokens,
+                max_new_tokens=max_new_tokens or self._generation.max_new_tokens,
                 do_sample=True,
                 temperature=self._generation.temperature,
                 top_p=self._generation.top_p,
                 pad_token_id=self._hf_tokenizer.eos_token_id,
             )
 
+        prompt_tokens = int(inputs["input_ids"].shape[-1])
         text = self._hf_tokenizer.decode(output[0], skip_special_tokens=True)
         if "Swali la mtumiaji" in text:
             text = text.split("Swali la mtumiaji")[-1]
-        return text.strip()
+        return GenerationResult(
+            text=text.strip(),
+            prompt_tokens=prompt_tokens,
+            output_tokens=int(output[0].shape[-1]) - prompt_tokens,
+        )
 
     @staticmethod
     def _fallback_response(user_text: str) -> str:
@@ -1,100 +1,288 @@
 """
 Redis-backed short-term memory for keeping conversational context.
+
+All Redis access goes through ``redis.asyncio`` on a connection pool shared by
+every ``ContextMemory`` built for the same URL, so request handlers never open
+a fresh pool or block the event loop. Writes for a request are queued on a
+single MULTI pipeline: a voice request costs one round trip to read context
+and one to persist the exchange.
+
+A bounded in-process ``SessionStore`` sits in front of Redis as an L1. Every
+write also INCRs ``session:{id}:v``, and a cached session is only served after
+a GET of that key shows no other worker has written since it was copied, so
+the L1 saves decoding the lists but never serves stale turns or wallets. When
+``REDIS_URL`` is unset the store is the only backend and context survives for
+the session TTL on that process.
+
+Entries are stored in the compact format from ``session_codec``; JSON entries
+written by older releases are still read.
 """
 
 from __future__ import annotations
 
-import json
 import os
-from datetime import datetime, timedelta
-from typing import Dict, List, Optional
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+from .metrics import redis_latency
+from .redis_pool import aioredis, shared_pool
+from .session_codec import decode_intent, decode_turn, encode_intent, encode_turn, isoformat
+from .session_store import IntentRecord, SessionStore, Turn
+from .tracing import span
+
+
+MAX_TURNS = 10
+MAX_INTENTS = 20
 
-try:
-    import redis  # type: ignore
-except Exception:  # pragma: no cover - optional dependency
-    redis = None
+_STORES: Dict[float, SessionStore] = {}
+
+
+def _shared_store(ttl_seconds: float) -> SessionStore:
+    store = _STORES.get(ttl_seconds)
+    if store is None:
+        store = SessionStore(
+            ttl_seconds=ttl_seconds,
+            max_bytes=int(os.getenv("SESSION_L1_MAX_BYTES", str(32 * 1024 * 1024))),
+            max_turns=MAX_TURNS,
+            max_intents=MAX_INTENTS,
+        )
+        _STORES[ttl_seconds] = store
+    return store
 
 
 class ContextMemory:
-    def __init__(self, redis_url: Optional[str] = None, ttl_seconds: int = 3600) -> None:
+    def __init__(
+        self,
+        redis_url: Optional[str] = None,
+        ttl_seconds: int = 3600,
+        store: Optional[SessionStore] = None,
+        client: Optional[Any] = None,
+    ) -> None:
         self._ttl = ttl_seconds
         self._client = None
         self._enabled = False
+        self._store: Optional[SessionStore] = None
 
         redis_url = redis_url or os.getenv("REDIS_URL")
-        if redis_url and redis is not None:
+        if client is not None:
+            # An already-built client, such as the load test's in-memory stand-in.
+            self._client = client
+            self._enabled = True
+        elif redis_url and aioredis is not None:
             try:
-                self._client = redis.from_url(redis_url, decode_responses=True)
+                self._client = aioredis.Redis(connection_pool=shared_pool(redis_url))
                 self._enabled = True
             except Exception:
                 self._client = None
                 self._enabled = False
 
+        if store is not None:
+            self._store = store
+        elif os.getenv("SESSION_L1_ENABLED", "1") != "0" or self._client is None:
+            # With Redis behind it the L1 only needs to outlive a conversation
+            # burst; reads check its version against Redis either way.
+            l1_ttl = float(os.getenv("SESSION_L1_TTL", "300")) if self._client is not None else ttl_seconds
+            self._store = _shared_store(l1_ttl)
+
     @property
     def is_ready(self) -> bool:
-        return self._enabled and self._client is not None
+        return self._store is not None or (self._enabled and self._client is not None)
 
-    def append_turn(self, session_id: str, user_text: str, ai_text: str, dialect: str) -> None:
+    async def ping(self) -> bool:
+        """Round-trip to Redis; True without Redis when the in-process store is serving."""
+        if self._client is None:
+            return self._store is not None
+        async with self._timed("ping"):
+            return bool(await self._client.ping())
+
+    async def record_exchange(
+        self,
+        session_id: str,
+        user_text: str,
+        ai_text: str,
+        dialect: str,
+        intent: str,
+        confidence: float,
+        wallet: Optional[str] = None,
+    ) -> None:
+        """Persist a turn, its intent and any newly bound wallet in one MULTI round trip."""
         if not self.is_ready:
             return
 
-        turn = {
-            "user": user_text,
-            "ai": ai_text,
-            "dialect": dialect,
-            "ts": datetime.utcnow().isoformat(),
-        }
-        key = self._turns_key(session_id)
-        assert self._client is not None
-        self._client.lpush(key, json.dumps(turn))
-        self._client.ltrim(key, 0, 9)
-        self._client.expire(key, self._ttl)
+        now = time.time()
+        turn = Turn(user=user_text, ai=ai_text, dialect=dialect, ts=now)
+        record = IntentRecord(intent=intent, confidence=confidence, ts=now)
+        if self._client is None:
+            self._store.append(session_id, turn=turn, intent=record, wallet=wallet)
+            return
 
-    def recent_context(self, session_id: str, limit: int = 5) -> str:
+        pipe = self._client.pipeline(transaction=True)
+        self._queue_turn(pipe, session_id, turn)
+        self._queue_intent(pipe, session_id, record)
+        wallet_key = self._wallet_key(session_id)
+        if wallet is not None:
+            pipe.set(wallet_key, wallet.encode("utf-8"), ex=self._ttl)
+        else:
+            pipe.expire(wallet_key, self._ttl)
+        await self._commit(pipe, session_id, "record_exchange", turn=turn, intent=record, wallet=wallet)
+
+    async def append_turn(self, session_id: str, user_text: str, ai_text: str, dialect: str) -> None:
+        if not self.is_ready:
+            return
+
+        turn = Turn(user=user_text, ai=ai_text, dialect=dialect, ts=time.time())
+        if self._client is None:
+            self._store.append(session_id, turn=turn)
+            return
+
+        pipe = self._client.pipeline(transaction=True)
+        self._queue_turn(pipe, session_id, turn)
+        await self._commit(pipe, session_id, "append_turn", turn=turn)
+
+    async def recent_context(self, session_id: str, limit: int = 5) -> str:
         if not self.is_ready:
             return ""
 
-        key = self._turns_key(session_id)
-        assert self._client is not None
-        data = self._client.lrange(key, 0, limit - 1)
-        snippets: List[str] = []
-        for entry in reversed(data):
-            try:
-                payload: Dict[str, str] = json.loads(entry)
-                snippets.append(f"Mtumiaji: {payload['user']}\nAI: {payload['ai']}")
-            except Exception:
-                continue
-        return "\n".join(snippets)
+        turns = (await self._session(session_id))[0]
+        return self._format_turns(turns[:limit])
 
-    def append_intent(self, session_id: str, intent: str, confidence: float) -> None:
+    async def context_and_wallet(self, session_id: str, limit: int = 5) -> Tuple[str, Optional[str]]:
+        """``recent_context`` and ``wallet`` from a single read of the session."""
+        if not self.is_ready:
+            return "", None
+
+        turns, _, wallet = await self._session(session_id)
+        return self._format_turns(turns[:limit]), wallet or None
+
+    async def append_intent(self, session_id: str, intent: str, confidence: float) -> None:
         if not self.is_ready:
             return
 
-        payload = {
-            "intent": intent,
-            "confidence": confidence,
-            "ts": datetime.utcnow().isoformat(),
-        }
-        key = self._intent_key(session_id)
-        assert self._client is not None
-        self._client.lpush(key, json.dumps(payload))
-        self._client.ltrim(key, 0, 19)
-        self._client.expire(key, self._ttl)
+        record = IntentRecord(intent=intent, confidence=confidence, ts=time.time())
+        if self._client is None:
+            self._store.append(session_id, intent=record)
+            return
 
-    def intents(self, session_id: str) -> List[Dict[str, object]]:
+        pipe = self._client.pipeline(transaction=True)
+        self._queue_intent(pipe, session_id, record)
+        await self._commit(pipe, session_id, "append_intent", intent=record)
+
+    async def intents(self, session_id: str) -> List[Dict[str, object]]:
         if not self.is_ready:
             return []
 
+        records = (await self._session(session_id))[1]
+        return [
+            {"intent": record.intent, "confidence": record.confidence, "ts": isoformat(record.ts)}
+            for record in records
+        ]
+
+    async def wallet(self, session_id: str) -> Optional[str]:
+        """The wallet address bound to the session, if any."""
+        if not self.is_ready:
+            return None
+
+        return (await self._session(session_id))[2] or None
+
+    async def _session(self, session_id: str) -> Tuple[List[Turn], List[IntentRecord], str]:
+        """Turns and intents newest first and the bound wallet, from the L1 when it is current."""
+        if await self._l1_current(session_id):
+            turns = self._store.turns(session_id)
+            intents = self._store.intents(session_id)
+            wallet = self._store.wallet(session_id)
+            # The entry can still expire or be evicted while the version check awaits.
+            if turns is not None and intents is not None and wallet is not None:
+                return turns, intents, wallet
+        return await self._load(session_id)
+
+    async def _l1_current(self, session_id: str) -> bool:
+        """Whether the L1 copy matches Redis; with Redis this costs a single GET of the version key."""
+        if self._store is None:
+            return False
+        cached = self._store.version(session_id)
+        if cached is None:
+            return False
+        if self._client is None:
+            return True
+        async with self._timed("session_version"):
+            raw_version = await self._client.get(self._version_key(session_id))
+        if int(raw_version or 0) == cached:
+            return True
+        # Another worker has written to the session since this copy was taken.
+        self._store.discard(session_id)
+        return False
+
+    async def _load(self, session_id: str) -> Tuple[List[Turn], List[IntentRecord], str]:
+        """Read turns, intents, the bound wallet and the version in one round trip and seed the L1 with them."""
+        if self._client is None:
+            return [], [], ""
+
+        pipe = self._client.pipeline(transaction=False)
+        pipe.lrange(self._turns_key(session_id), 0, MAX_TURNS - 1)
+        pipe.lrange(self._intent_key(session_id), 0, MAX_INTENTS - 1)
+        pipe.get(self._wallet_key(session_id))
+        pipe.get(self._version_key(session_id))
+        async with self._timed("load_session"):
+            raw_turns, raw_intents, raw_wallet, raw_version = await pipe.execute()
+
+        turns = [turn for turn in map(decode_turn, raw_turns) if turn is not None]
+        intents = [record for record in map(decode_intent, raw_intents) if record is not None]
+        wallet = raw_wallet.decode("utf-8") if raw_wallet else ""
+        if self._store is not None:
+            self._store.load(session_id, turns, intents, wallet=wallet, version=int(raw_version or 0))
+        return turns, intents, wallet
+
+    async def _commit(
+        self,
+        pipe,
+        session_id: str,
+        operation: str,
+        turn: Optional[Turn] = None,
+        intent: Optional[IntentRecord] = None,
+        wallet: Optional[str] = None,
+    ) -> None:
+        """Run a write pipeline with a version bump, then apply the write to the L1 copy if it was current."""
+        version_key = self._version_key(session_id)
+        pipe.incr(version_key)
+        pipe.expire(version_key, self._ttl)
+        async with self._timed(operation):
+            results = await pipe.execute()
+        if self._store is None:
+            return
+
+        version = int(results[-2])
+        if self._store.version(session_id) == version - 1:
+            self._store.append(session_id, turn=turn, intent=intent, wallet=wallet, version=version)
+        else:
+            # Not cached, or another worker wrote in between: the next read reloads.
+            self._store.discard(session_id)
+
+    @staticmethod
+    def _format_turns(turns: List[Turn]) -> str:
+        return "\n".join(f"Mtumiaji: {turn.user}\nAI: {turn.ai}" for turn in reversed(turns))
+
+    def _queue_turn(self, pipe, session_id: str, turn: Turn) -> None:
+        key = self._turns_key(session_id)
+        pipe.lpush(key, encode_turn(turn))
+        pipe.ltrim(key, 0, MAX_TURNS - 1)
+        pipe.expire(key, self._ttl)
+
+    def _queue_intent(self, pipe, session_id: str, record: IntentRecord) -> None:
         key = self._intent_key(session_id)
-        assert self._client is not None
-        entries = self._client.lrange(key, 0, -1)
-        parsed: List[Dict[str, object]] = []
-        for entry in entries:
-            try:
-                parsed.append(json.loads(entry))
-            except Exception:
-                continue
-        return parsed
+        pipe.lpush(key, encode_intent(record))
+        pipe.ltrim(key, 0, MAX_INTENTS - 1)
+        pipe.expire(key, self._ttl)
+
+    @staticmethod
+    @asynccontextmanager
+    async def _timed(operation: str) -> AsyncIterator[None]:
+        start = time.perf_counter()
+        try:
+            with span(f"redis.{operation}"):
+                yield
+        finally:
+            redis_latency.labels(operation=operation).observe(time.perf_counter() - start)
 
     def _turns_key(self, session_id: str) -> str:
         return f"session:{session_id}:turns"
@@ -102,6 +290,9 @@ class ContextMemory:
     def _intent_key(self, session_id: str) -> str:
         return f"session:{session_id}:intents"
 
+    def _wallet_key(self, session_id: str) -> str:
+        return f"session:{session_id}:wallet"
 
-
+    def _version_key(self, session_id: str) -> str:
+        return f"session:{session_id}:v"
 
@@ -1,22 +1,255 @@
 """
 Prometheus metrics instrumentation for the Chamas voice pipeline.
+
+Under gunicorn (``gunicorn.conf.py``) ``PROMETHEUS_MULTIPROC_DIR`` is set before
+this module is imported, so every worker writes its samples to shared files
+and ``render`` aggregates them. Each gauge's ``multiprocess_mode`` says how the
+per-worker values combine; it is ignored in a single process.
 """
 
 from __future__ import annotations
 
-from prometheus_client import Counter, Gauge, Histogram
+import os
+
+from prometheus_client import CollectorRegistry, Counter, Gauge, Histogram, generate_latest, multiprocess
+
+# Latency buckets are dense around the voice SLOs: a whole turn answered
+# within 3 s at p95, with ASR and LLM each within 1.5 s and TTS within 0.75 s.
+STAGE_BUCKETS = (0.05, 0.1, 0.2, 0.3, 0.5, 0.75, 1.0, 1.25, 1.5, 2.0, 3.0, 5.0, 8.0, 15.0, 30.0)
+REQUEST_BUCKETS = (0.25, 0.5, 1.0, 1.5, 2.0, 2.5, 3.0, 3.5, 4.0, 5.0, 7.5, 10.0, 15.0, 30.0, 60.0)
+QUEUE_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
 
 # Request metrics
 voice_requests = Counter("voice_requests_total", "Total voice requests", ["status"])
-asr_latency = Histogram("asr_latency_seconds", "ASR processing time")
-llm_latency = Histogram("llm_latency_seconds", "LLM generation time")
-tts_latency = Histogram("tts_latency_seconds", "TTS synthesis time")
+voice_latency = Histogram(
+    "voice_request_latency_seconds",
+    "Time from upload read to audio response for successful /voice/process turns",
+    buckets=REQUEST_BUCKETS,
+)
+voice_intents = Counter("voice_intents_total", "Recognised intents by transcript dialect", ["intent", "dialect"])
+
+# Model metrics. engine/model come from the service that ran, e.g. whisper/base or openai/<model>.
+asr_latency = Histogram(
+    "asr_latency_seconds", "ASR model compute time, without queueing", ["engine", "model", "dialect"], buckets=STAGE_BUCKETS
+)
+asr_audio_duration = Histogram(
+    "asr_audio_duration_seconds",
+    "Length of the audio sent to ASR",
+    ["dialect"],
+    buckets=(1.0, 2.0, 3.0, 5.0, 8.0, 10.0, 15.0, 20.0, 30.0, 45.0, 60.0, 120.0),
+)
+asr_real_time_factor = Histogram(
+    "asr_real_time_factor",
+    "ASR compute seconds per second of audio (below 1 is faster than real time)",
+    ["engine", "model"],
+    buckets=(0.02, 0.05, 0.1, 0.15, 0.2, 0.3, 0.5, 0.75, 1.0, 1.5, 2.0, 3.0, 5.0),
+)
+asr_confidence = Histogram(
+    "asr_confidence",
+    "Transcript confidence from Whisper segment log-probabilities (a proxy, not WER)",
+    ["dialect"],
+    buckets=(0.1, 0.2, 0.3, 0.4, 0.5, 0.6, 0.7, 0.8, 0.9, 0.95, 1.0),
+)
+llm_latency = Histogram(
+    "llm_latency_seconds", "LLM generation time", ["engine", "model", "intent"], buckets=STAGE_BUCKETS
+)
+llm_prompt_tokens = Histogram(
+    "llm_prompt_tokens",
+    "Prompt tokens per LLM call",
+    ["engine", "model"],
+    buckets=(32, 64, 128, 192, 256, 384, 512, 768, 1024, 2048, 4096),
+)
+llm_output_tokens = Histogram(
+    "llm_output_tokens",
+    "Generated tokens per LLM call",
+    ["engine", "model"],
+    buckets=(4, 8, 16, 32, 64, 96, 128, 180, 256, 512),
+)
+llm_tokens_per_second = Histogram(
+    "llm_output_tokens_per_second",
+    "Generated tokens per second of LLM call time",
+    ["engine", "model"],
+    buckets=(1, 2, 5, 10, 15, 20, 30, 50, 75, 100, 150, 250),
+)
+tts_latency = Histogram("tts_latency_seconds", "TTS synthesis time", ["engine", "model"], buckets=STAGE_BUCKETS)
+tts_characters = Histogram(
+    "tts_input_characters",
+    "Characters of text per TTS call",
+    ["engine", "model"],
+    buckets=(20, 50, 100, 150, 200, 300, 500, 800, 1200),
+)
+tts_characters_per_second = Histogram(
+    "tts_characters_per_second",
+    "Characters synthesised per second of TTS call time",
+    ["engine", "model"],
+    buckets=(10, 25, 50, 100, 150, 200, 300, 500, 800, 1600),
+)
+inference_queue_wait = Histogram(
+    "inference_queue_wait_seconds",
+    "Time an ASR/LLM/TTS job spent waiting and in transit rather than computing",
+    ["stage"],
+    buckets=QUEUE_BUCKETS,
+)
+scheduler_wait = Histogram(
+    "inference_scheduler_wait_seconds",
+    "Time a job waited for its turn in the ASR/LLM/TTS scheduler, by priority class",
+    ["stage", "priority"],
+    buckets=QUEUE_BUCKETS,
+)
+scheduler_pending = Gauge(
+    "inference_scheduler_pending",
+    "Jobs waiting in the ASR/LLM/TTS scheduler",
+    ["stage", "priority"],
+    multiprocess_mode="livesum",
+)
+degraded_responses = Counter(
+    "degraded_responses_total",
+    "Voice turns answered with a stage shed (text-only, template-answer, small-asr)",
+    ["mode"],
+)
+degradation_active = Gauge(
+    "degradation_active",
+    "1 while a stage is being shed under load, per degraded mode",
+    ["mode"],
+    multiprocess_mode="livemax",
+)
+
+# Session memory metrics
+redis_latency = Histogram(
+    "redis_latency_seconds",
+    "Redis round-trip time per ContextMemory operation",
+    ["operation"],
+)
+
+session_active = Gauge("sessions_active", "Active sessions", multiprocess_mode="livesum")
+
+# Blockchain read metrics
+rpc_requests = Counter("chama_rpc_requests_total", "HTTP requests sent to the RPC node", ["method"])
+rpc_calls_per_request = Histogram(
+    "chama_rpc_calls_per_request",
+    "RPC HTTP requests spent per ChamaClient read",
+    ["operation"],
+    buckets=(1, 2, 3, 5, 10, 25, 50, 100),
+)
+chama_cache_requests = Counter(
+    "chama_cache_requests_total",
+    "ChamaClient read cache lookups by result; coalesced counts misses served by an in-flight read",
+    ["result"],
+)
+chama_rpc_saved = Counter("chama_rpc_saved_total", "eth_call reads avoided by the cache or coalescing")
+rpc_endpoint_latency = Histogram(
+    "chama_rpc_endpoint_latency_seconds",
+    "Latency of successful requests per RPC endpoint",
+    ["endpoint"],
+)
+rpc_endpoint_errors = Counter("chama_rpc_endpoint_errors_total", "Transport failures per RPC endpoint", ["endpoint"])
+rpc_endpoint_score = Gauge(
+    "chama_rpc_endpoint_score",
+    "Routing score per RPC endpoint (latency EWMA weighted by error EWMA; lower is preferred)",
+    ["endpoint"],
+    multiprocess_mode="liveall",
+)
+rpc_hedged_requests = Counter(
+    "chama_rpc_hedged_requests_total",
+    "Reads re-sent to a second endpoint after the hedge delay, by which reply won",
+    ["winner"],
+)
+chama_feed_subscribers = Gauge(
+    "chama_feed_subscribers", "Clients connected to /chamas/stream", multiprocess_mode="livesum"
+)
+chama_feed_messages = Counter("chama_feed_messages_total", "Chama update messages fanned out by the push feed")
+chama_feed_resyncs = Counter(
+    "chama_feed_resyncs_total",
+    "Slow /chamas/stream consumers whose backlog was dropped for a resync message",
+)
+indexer_block = Gauge(
+    "chama_indexer_block", "Last block applied by the chama event indexer", multiprocess_mode="livemax"
+)
+indexer_events = Counter("chama_indexer_events_total", "ChamaFactory events indexed", ["event"])
+component_healthy = Gauge(
+    "component_healthy",
+    "Last background health probe result per component (1 = ok; the minimum across workers)",
+    ["component"],
+    multiprocess_mode="livemin",
+)
+component_probe_latency = Gauge(
+    "component_probe_latency_seconds",
+    "Duration of the last background health probe per component",
+    ["component"],
+    multiprocess_mode="livemax",
+)
+component_startup_seconds = Gauge(
+    "component_startup_seconds",
+    "Time a component spent importing its backend, loading its model and running its warm-up inference",
+    ["component", "phase"],
+    multiprocess_mode="livemax",
+)
+
+inference_queue_depth = Gauge(
+    "inference_queue_depth",
+    "Jobs sent to an inference worker process and not yet answered",
+    ["kind", "worker"],
+    multiprocess_mode="livesum",
+)
+inference_workers_ready = Gauge(
+    "inference_workers_ready",
+    "Inference worker processes with a loaded model",
+    ["kind"],
+    multiprocess_mode="livesum",
+)
+inference_worker_restarts = Counter(
+    "inference_worker_restarts_total", "Inference worker processes restarted after exiting", ["kind"]
+)
+
+batch_jobs = Counter("batch_jobs_total", "Bulk transcription jobs finished, by outcome", ["status"])
+batch_clips = Counter("batch_clips_total", "Clips processed by bulk transcription jobs", ["status"])
+
+rate_limit_decisions = Counter(
+    "rate_limit_decisions_total",
+    "Rate limiter decisions by policy, result and where they were made (lease, redis, local, fallback)",
+    ["policy", "result", "path"],
+)
+rate_limit_latency = Histogram(
+    "rate_limit_latency_seconds",
+    "Time spent deciding whether to admit a request",
+    ["path"],
+    buckets=(0.00005, 0.0001, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1),
+)
+
+
+def render() -> bytes:
+    """Exposition text for this process, or for every worker in multiprocess mode."""
+    if not os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        return generate_latest()
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry)
+    return generate_latest(registry)
+
 
-# Model health metrics
-asr_wer = Gauge("asr_wer", "Current WER of ASR model")
-intent_accuracy = Gauge("intent_accuracy", "Intent classification accuracy")
-session_active = Gauge("sessions_active", "Active sessions")
+def observe_transcription(
+    seconds: float, audio_seconds: float, confidence: float, dialect: str, engine: str, model: str
+) -> None:
+    asr_latency.labels(engine=engine, model=model, dialect=dialect).observe(seconds)
+    asr_confidence.labels(dialect=dialect).observe(confidence)
+    if audio_seconds > 0:
+        asr_audio_duration.labels(dialect=dialect).observe(audio_seconds)
+        asr_real_time_factor.labels(engine=engine, model=model).observe(seconds / audio_seconds)
 
 
+def observe_generation(
+    seconds: float, prompt_tokens: int, output_tokens: int, intent: str, engine: str, model: str
+) -> None:
+    llm_latency.labels(engine=engine, model=model, intent=intent).observe(seconds)
+    # The canned fallback reply has no token counts.
+    if output_tokens:
+        llm_prompt_tokens.labels(engine=engine, model=model).observe(prompt_tokens)
+        llm_output_tokens.labels(engine=engine, model=model).observe(output_tokens)
+        if seconds > 0:
+            llm_tokens_per_second.labels(engine=engine, model=model).observe(output_tokens / seconds)
 
 
+def observe_synthesis(seconds: float, characters: int, engine: str, model: str) -> None:
+    tts_latency.labels(engine=engine, model=model).observe(seconds)
+    tts_characters.labels(engine=engine, model=model).observe(characters)
+    if seconds > 0:
+        tts_characters_per_second.labels(engine=engine, model=model).observe(characters / seconds)
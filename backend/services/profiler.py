@@ -0,0 +1,208 @@
+"""
+Statistical sampling profiler for finding where request time goes in production.
+
+A background thread wakes ``hz`` times a second, reads every other thread's
+current Python stack with ``sys._current_frames()`` and counts each distinct
+stack. Nothing is hooked into the profiled code, so the cost is the sampling
+thread alone (well under 1% of a core at 100 Hz) and it can be left running
+against live traffic. The result is in the collapsed-stack format read by
+``flamegraph.pl``, speedscope and Grafana/Pyroscope: one line per stack,
+``thread;outer (file:line);...;inner (file:line) count``.
+
+``/admin/profile`` runs one on-demand capture. With ``PROFILE_CONTINUOUS_DIR``
+set, ``ContinuousProfiler`` also samples at a low rate
+(``PROFILE_CONTINUOUS_HZ``) all the time and writes one collapsed file per
+``PROFILE_CONTINUOUS_SECONDS`` window to that directory, keeping the newest
+``PROFILE_CONTINUOUS_KEEP`` per process, so a past p99 spike can be looked at
+after the fact.
+
+Only this process is sampled. In ``INFERENCE_MODE=workers`` model compute
+runs in the worker processes and shows up here as the wait for their reply.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+from types import CodeType, FrameType
+from typing import Dict, Optional, Tuple
+
+logger = logging.getLogger("chamas.profiler")
+
+# Leaf frames of a thread blocked waiting for work rather than running code.
+IDLE_FRAMES = frozenset(
+    {
+        ("selectors.py", "select"),
+        ("threading.py", "wait"),
+        ("threading.py", "_wait_for_tstate_lock"),
+        ("queue.py", "get"),
+        ("thread.py", "_worker"),
+        ("socket.py", "accept"),
+        ("connection.py", "_poll"),
+    }
+)
+
+# Stacks deeper than this are cut from the root end so the hot leaves survive.
+MAX_DEPTH = 128
+
+
+def _short_path(filename: str) -> str:
+    """``site-packages/pydantic/main.py`` rather than the full install path."""
+    for marker in ("site-packages/", "dist-packages/"):
+        index = filename.rfind(marker)
+        if index != -1:
+            return filename[index + len(marker) :]
+    for root in sorted((entry for entry in sys.path if entry), key=len, reverse=True):
+        if filename.startswith(root + os.sep):
+            return filename[len(root) + 1 :]
+    return filename
+
+
+class StackSampler:
+    """Counts the stacks seen across all threads, one ``sample()`` at a time."""
+
+    def __init__(self, include_idle: bool = False) -> None:
+        self.include_idle = include_idle
+        self.samples = 0
+        self._stacks: Counter = Counter()
+        self._labels: Dict[CodeType, str] = {}
+
+    def sample(self) -> None:
+        own = threading.get_ident()
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+        for ident, frame in sys._current_frames().items():
+            if ident == own:
+                continue
+            stack = self._stack(frame)
+            if stack is None:
+                continue
+            self._stacks[(names.get(ident, f"thread-{ident}"),) + stack] += 1
+        self.samples += 1
+
+    def _stack(self, frame: Optional[FrameType]) -> Optional[Tuple[str, ...]]:
+        if frame is None:
+            return None
+        if not self.include_idle:
+            code = frame.f_code
+            if (os.path.basename(code.co_filename), code.co_name) in IDLE_FRAMES:
+                return None
+        labels = []
+        while frame is not None and len(labels) < MAX_DEPTH:
+            code = frame.f_code
+            label = self._labels.get(code)
+            if label is None:
+                label = self._labels[code] = f"{code.co_name} ({_short_path(code.co_filename)}:{code.co_firstlineno})"
+            labels.append(label)
+            frame = frame.f_back
+        labels.reverse()
+        return tuple(labels)
+
+    def collapsed(self) -> str:
+        """Collapsed stacks, hottest first."""
+        lines = [f"{';'.join(stack)} {count}" for stack, count in self._stacks.most_common()]
+        return "\n".join(lines) + ("\n" if lines else "")
+
+    def reset(self) -> None:
+        self._stacks.clear()
+        self.samples = 0
+
+
+_capture_lock = threading.Lock()
+
+
+class ProfilerBusy(Exception):
+    pass
+
+
+def capture(seconds: float, hz: float = 100.0, include_idle: bool = False) -> Tuple[str, int]:
+    """Sample this process for ``seconds``; blocks, so run it in a thread.
+
+    Returns the collapsed stacks and the number of sampling passes. Only one
+    capture runs at a time; a second raises ``ProfilerBusy``.
+    """
+    if not _capture_lock.acquire(blocking=False):
+        raise ProfilerBusy("A profile is already being captured")
+    try:
+        sampler = StackSampler(include_idle=include_idle)
+        interval = 1.0 / hz
+        deadline = time.perf_counter() + seconds
+        next_tick = time.perf_counter()
+        while next_tick < deadline:
+            sampler.sample()
+            # Fixed-rate ticks: a slow pass shortens the next sleep instead of drifting.
+            next_tick += interval
+            delay = next_tick - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            else:
+                next_tick = time.perf_counter()
+        return sampler.collapsed(), sampler.samples
+    finally:
+        _capture_lock.release()
+
+
+class ContinuousProfiler:
+    """Low-rate sampling in a daemon thread, flushed to ``directory`` once per window."""
+
+    def __init__(
+        self,
+        directory: str,
+        hz: Optional[float] = None,
+        window_seconds: Optional[float] = None,
+        keep: Optional[int] = None,
+    ) -> None:
+        self.directory = Path(directory)
+        self.hz = hz or float(os.getenv("PROFILE_CONTINUOUS_HZ", "10"))
+        self.window_seconds = window_seconds or float(os.getenv("PROFILE_CONTINUOUS_SECONDS", "60"))
+        self.keep = keep or int(os.getenv("PROFILE_CONTINUOUS_KEEP", "60"))
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @classmethod
+    def from_env(cls) -> Optional["ContinuousProfiler"]:
+        directory = os.getenv("PROFILE_CONTINUOUS_DIR")
+        return cls(directory) if directory else None
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._thread = threading.Thread(target=self._run, name="continuous-profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join(timeout=5)
+        self._thread = None
+
+    def _run(self) -> None:
+        sampler = StackSampler()
+        interval = 1.0 / self.hz
+        window_start = time.time()
+        while not self._stop.wait(interval):
+            sampler.sample()
+            if time.time() - window_start >= self.window_seconds:
+                self._flush(sampler, window_start)
+                sampler.reset()
+                window_start = time.time()
+        if sampler.samples:
+            self._flush(sampler, window_start)
+
+    def _flush(self, sampler: StackSampler, window_start: float) -> None:
+        stamp = time.strftime("%Y%m%dT%H%M%S", time.gmtime(window_start))
+        path = self.directory / f"profile-{os.getpid()}-{stamp}.folded"
+        try:
+            path.write_text(sampler.collapsed(), encoding="utf-8")
+            # Files are per process, so workers only ever prune their own.
+            snapshots = sorted(self.directory.glob(f"profile-{os.getpid()}-*.folded"))
+            for old in snapshots[: max(0, len(snapshots) - self.keep)]:
+                old.unlink(missing_ok=True)
+        except OSError as exc:
+            logger.warning("Could not write profile snapshot %s: %s", path, exc)
@@ -0,0 +1,221 @@
+"""
+Token-bucket rate limiting shared by every worker and node through Redis.
+
+Each policy (``RATE_LIMIT_VOICE``, ``RATE_LIMIT_DEFAULT``, written like
+``"10/minute"``) is a bucket per client IP that holds that many tokens and
+refills at that rate. A request spends its cost: 1 for plain routes, and for
+``/voice/process`` 1 plus one token per ``RATE_LIMIT_AUDIO_SECONDS_PER_TOKEN``
+seconds of audio, so long clips use up the budget faster. The refill and
+spend run in one Lua script against Redis ``TIME``, so concurrent workers
+never race or disagree about the clock.
+
+To spare clearly under-limit clients a round trip, the script may lease a few
+extra tokens (``RATE_LIMIT_LEASE_FRACTION`` of the bucket) to the calling
+worker, which spends them locally for ``RATE_LIMIT_LEASE_SECONDS``. Leases
+only come out of the upper half of a bucket and are taken out of Redis up
+front, so a client can never exceed the global limit; an unused lease just
+lapses. Without ``REDIS_URL``, or while Redis is failing, buckets are kept in
+process as before.
+"""
+
+from __future__ import annotations
+
+import logging
+import math
+import os
+import struct
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .metrics import rate_limit_decisions, rate_limit_latency
+from .redis_pool import aioredis, shared_pool
+
+logger = logging.getLogger("chamas.ratelimit")
+
+PERIODS = {"second": 1.0, "minute": 60.0, "hour": 3600.0, "day": 86400.0}
+MAX_LOCAL_KEYS = 10_000
+
+# KEYS[1] bucket; ARGV capacity, refill per second, cost, max lease.
+# Returns {allowed, retry_after, leased}; floats as strings because Lua
+# numbers are truncated to integers on the way out.
+TOKEN_BUCKET = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local cost = tonumber(ARGV[3])
+local max_lease = tonumber(ARGV[4])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or capacity
+local ts = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+local allowed, retry, lease = 0, 0, 0
+if tokens >= cost then
+  allowed = 1
+  tokens = tokens - cost
+  local spare = tokens - capacity / 2
+  if spare >= 1 and max_lease >= 1 then
+    lease = math.min(max_lease, math.floor(spare))
+    tokens = tokens - lease
+  end
+else
+  retry = (cost - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(now))
+redis.call('PEXPIRE', KEYS[1], math.ceil(capacity / rate * 1000) + 1000)
+return {allowed, tostring(retry), lease}
+"""
+
+
+@dataclass(frozen=True)
+class Policy:
+    name: str
+    capacity: float
+    refill_per_second: float
+
+    @classmethod
+    def parse(cls, name: str, spec: str) -> "Policy":
+        count, _, period = spec.strip().partition("/")
+        if period not in PERIODS or float(count) <= 0:
+            raise ValueError(f"Rate limit for {name!r} must look like '10/minute', got {spec!r}")
+        capacity = float(count)
+        return cls(name=name, capacity=capacity, refill_per_second=capacity / PERIODS[period])
+
+    @classmethod
+    def from_env(cls, name: str, default: str = "10/minute") -> "Policy":
+        return cls.parse(name, os.getenv(f"RATE_LIMIT_{name.upper()}", default))
+
+
+class RateLimited(Exception):
+    def __init__(self, policy: Policy, retry_after: float) -> None:
+        super().__init__(f"{policy.name} rate limit exceeded")
+        self.policy = policy
+        self.retry_after = retry_after
+
+
+class _Bucket:
+    __slots__ = ("tokens", "updated")
+
+    def __init__(self, tokens: float, updated: float) -> None:
+        self.tokens = tokens
+        self.updated = updated
+
+
+class RateLimiter:
+    def __init__(
+        self,
+        redis_url: Optional[str] = None,
+        lease_fraction: Optional[float] = None,
+        lease_seconds: Optional[float] = None,
+        client: Optional[Any] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._clock = clock
+        self._lease_fraction = (
+            lease_fraction if lease_fraction is not None else float(os.getenv("RATE_LIMIT_LEASE_FRACTION", "0.2"))
+        )
+        self._lease_seconds = lease_seconds or float(os.getenv("RATE_LIMIT_LEASE_SECONDS", "2"))
+        self._policies: Dict[str, Policy] = {}
+        self._leases: "OrderedDict[str, List[float]]" = OrderedDict()
+        self._buckets: "OrderedDict[str, _Bucket]" = OrderedDict()
+        self._script = None
+
+        redis_url = redis_url or os.getenv("REDIS_URL")
+        if client is None and redis_url and aioredis is not None:
+            client = aioredis.Redis(connection_pool=shared_pool(redis_url))
+        if client is not None:
+            self._script = client.register_script(TOKEN_BUCKET)
+
+    def policy(self, name: str) -> Policy:
+        policy = self._policies.get(name)
+        if policy is None:
+            policy = self._policies[name] = Policy.from_env(name)
+        return policy
+
+    async def acquire(self, policy: Policy, client: str, cost: float = 1.0) -> None:
+        """Spend ``cost`` tokens from ``client``'s bucket or raise ``RateLimited``."""
+        key = f"ratelimit:{policy.name}:{client}"
+        # A request dearer than the whole bucket could never pass; let it drain the bucket instead.
+        cost = min(cost, policy.capacity)
+        start = time.perf_counter()
+        now = self._clock()
+
+        lease = self._leases.pop(key, None)
+        if lease is not None and lease[1] > now:
+            if lease[0] >= cost:
+                lease[0] -= cost
+                self._leases[key] = lease
+                self._record(policy, "allowed", "lease", start)
+                return
+            # Spend what is left of the lease and fetch only the difference.
+            cost -= lease[0]
+
+        path = "local"
+        leased = 0.0
+        if self._script is not None:
+            try:
+                allowed, retry_after, leased = await self._take_remote(policy, key, cost)
+                path = "redis"
+            except Exception as exc:
+                logger.warning("Rate limiter falling back to local buckets: %s", exc)
+                path = "fallback"
+        if path != "redis":
+            allowed, retry_after = self._take_local(policy, key, cost)
+
+        if leased:
+            self._leases[key] = [leased, now + self._lease_seconds]
+            while len(self._leases) > MAX_LOCAL_KEYS:
+                self._leases.popitem(last=False)
+        self._record(policy, "allowed" if allowed else "limited", path, start)
+        if not allowed:
+            raise RateLimited(policy, retry_after)
+
+    async def _take_remote(self, policy: Policy, key: str, cost: float) -> Tuple[bool, float, float]:
+        max_lease = math.floor(policy.capacity * self._lease_fraction)
+        allowed, retry_after, leased = await self._script(  # type: ignore[misc]
+            keys=[key], args=[policy.capacity, policy.refill_per_second, cost, max_lease]
+        )
+        return bool(int(allowed)), float(retry_after), float(leased)
+
+    def _take_local(self, policy: Policy, key: str, cost: float) -> Tuple[bool, float]:
+        now = self._clock()
+        bucket = self._buckets.pop(key, None)
+        if bucket is None:
+            bucket = _Bucket(policy.capacity, now)
+        else:
+            bucket.tokens = min(policy.capacity, bucket.tokens + (now - bucket.updated) * policy.refill_per_second)
+            bucket.updated = now
+        self._buckets[key] = bucket
+        while len(self._buckets) > MAX_LOCAL_KEYS:
+            self._buckets.popitem(last=False)
+        if bucket.tokens >= cost:
+            bucket.tokens -= cost
+            return True, 0.0
+        return False, (cost - bucket.tokens) / policy.refill_per_second
+
+    @staticmethod
+    def _record(policy: Policy, result: str, path: str, start: float) -> None:
+        rate_limit_decisions.labels(policy=policy.name, result=result, path=path).inc()
+        rate_limit_latency.labels(path=path).observe(time.perf_counter() - start)
+
+
+def audio_seconds(payload: bytes) -> float:
+    """Duration of a WAV clip from its header, or an estimate from size for compressed audio."""
+    if payload[:4] == b"RIFF" and payload[8:12] == b"WAVE":
+        byte_rate = 0
+        offset = 12
+        while offset + 8 <= len(payload):
+            chunk, size = payload[offset : offset + 4], struct.unpack_from("<I", payload, offset + 4)[0]
+            if chunk == b"fmt " and size >= 16:
+                byte_rate = struct.unpack_from("<I", payload, offset + 16)[0]
+            elif chunk == b"data" and byte_rate:
+                return min(size, len(payload) - offset - 8) / byte_rate
+            offset += 8 + size + (size & 1)
+    return len(payload) / float(os.getenv("RATE_LIMIT_AUDIO_BYTES_PER_SECOND", "16000"))
+
+
+def audio_cost(payload: bytes) -> float:
+    """Tokens a voice request spends: one, plus one per ``RATE_LIMIT_AUDIO_SECONDS_PER_TOKEN`` of audio."""
+    return 1.0 + audio_seconds(payload) / float(os.getenv("RATE_LIMIT_AUDIO_SECONDS_PER_TOKEN", "15"))
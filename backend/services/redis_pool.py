@@ -0,0 +1,26 @@
+"""
+Process-wide ``redis.asyncio`` connection pools, one per Redis URL.
+
+Session memory and the rate limiter talk to the same Redis; sharing the pool
+keeps a worker's connection count flat however many clients are built.
+"""
+
+from __future__ import annotations
+
+from typing import Dict
+
+try:
+    from redis import asyncio as aioredis  # type: ignore
+except Exception:  # pragma: no cover - optional dependency
+    aioredis = None
+
+_POOLS: Dict[str, object] = {}
+
+
+def shared_pool(redis_url: str):
+    pool = _POOLS.get(redis_url)
+    if pool is None:
+        assert aioredis is not None
+        pool = aioredis.ConnectionPool.from_url(redis_url, decode_responses=False)
+        _POOLS[redis_url] = pool
+    return pool
@@ -0,0 +1,43 @@
+"""
+Process-wide registry of lazily constructed service singletons.
+
+Model-backed services (Whisper, the LLM, TTS) are expensive to build, so each
+is constructed once per process on first ``get`` and shared by every request.
+``peek`` returns an instance only if it already exists, which lets health
+probes report on a service without ever triggering a model load.
+"""
+
+from __future__ import annotations
+
+import threading
+from typing import Any, Callable, Dict, List, Optional
+
+
+class ServiceRegistry:
+    def __init__(self) -> None:
+        self._factories: Dict[str, Callable[[], Any]] = {}
+        self._instances: Dict[str, Any] = {}
+        self._locks: Dict[str, threading.Lock] = {}
+
+    def register(self, name: str, factory: Callable[[], Any]) -> None:
+        self._factories[name] = factory
+        self._locks[name] = threading.Lock()
+
+    def get(self, name: str) -> Any:
+        instance = self._instances.get(name)
+        if instance is not None:
+            return instance
+        # Construction may run in a worker thread (warm-up) while a request
+        # asks for the same service; only one of them builds it.
+        with self._locks[name]:
+            instance = self._instances.get(name)
+            if instance is None:
+                instance = self._factories[name]()
+                self._instances[name] = instance
+        return instance
+
+    def peek(self, name: str) -> Optional[Any]:
+        return self._instances.get(name)
+
+    def names(self) -> List[str]:
+        return list(self._factories)
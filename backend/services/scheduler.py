@@ -0,0 +1,167 @@
+"""
+Cost-aware scheduling for the ASR, LLM and TTS queues.
+
+Each service has a ``JobScheduler`` that admits at most ``slots`` jobs at a
+time and holds the rest in a heap instead of a FIFO, so a two-minute
+recording no longer makes twenty three-second questions wait behind it.
+A job's place in line is
+
+    class offset + estimated seconds + SCHEDULER_AGING * enqueue time
+
+and the lowest key runs next. The estimate is the job's size (seconds of
+audio for ASR, prompt characters for the LLM, text characters for TTS) times
+the seconds-per-unit ``CostModel`` has learned from finished jobs, so short
+interactive jobs go first. Every job in the heap ages at the same rate, which
+is why the aging term can be folded into a fixed key. A job that has waited
+``d`` seconds longer than another overtakes one that is up to
+``SCHEDULER_AGING * d`` seconds cheaper, so no job waits forever.
+``bulk`` jobs (``services.batch_jobs``) are also pushed back by
+``SCHEDULER_BULK_OFFSET_SECONDS``. ``SCHEDULER_POLICY=fifo`` restores arrival
+order for comparison. ``inference_scheduler_wait_seconds{stage,priority}``
+shows the wait that results.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+import os
+import time
+from typing import Awaitable, Callable, List, Optional, TypeVar
+
+from .metrics import scheduler_pending, scheduler_wait
+
+T = TypeVar("T")
+
+PRIORITIES = ("interactive", "bulk")
+
+# Seconds of work per unit before any job has finished: per second of audio,
+# per prompt character and per character of speech.
+DEFAULT_SECONDS_PER_UNIT = {"asr": 0.15, "llm": 0.003, "tts": 0.02}
+
+
+class QueueFull(RuntimeError):
+    pass
+
+
+class CostModel:
+    """Seconds per unit of work, as an EWMA over finished jobs."""
+
+    def __init__(self, seconds_per_unit: float, alpha: float = 0.2) -> None:
+        self.seconds_per_unit = seconds_per_unit
+        self._alpha = alpha
+
+    def estimate(self, units: float) -> float:
+        return self.seconds_per_unit * units
+
+    def observe(self, units: float, seconds: float) -> None:
+        if units > 0 and seconds > 0:
+            self.seconds_per_unit += self._alpha * (seconds / units - self.seconds_per_unit)
+
+
+class _Entry:
+    __slots__ = ("key", "order", "future", "priority", "enqueued")
+
+    def __init__(self, key: float, order: int, future: asyncio.Future, priority: str, enqueued: float) -> None:
+        self.key = key
+        self.order = order
+        self.future = future
+        self.priority = priority
+        self.enqueued = enqueued
+
+    def __lt__(self, other: "_Entry") -> bool:
+        return (self.key, self.order) < (other.key, other.order)
+
+
+class JobScheduler:
+    def __init__(
+        self,
+        stage: str,
+        slots: int,
+        max_pending: Optional[int] = None,
+        cost_model: Optional[CostModel] = None,
+        policy: Optional[str] = None,
+        aging: Optional[float] = None,
+        bulk_offset: Optional[float] = None,
+        clock: Callable[[], float] = time.perf_counter,
+    ) -> None:
+        self._clock = clock
+        self.stage = stage
+        self.slots = max(1, slots)
+        self._max_pending = max_pending
+        kind = stage.split("_", 1)[0]
+        self.cost_model = cost_model or CostModel(DEFAULT_SECONDS_PER_UNIT.get(kind, 0.1))
+        self._policy = (policy or os.getenv("SCHEDULER_POLICY", "sjf")).lower()
+        if self._policy not in ("sjf", "fifo"):
+            raise ValueError(f"SCHEDULER_POLICY must be 'sjf' or 'fifo', got {self._policy!r}")
+        self._aging = aging if aging is not None else float(os.getenv("SCHEDULER_AGING", "1.0"))
+        self._offsets = {
+            "interactive": 0.0,
+            "bulk": (
+                bulk_offset if bulk_offset is not None else float(os.getenv("SCHEDULER_BULK_OFFSET_SECONDS", "30"))
+            ),
+        }
+        self._running = 0
+        self._heap: List[_Entry] = []
+        self._order = itertools.count()
+
+    @property
+    def pending(self) -> int:
+        return len(self._heap)
+
+    async def run(self, units: float, job: Callable[[], Awaitable[T]], priority: str = "interactive") -> T:
+        """Run ``job`` once its turn comes; ``units`` sizes it for the cost model."""
+        if priority not in PRIORITIES:
+            raise ValueError(f"Unknown priority {priority!r}")
+        enqueued = self._clock()
+        if self._running >= self.slots or self._heap:
+            await self._wait_turn(units, priority, enqueued)
+        else:
+            self._running += 1
+        scheduler_wait.labels(stage=self.stage, priority=priority).observe(self._clock() - enqueued)
+
+        start = self._clock()
+        try:
+            result = await job()
+        finally:
+            self._release()
+        self.cost_model.observe(units, self._clock() - start)
+        return result
+
+    async def _wait_turn(self, units: float, priority: str, enqueued: float) -> None:
+        if self._max_pending is not None and len(self._heap) >= self._max_pending:
+            raise QueueFull(f"{self.stage} queue is full")
+        if self._policy == "fifo":
+            key = enqueued
+        else:
+            key = self._offsets[priority] + self.cost_model.estimate(units) + self._aging * enqueued
+        future = asyncio.get_running_loop().create_future()
+        entry = _Entry(key, next(self._order), future, priority, enqueued)
+        heapq.heappush(self._heap, entry)
+        scheduler_pending.labels(stage=self.stage, priority=priority).inc()
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # Granted a slot just as the waiter was cancelled: pass it on.
+                self._release()
+            elif entry in self._heap:
+                # _release may already have popped and skipped this entry.
+                self._heap.remove(entry)
+                heapq.heapify(self._heap)
+                scheduler_pending.labels(stage=self.stage, priority=priority).dec()
+            raise
+
+    def _release(self) -> None:
+        while self._heap:
+            entry = heapq.heappop(self._heap)
+            scheduler_pending.labels(stage=self.stage, priority=entry.priority).dec()
+            if entry.future.done():
+                # Cancelled in the same loop turn; its task has not run its cleanup yet.
+                continue
+            # The slot passes straight to the next job; _running is unchanged.
+            entry.future.set_result(None)
+            return
+        self._running -= 1
+
@@ -1,46 +1,170 @@
 """
 Encryption helpers for sensitive session identifiers.
+
+Session tokens are Fernet tokens over the session id. Keys come from
+``ENCRYPTION_KEYS`` (comma-separated, newest first) and/or the legacy
+``ENCRYPTION_KEY``. Tokens minted under an older key keep verifying, which
+allows rotating keys without dropping live sessions, and are re-issued under
+the primary key on the next response.
+
+Verified tokens and issued tokens are kept in bounded LRUs, so a session pays
+for one decrypt and one encrypt over its lifetime rather than on every request.
 """
 
 from __future__ import annotations
 
 import os
-from typing import Optional
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import List, Optional, Sequence, Tuple
 
 from cryptography.fernet import Fernet, InvalidToken
 
-_cipher: Optional[Fernet] = None
-_raw_key = os.getenv("ENCRYPTION_KEY")
 
-if _raw_key:
+class SessionTokens:
+    def __init__(
+        self,
+        keys: Sequence[str],
+        cache_size: int = 4096,
+        token_ttl: Optional[int] = None,
+    ) -> None:
+        self._fernets: List[Fernet] = [Fernet(key) for key in keys]
+        self._cache_size = cache_size
+        self._token_ttl = token_ttl
+        # token -> (session_id, minted_at) for tokens signed by the primary key
+        self._verified: "OrderedDict[str, Tuple[str, int]]" = OrderedDict()
+        # session_id -> (token, minted_at)
+        self._issued: "OrderedDict[str, Tuple[str, int]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def is_ready(self) -> bool:
+        return bool(self._fernets)
+
+    def issue(self, session_id: str) -> str:
+        if not session_id or not self._fernets:
+            return session_id
+
+        with self._lock:
+            cached = self._issued.get(session_id)
+            if cached is not None and self._fresh(cached[1], reissue=True):
+                self._issued.move_to_end(session_id)
+                return cached[0]
+
+        minted_at = int(time.time())
+        token = self._fernets[0].encrypt_at_time(session_id.encode("utf-8"), minted_at).decode("utf-8")
+        with self._lock:
+            self._remember(self._issued, session_id, (token, minted_at))
+            self._remember(self._verified, token, (session_id, minted_at))
+        return token
+
+    def verify(self, token: str) -> Optional[str]:
+        """Return the session id for a valid token, or ``None``."""
+        if not self._fernets:
+            return None
+
+        with self._lock:
+            cached = self._verified.get(token)
+            if cached is not None:
+                if self._fresh(cached[1]):
+                    self._verified.move_to_end(token)
+                    return cached[0]
+                del self._verified[token]
+                return None
+
+        raw = token.encode("utf-8")
+        for index, fernet in enumerate(self._fernets):
+            try:
+                session_id = fernet.decrypt(raw, ttl=self._token_ttl).decode("utf-8")
+            except InvalidToken:
+                continue
+            if index == 0:
+                minted_at = fernet.extract_timestamp(raw)
+                with self._lock:
+                    self._remember(self._verified, token, (session_id, minted_at))
+                    self._remember(self._issued, session_id, (token, minted_at))
+            return session_id
+        return None
+
+    def _fresh(self, minted_at: int, reissue: bool = False) -> bool:
+        if self._token_ttl is None:
+            return True
+        # Re-issue at half-life so clients never hold a token about to expire.
+        ttl = self._token_ttl // 2 if reissue else self._token_ttl
+        return time.time() - minted_at < ttl
+
+    def _remember(self, cache: "OrderedDict", key: str, value: Tuple[str, int]) -> None:
+        cache[key] = value
+        cache.move_to_end(key)
+        while len(cache) > self._cache_size:
+            cache.popitem(last=False)
+
+
+def _configured_keys() -> List[str]:
+    keys = [key.strip() for key in os.getenv("ENCRYPTION_KEYS", "").split(",") if key.strip()]
+    legacy = os.getenv("ENCRYPTION_KEY")
+    if legacy and legacy not in keys:
+        keys.append(legacy)
+    return keys
+
+
+def _build_tokens(keys: Sequence[str]) -> Optional[SessionTokens]:
+    if not keys:
+        return None
+    ttl = os.getenv("SESSION_TOKEN_TTL")
     try:
-        _cipher = Fernet(_raw_key)
+        return SessionTokens(
+            keys,
+            cache_size=int(os.getenv("SESSION_TOKEN_CACHE_SIZE", "4096")),
+            token_ttl=int(ttl) if ttl else None,
+        )
     except Exception:  # pragma: no cover - invalid configuration
-        _cipher = None
+        return None
+
+
+_tokens: Optional[SessionTokens] = _build_tokens(_configured_keys())
+
+
+def reload_keys(keys: Optional[Sequence[str]] = None) -> bool:
+    """Swap in a new key set (defaults to the environment) without a restart."""
+    global _tokens
+    _tokens = _build_tokens(list(keys) if keys is not None else _configured_keys())
+    return _tokens is not None
 
 
 def is_cipher_ready() -> bool:
-    return _cipher is not None
+    return _tokens is not None
 
 
 def encrypt_session(session_id: str) -> str:
     if not session_id:
         return session_id
-    if _cipher is None:
+    if _tokens is None:
         return session_id
-    return _cipher.encrypt(session_id.encode("utf-8")).decode("utf-8")
+    return _tokens.issue(session_id)
 
 
 def decrypt_session(token: Optional[str]) -> Optional[str]:
+    """
+    The session id behind ``token``. A token that fails verification (expired,
+    or minted under a retired key) gives ``None`` so the caller starts a fresh
+    session; only bare session ids from before encryption pass through.
+    """
     if token is None:
         return None
-    if _cipher is None:
-        return token
-    try:
-        return _cipher.decrypt(token.encode("utf-8")).decode("utf-8")
-    except InvalidToken:
+    if _tokens is None:
         return token
+    session_id = _tokens.verify(token)
+    if session_id is not None:
+        return session_id
+    return token if _is_uuid(token) else None
 
 
-
-
+def _is_uuid(value: str) -> bool:
+    try:
+        uuid.UUID(value)
+    except ValueError:
+        return False
+    return True
@@ -0,0 +1,159 @@
+"""
+Compact binary encoding for session turns and intents stored in Redis.
+
+Records are struct-packed with an epoch-second timestamp and a leading format
+version byte. Turn bodies longer than ``COMPRESS_MIN_BYTES`` are zlib-compressed
+when that actually saves space. Entries written before this format existed are
+JSON objects; they always start with ``{`` and are still decoded, so existing
+sessions migrate as their lists roll over.
+"""
+
+from __future__ import annotations
+
+import json
+import struct
+import zlib
+from datetime import datetime, timezone
+from typing import Dict, Optional, Union
+
+from .session_store import IntentRecord, Turn
+
+FORMAT_VERSION = 1
+COMPRESS_MIN_BYTES = 256
+
+_KIND_TURN = 1
+_KIND_INTENT = 2
+_FLAG_ZLIB = 0x01
+
+# version, kind, flags, epoch seconds
+_HEADER = struct.Struct(">BBBI")
+# user length, ai length, dialect length
+_TURN_LENGTHS = struct.Struct(">IIB")
+# confidence scaled by 10_000, intent length
+_INTENT_FIELDS = struct.Struct(">HB")
+
+Entry = Union[bytes, str]
+
+
+def encode_turn(turn: Turn) -> bytes:
+    user = turn.user.encode("utf-8")
+    ai = turn.ai.encode("utf-8")
+    dialect = turn.dialect.encode("utf-8")[:255]
+    body = _TURN_LENGTHS.pack(len(user), len(ai), len(dialect)) + user + ai + dialect
+
+    flags = 0
+    if len(body) >= COMPRESS_MIN_BYTES:
+        packed = zlib.compress(body, 6)
+        if len(packed) < len(body):
+            body = packed
+            flags |= _FLAG_ZLIB
+    return _HEADER.pack(FORMAT_VERSION, _KIND_TURN, flags, _clamp_ts(turn.ts)) + body
+
+
+def encode_intent(record: IntentRecord) -> bytes:
+    intent = record.intent.encode("utf-8")[:255]
+    confidence = int(round(max(0.0, min(1.0, record.confidence)) * 10_000))
+    return (
+        _HEADER.pack(FORMAT_VERSION, _KIND_INTENT, 0, _clamp_ts(record.ts))
+        + _INTENT_FIELDS.pack(confidence, len(intent))
+        + intent
+    )
+
+
+def decode_turn(entry: Entry) -> Optional[Turn]:
+    try:
+        if _is_legacy(entry):
+            return _legacy_turn(entry)
+        data = _as_bytes(entry)
+        version, kind, flags, ts = _HEADER.unpack_from(data)
+        if version != FORMAT_VERSION or kind != _KIND_TURN:
+            return None
+        body = data[_HEADER.size:]
+        if flags & _FLAG_ZLIB:
+            body = zlib.decompress(body)
+        user_len, ai_len, dialect_len = _TURN_LENGTHS.unpack_from(body)
+        offset = _TURN_LENGTHS.size
+        user = body[offset:offset + user_len].decode("utf-8")
+        offset += user_len
+        ai = body[offset:offset + ai_len].decode("utf-8")
+        offset += ai_len
+        dialect = body[offset:offset + dialect_len].decode("utf-8")
+        return Turn(user=user, ai=ai, dialect=dialect, ts=float(ts))
+    except Exception:
+        return None
+
+
+def decode_intent(entry: Entry) -> Optional[IntentRecord]:
+    try:
+        if _is_legacy(entry):
+            return _legacy_intent(entry)
+        data = _as_bytes(entry)
+        version, kind, _flags, ts = _HEADER.unpack_from(data)
+        if version != FORMAT_VERSION or kind != _KIND_INTENT:
+            return None
+        confidence, intent_len = _INTENT_FIELDS.unpack_from(data, _HEADER.size)
+        offset = _HEADER.size + _INTENT_FIELDS.size
+        intent = data[offset:offset + intent_len].decode("utf-8")
+        return IntentRecord(intent=intent, confidence=confidence / 10_000, ts=float(ts))
+    except Exception:
+        return None
+
+
+def encode_turn_json(turn: Turn) -> str:
+    """Legacy JSON encoding, kept for benchmarks and rollbacks."""
+    return json.dumps(
+        {"user": turn.user, "ai": turn.ai, "dialect": turn.dialect, "ts": isoformat(turn.ts)}
+    )
+
+
+def encode_intent_json(record: IntentRecord) -> str:
+    """Legacy JSON encoding, kept for benchmarks and rollbacks."""
+    return json.dumps(
+        {"intent": record.intent, "confidence": record.confidence, "ts": isoformat(record.ts)}
+    )
+
+
+def isoformat(timestamp: float) -> str:
+    return datetime.fromtimestamp(timestamp, tz=timezone.utc).replace(tzinfo=None).isoformat()
+
+
+def _epoch(value: object) -> float:
+    if isinstance(value, (int, float)):
+        return float(value)
+    try:
+        return datetime.fromisoformat(str(value)).replace(tzinfo=timezone.utc).timestamp()
+    except ValueError:
+        return 0.0
+
+
+def _clamp_ts(timestamp: float) -> int:
+    return max(0, min(int(timestamp), 0xFFFFFFFF))
+
+
+def _is_legacy(entry: Entry) -> bool:
+    if isinstance(entry, str):
+        return entry.startswith("{")
+    return entry[:1] == b"{"
+
+
+def _as_bytes(entry: Entry) -> bytes:
+    return entry.encode("latin-1") if isinstance(entry, str) else entry
+
+
+def _legacy_turn(entry: Entry) -> Turn:
+    payload: Dict[str, str] = json.loads(entry)
+    return Turn(
+        user=payload["user"],
+        ai=payload["ai"],
+        dialect=payload.get("dialect", ""),
+        ts=_epoch(payload.get("ts")),
+    )
+
+
+def _legacy_intent(entry: Entry) -> IntentRecord:
+    payload: Dict[str, object] = json.loads(entry)
+    return IntentRecord(
+        intent=str(payload["intent"]),
+        confidence=float(payload.get("confidence", 0.0)),  # type: ignore[arg-type]
+        ts=_epoch(payload.get("ts")),
+    )
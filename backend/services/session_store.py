@@ -0,0 +1,246 @@
+"""
+Bounded in-process session store used by ``ContextMemory``.
+
+Sessions live in an LRU-ordered dict capped by an approximate byte budget and
+expire through a hashed timer wheel, so expiry costs O(expired) per tick
+instead of a scan over every session. Turn and intent records use
+``__slots__`` to keep per-entry overhead small. The store is owned by the event
+loop and is not thread-safe.
+
+It serves as an L1 in front of Redis, or as the only store when ``REDIS_URL``
+is not configured. Each session remembers the Redis version it was copied at
+so ``ContextMemory`` can tell when another worker has written since.
+"""
+
+from __future__ import annotations
+
+import time
+from collections import OrderedDict, deque
+from typing import Callable, Deque, Iterable, List, Optional, Set
+
+# Rough CPython overhead for a slotted record plus its deque slot.
+_TURN_OVERHEAD = 200
+_INTENT_OVERHEAD = 120
+_SESSION_OVERHEAD = 400
+
+
+class Turn:
+    __slots__ = ("user", "ai", "dialect", "ts")
+
+    def __init__(self, user: str, ai: str, dialect: str, ts: float) -> None:
+        self.user = user
+        self.ai = ai
+        self.dialect = dialect
+        self.ts = ts
+
+    def size(self) -> int:
+        return _TURN_OVERHEAD + len(self.user) + len(self.ai) + len(self.dialect)
+
+
+class IntentRecord:
+    __slots__ = ("intent", "confidence", "ts")
+
+    def __init__(self, intent: str, confidence: float, ts: float) -> None:
+        self.intent = intent
+        self.confidence = confidence
+        self.ts = ts
+
+    def size(self) -> int:
+        return _INTENT_OVERHEAD + len(self.intent)
+
+    def to_dict(self) -> dict:
+        return {"intent": self.intent, "confidence": self.confidence, "ts": self.ts}
+
+
+class _Session:
+    __slots__ = ("turns", "intents", "deadline", "size", "slot", "version", "wallet")
+
+    def __init__(self, max_turns: int, max_intents: int) -> None:
+        self.turns: Deque[Turn] = deque(maxlen=max_turns)
+        self.intents: Deque[IntentRecord] = deque(maxlen=max_intents)
+        self.deadline = 0.0
+        self.size = _SESSION_OVERHEAD
+        self.slot: Optional[int] = None
+        # The backing store's write counter for the session when this copy matched it.
+        self.version = 0
+        self.wallet = ""
+
+
+class SessionStore:
+    def __init__(
+        self,
+        ttl_seconds: float = 3600,
+        max_bytes: int = 32 * 1024 * 1024,
+        max_turns: int = 10,
+        max_intents: int = 20,
+        tick_seconds: float = 1.0,
+        wheel_slots: int = 1024,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._clock = clock
+        self._ttl = ttl_seconds
+        self._max_bytes = max_bytes
+        self._max_turns = max_turns
+        self._max_intents = max_intents
+        self._tick = tick_seconds
+        self._wheel: List[Set[str]] = [set() for _ in range(wheel_slots)]
+        self._cursor = self._tick_of(self._clock())
+        self._sessions: "OrderedDict[str, _Session]" = OrderedDict()
+        self._bytes = 0
+
+    @property
+    def size_bytes(self) -> int:
+        return self._bytes
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def turns(self, session_id: str, limit: Optional[int] = None) -> Optional[List[Turn]]:
+        """Newest-first turns, or ``None`` when the session is not cached."""
+        session = self._lookup(session_id)
+        if session is None:
+            return None
+        turns = list(session.turns)
+        return turns if limit is None else turns[:limit]
+
+    def intents(self, session_id: str) -> Optional[List[IntentRecord]]:
+        """Newest-first intents, or ``None`` when the session is not cached."""
+        session = self._lookup(session_id)
+        if session is None:
+            return None
+        return list(session.intents)
+
+    def wallet(self, session_id: str) -> Optional[str]:
+        """The bound wallet address, ``""`` if none, or ``None`` when the session is not cached."""
+        session = self._lookup(session_id)
+        return None if session is None else session.wallet
+
+    def version(self, session_id: str) -> Optional[int]:
+        """The version the cached copy was taken at, or ``None`` when the session is not cached."""
+        session = self._lookup(session_id)
+        return None if session is None else session.version
+
+    def append(
+        self,
+        session_id: str,
+        turn: Optional[Turn] = None,
+        intent: Optional[IntentRecord] = None,
+        wallet: Optional[str] = None,
+        version: Optional[int] = None,
+    ) -> None:
+        now = self._clock()
+        self._advance(now)
+        session = self._sessions.get(session_id)
+        if session is None:
+            session = self._create(session_id)
+        if version is not None:
+            session.version = version
+        if wallet is not None:
+            session.wallet = wallet
+        if turn is not None:
+            self._push(session, session.turns, turn)
+        if intent is not None:
+            self._push(session, session.intents, intent)
+        self._touch(session_id, session, now)
+        self._evict()
+
+    def load(
+        self,
+        session_id: str,
+        turns: Iterable[Turn],
+        intents: Iterable[IntentRecord],
+        wallet: str = "",
+        version: int = 0,
+    ) -> None:
+        """Replace a session with newest-first records read from the backing store."""
+        now = self._clock()
+        self._advance(now)
+        self.discard(session_id)
+        session = self._create(session_id)
+        session.wallet = wallet
+        session.version = version
+        for turn in turns:
+            if len(session.turns) == self._max_turns:
+                break
+            session.turns.append(turn)
+            session.size += turn.size()
+        for intent in intents:
+            if len(session.intents) == self._max_intents:
+                break
+            session.intents.append(intent)
+            session.size += intent.size()
+        self._bytes += session.size - _SESSION_OVERHEAD
+        self._touch(session_id, session, now)
+        self._evict()
+
+    def discard(self, session_id: str) -> None:
+        session = self._sessions.pop(session_id, None)
+        if session is None:
+            return
+        self._bytes -= session.size
+        if session.slot is not None:
+            self._wheel[session.slot].discard(session_id)
+
+    def _lookup(self, session_id: str) -> Optional[_Session]:
+        now = self._clock()
+        self._advance(now)
+        session = self._sessions.get(session_id)
+        if session is None:
+            return None
+        if session.deadline <= now:
+            self.discard(session_id)
+            return None
+        self._sessions.move_to_end(session_id)
+        return session
+
+    def _create(self, session_id: str) -> _Session:
+        session = _Session(self._max_turns, self._max_intents)
+        self._sessions[session_id] = session
+        self._bytes += session.size
+        return session
+
+    def _push(self, session: _Session, records: Deque, record) -> None:
+        if records.maxlen is not None and len(records) == records.maxlen:
+            dropped = records.pop()
+            session.size -= dropped.size()
+            self._bytes -= dropped.size()
+        records.appendleft(record)
+        session.size += record.size()
+        self._bytes += record.size()
+
+    def _touch(self, session_id: str, session: _Session, now: float) -> None:
+        session.deadline = now + self._ttl
+        slot = self._tick_of(session.deadline) % len(self._wheel)
+        if session.slot != slot:
+            if session.slot is not None:
+                self._wheel[session.slot].discard(session_id)
+            self._wheel[slot].add(session_id)
+            session.slot = slot
+        self._sessions.move_to_end(session_id)
+
+    def _evict(self) -> None:
+        while self._bytes > self._max_bytes and self._sessions:
+            session_id = next(iter(self._sessions))
+            self.discard(session_id)
+
+    def _advance(self, now: float) -> None:
+        current = self._tick_of(now)
+        if current <= self._cursor:
+            return
+        # Once a full rotation has elapsed every slot is due.
+        ticks = range(self._cursor + 1, current + 1)
+        if len(ticks) > len(self._wheel):
+            ticks = range(current - len(self._wheel) + 1, current + 1)
+        for tick in ticks:
+            bucket = self._wheel[tick % len(self._wheel)]
+            for session_id in list(bucket):
+                session = self._sessions.get(session_id)
+                if session is None:
+                    bucket.discard(session_id)
+                elif session.deadline <= now:
+                    self.discard(session_id)
+                # Later deadlines hashed to this slot wait for another rotation.
+        self._cursor = current
+
+    def _tick_of(self, timestamp: float) -> int:
+        return int(timestamp // self._tick)
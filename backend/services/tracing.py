@@ -0,0 +1,295 @@
+"""
+Per-request stage tracing.
+
+``TracingMiddleware`` opens a trace for every HTTP request and keeps its root
+span in a context variable, so ``span("name")`` anywhere below the handler
+(including code run through ``asyncio.to_thread`` or tasks started by the
+request) records a nested, timed child without any plumbing. Outside a
+request ``span`` does nothing, which keeps it safe in shared code such as
+``ContextMemory`` and ``ProviderPool`` and in inference worker processes.
+
+Every response gets a ``Server-Timing`` header with the spans finished
+before the headers went out, summed per name. Once the body has been sent
+(its duration is the ``stream`` span) the trace is offered to the
+``Tracer``: traces slower than ``TRACE_SLOW_MS`` and a ``TRACE_SAMPLE_RATE``
+fraction of the rest go into a ring buffer of ``TRACE_BUFFER_SIZE`` entries,
+shown by ``/debug/traces``. With ``OTEL_EXPORTER_OTLP_ENDPOINT`` set and
+``opentelemetry-sdk`` plus ``opentelemetry-exporter-otlp-proto-http``
+installed, every trace is also exported to that collector; an incoming W3C
+``traceparent`` header is honoured.
+"""
+
+from __future__ import annotations
+
+import functools
+import logging
+import os
+import random
+import re
+import time
+import uuid
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Deque, Dict, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger("chamas.tracing")
+
+# Cap on Server-Timing entries so a request with many distinct spans cannot bloat the headers.
+MAX_SERVER_TIMING_ENTRIES = 24
+
+_TRACEPARENT = re.compile(r"^00-([0-9a-f]{32})-([0-9a-f]{16})-[0-9a-f]{2}$")
+
+
+class Span:
+    __slots__ = ("name", "start", "end", "attrs", "children")
+
+    def __init__(self, name: str, start: float, attrs: Optional[Dict[str, Any]] = None) -> None:
+        self.name = name
+        self.start = start
+        self.end: Optional[float] = None
+        self.attrs = attrs
+        self.children: List["Span"] = []
+
+    @property
+    def duration(self) -> float:
+        return (self.end if self.end is not None else time.perf_counter()) - self.start
+
+    def to_dict(self, origin: float) -> Dict[str, Any]:
+        entry: Dict[str, Any] = {
+            "name": self.name,
+            "startMs": round((self.start - origin) * 1000, 2),
+            "durationMs": round(self.duration * 1000, 2),
+        }
+        if self.attrs:
+            entry["attrs"] = self.attrs
+        if self.children:
+            entry["children"] = [child.to_dict(origin) for child in self.children]
+        return entry
+
+
+class Trace:
+    __slots__ = ("trace_id", "parent_id", "method", "path", "status", "wall_start", "root")
+
+    def __init__(self, method: str, path: str, traceparent: Optional[str] = None) -> None:
+        match = _TRACEPARENT.match(traceparent or "")
+        self.trace_id = match.group(1) if match else uuid.uuid4().hex
+        self.parent_id = match.group(2) if match else None
+        self.method = method
+        self.path = path
+        self.status = 0
+        self.wall_start = time.time()
+        self.root = Span("request", time.perf_counter())
+
+    @property
+    def duration(self) -> float:
+        return self.root.duration
+
+    def server_timing(self) -> str:
+        totals: Dict[str, float] = {}
+        # Depth first, so each stage is followed by its sub-stages.
+        pending = list(reversed(self.root.children))
+        while pending:
+            current = pending.pop()
+            if current.end is not None:
+                totals[current.name] = totals.get(current.name, 0.0) + current.duration
+            pending.extend(reversed(current.children))
+        entries = [f"{name};dur={seconds * 1000:.1f}" for name, seconds in totals.items()]
+        entries = entries[:MAX_SERVER_TIMING_ENTRIES]
+        entries.append(f"total;dur={self.duration * 1000:.1f}")
+        return ", ".join(entries)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "traceId": self.trace_id,
+            "method": self.method,
+            "path": self.path,
+            "status": self.status,
+            "startedAt": self.wall_start,
+            "durationMs": round(self.duration * 1000, 2),
+            "spans": [child.to_dict(self.root.start) for child in self.root.children],
+        }
+
+
+_current: ContextVar[Optional[Span]] = ContextVar("chamas_span", default=None)
+
+
+@contextmanager
+def span(name: str, **attrs: Any) -> Iterator[Optional[Span]]:
+    """Time the enclosed block as a child of the current span; a no-op outside a request."""
+    parent = _current.get()
+    if parent is None:
+        yield None
+        return
+    child = Span(name, time.perf_counter(), attrs or None)
+    parent.children.append(child)
+    token = _current.set(child)
+    try:
+        yield child
+    finally:
+        child.end = time.perf_counter()
+        _current.reset(token)
+
+
+def record(name: str, seconds: float, **attrs: Any) -> None:
+    """Add an already-measured stage that ended just now, e.g. time spent in another process."""
+    parent = _current.get()
+    if parent is None:
+        return
+    end = time.perf_counter()
+    child = Span(name, end - max(0.0, seconds), attrs or None)
+    child.end = end
+    parent.children.append(child)
+
+
+def traced(name: str) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+    """Decorate a coroutine function so every call runs inside ``span(name)``."""
+
+    def decorate(func: Callable[..., Any]) -> Callable[..., Any]:
+        @functools.wraps(func)
+        async def wrapper(*args: Any, **kwargs: Any) -> Any:
+            with span(name):
+                return await func(*args, **kwargs)
+
+        return wrapper
+
+    return decorate
+
+
+class _OtlpExporter:
+    """Replays finished traces as OpenTelemetry spans through a batching OTLP/HTTP exporter."""
+
+    def __init__(self) -> None:
+        from opentelemetry import trace as trace_api
+        from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+        from opentelemetry.sdk.resources import Resource
+        from opentelemetry.sdk.trace import TracerProvider
+        from opentelemetry.sdk.trace.export import BatchSpanProcessor
+
+        self._api = trace_api
+        self._provider = TracerProvider(
+            resource=Resource.create({"service.name": os.getenv("OTEL_SERVICE_NAME", "chamas-api")})
+        )
+        self._provider.add_span_processor(BatchSpanProcessor(OTLPSpanExporter()))
+        self._tracer = self._provider.get_tracer("chamas")
+
+    def export(self, trace: Trace) -> None:
+        api = self._api
+        context = None
+        if trace.parent_id is not None:
+            remote = api.SpanContext(
+                trace_id=int(trace.trace_id, 16),
+                span_id=int(trace.parent_id, 16),
+                is_remote=True,
+                trace_flags=api.TraceFlags(api.TraceFlags.SAMPLED),
+            )
+            context = api.set_span_in_context(api.NonRecordingSpan(remote))
+        # perf_counter offsets anchored at the request's wall-clock start.
+        origin_ns = int(trace.wall_start * 1e9) - int(trace.root.start * 1e9)
+        root = trace.root
+        self._emit(
+            root,
+            f"{trace.method} {trace.path}",
+            context,
+            origin_ns,
+            {"http.method": trace.method, "http.route": trace.path, "http.status_code": trace.status},
+        )
+
+    def _emit(self, item: Span, name: str, context: Any, origin_ns: int, attrs: Optional[Dict[str, Any]]) -> None:
+        otel_span = self._tracer.start_span(
+            name,
+            context=context,
+            start_time=origin_ns + int(item.start * 1e9),
+            attributes={key: value for key, value in (attrs or {}).items() if value is not None},
+        )
+        child_context = self._api.set_span_in_context(otel_span)
+        for child in item.children:
+            self._emit(child, child.name, child_context, origin_ns, child.attrs)
+        end = item.end if item.end is not None else time.perf_counter()
+        otel_span.end(end_time=origin_ns + int(end * 1e9))
+
+    def shutdown(self) -> None:
+        self._provider.shutdown()
+
+
+class Tracer:
+    """Keeps slow and sampled traces in a ring buffer and forwards traces to OTLP."""
+
+    def __init__(
+        self,
+        slow_ms: Optional[float] = None,
+        sample_rate: Optional[float] = None,
+        buffer_size: Optional[int] = None,
+    ) -> None:
+        self.enabled = os.getenv("TRACING_ENABLED", "1") == "1"
+        self._slow = (slow_ms if slow_ms is not None else float(os.getenv("TRACE_SLOW_MS", "1000"))) / 1000
+        self._rate = sample_rate if sample_rate is not None else float(os.getenv("TRACE_SAMPLE_RATE", "0.01"))
+        self._buffer: Deque[Dict[str, Any]] = deque(maxlen=buffer_size or int(os.getenv("TRACE_BUFFER_SIZE", "200")))
+        self._exporter: Optional[_OtlpExporter] = None
+        if self.enabled and os.getenv("OTEL_EXPORTER_OTLP_ENDPOINT"):
+            try:
+                self._exporter = _OtlpExporter()
+            except ImportError:
+                logger.warning(
+                    "OTEL_EXPORTER_OTLP_ENDPOINT is set but opentelemetry-sdk and "
+                    "opentelemetry-exporter-otlp-proto-http are not installed; not exporting traces."
+                )
+
+    def finish(self, trace: Trace) -> None:
+        if trace.duration >= self._slow or random.random() < self._rate:
+            self._buffer.append(trace.to_dict())
+        if self._exporter is not None:
+            try:
+                self._exporter.export(trace)
+            except Exception:  # pragma: no cover - exporting must never fail a request
+                logger.exception("Could not export trace %s", trace.trace_id)
+
+    def recent(self, limit: int = 50, min_ms: float = 0.0) -> List[Dict[str, Any]]:
+        """Buffered traces, newest first."""
+        found = [entry for entry in reversed(self._buffer) if entry["durationMs"] >= min_ms]
+        return found[:limit]
+
+    def shutdown(self) -> None:
+        if self._exporter is not None:
+            self._exporter.shutdown()
+
+
+class TracingMiddleware:
+    """ASGI middleware that traces each HTTP request and adds ``Server-Timing``."""
+
+    def __init__(self, app: Any, tracer: Tracer) -> None:
+        self.app = app
+        self.tracer = tracer
+
+    async def __call__(self, scope: Dict[str, Any], receive: Any, send: Any) -> None:
+        if scope["type"] != "http" or not self.tracer.enabled:
+            await self.app(scope, receive, send)
+            return
+
+        headers = dict(scope.get("headers") or [])
+        traceparent = headers.get(b"traceparent", b"").decode("latin-1") or None
+        trace = Trace(scope["method"], scope["path"], traceparent)
+        stream: List[Span] = []
+
+        async def send_with_timing(message: Dict[str, Any]) -> None:
+            if message["type"] == "http.response.start":
+                trace.status = message["status"]
+                header: Tuple[bytes, bytes] = (b"server-timing", trace.server_timing().encode("latin-1"))
+                message = {**message, "headers": [*message.get("headers", []), header]}
+                body = Span("stream", time.perf_counter())
+                trace.root.children.append(body)
+                stream.append(body)
+            await send(message)
+            if message["type"] == "http.response.body" and not message.get("more_body") and stream:
+                stream[0].end = time.perf_counter()
+
+        token = _current.set(trace.root)
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current.reset(token)
+            trace.root.end = time.perf_counter()
+            if stream and stream[0].end is None:
+                # Client went away mid-body.
+                stream[0].end = trace.root.end
+            self.tracer.finish(trace)
@@ -10,23 +10,39 @@ caller can stream the response straight to the browser.
 
 from __future__ import annotations
 
+import functools
+import importlib.util
 import os
 import tempfile
+import time
 from dataclasses import dataclass
-from typing import Optional
+from typing import Dict, Optional
 
-try:
-    from google.cloud import texttospeech  # type: ignore
-except Exception:  # pragma: no cover - optional dependency
-    texttospeech = None
+from .tracing import span
 
-try:
-    from TTS.api import TTS  # type: ignore
-except Exception:  # pragma: no cover - optional dependency
-    TTS = None
+
+@functools.lru_cache(maxsize=None)
+def _import_google():
+    """``google.cloud.texttospeech``, imported when credentials are configured; None if missing."""
+    try:
+        from google.cloud import texttospeech  # type: ignore
+    except Exception:  # pragma: no cover - optional dependency
+        return None
+    return texttospeech
+
+
+@functools.lru_cache(maxsize=None)
+def _import_coqui():
+    """``TTS.api`` from coqui-tts (and with it torch), imported when the fallback engine is built; None if missing."""
+    try:
+        from TTS import api  # type: ignore
+    except Exception:  # pragma: no cover - optional dependency
+        return None
+    return api
 
 
 DEFAULT_VOICE = "sw-KE-Standard-A"
+COQUI_MODEL = "tts_models/sw/cv/vits"
 
 
 @dataclass
@@ -45,14 +61,25 @@ class TTSService:
         self._speaking_rate = speaking_rate
 
         self._gcloud_client = None
+        self._texttospeech = None
         self._coqui_pipeline = None
+        # Seconds spent per startup phase ("import", "load", "warmup").
+        self.timings: Dict[str, float] = {}
 
-        if texttospeech is not None and os.getenv("GOOGLE_APPLICATION_CREDENTIALS"):
+        start = time.perf_counter()
+        texttospeech = _import_google() if os.getenv("GOOGLE_APPLICATION_CREDENTIALS") else None
+        if texttospeech is not None:
+            self._texttospeech = texttospeech
             self._gcloud_client = texttospeech.TextToSpeechClient()
+            self.timings["import"] = time.perf_counter() - start
 
-        if self._gcloud_client is None and TTS is not None:
+        coqui = _import_coqui() if self._gcloud_client is None else None
+        if coqui is not None:
+            self.timings["import"] = time.perf_counter() - start
+            start = time.perf_counter()
             try:
-                self._coqui_pipeline = TTS(model_name="tts_models/sw/cv/vits")  # type: ignore[call-arg]
+                self._coqui_pipeline = coqui.TTS(model_name=COQUI_MODEL)  # type: ignore[call-arg]
+                self.timings["load"] = time.perf_counter() - start
             except Exception:
                 self._coqui_pipeline = None
 
@@ -60,15 +87,48 @@ class TTSService:
     def is_ready(self) -> bool:
         return bool(self._gcloud_client or self._coqui_pipeline)
 
+    @property
+    def engine(self) -> str:
+        if self._gcloud_client is not None:
+            return "google"
+        return "coqui" if self._coqui_pipeline is not None else "none"
+
+    @property
+    def model_name(self) -> str:
+        if self._gcloud_client is not None:
+            return self._voice_name
+        return COQUI_MODEL if self._coqui_pipeline is not None else "none"
+
+    @staticmethod
+    def backend_available() -> bool:
+        """Whether an engine could be set up, without creating a client or loading a model."""
+        if os.getenv("GOOGLE_APPLICATION_CREDENTIALS"):
+            try:
+                if importlib.util.find_spec("google.cloud.texttospeech") is not None:
+                    return True
+            except ModuleNotFoundError:  # google.cloud itself is missing
+                pass
+        return importlib.util.find_spec("TTS") is not None
+
+    def warm_up(self) -> None:
+        """Synthesise a short phrase with the local engine; the Google client needs no warming."""
+        if self._coqui_pipeline is None:
+            return
+        start = time.perf_counter()
+        self._synthesise_coqui("Habari")
+        self.timings["warmup"] = time.perf_counter() - start
+
     def synthesise(self, text: str) -> TTSResult:
         if not text.strip():
             raise ValueError("Cannot synthesise empty text.")
 
         if self._gcloud_client is not None:
-            return self._synthesise_google(text=text)
+            with span("tts.google"):
+                return self._synthesise_google(text=text)
 
         if self._coqui_pipeline is not None:
-            return self._synthesise_coqui(text=text)
+            with span("tts.coqui"):
+                return self._synthesise_coqui(text=text)
 
         raise RuntimeError(
             "Hakuna injini ya TTS iliyo tayari. Weka kitambulisho cha Google Cloud "
@@ -78,6 +138,7 @@ class TTSService:
     def _synthesise_google(self, text: str) -> TTSResult:
         assert self._gcloud_client is not None  # for type checkers
 
+        texttospeech = self._texttospeech
         request = texttospeech.SynthesizeSpeechRequest(  # type: ignore[attr-defined]
             input=texttospeech.SynthesisInput(text=text),  # type: ignore[attr-defined]
             voice=texttospeech.VoiceSelectionParams(  # type: ignore[attr-defined]
@@ -0,0 +1,94 @@
+"""
+Background model loading and warm-up for fast, honest startup.
+
+Importing ``main`` no longer pulls in torch, transformers, coqui-tts, the
+Google client or web3; each is imported when its service is built. With
+``WARMUP_MODELS=1`` (the default) the server starts answering
+``/health/live`` straight away while ``ModelWarmup`` builds the ASR, LLM and
+TTS services in background threads and runs one small inference through each
+(a second of silent audio, a short generation, a short synthesis). The first
+inference pays for lazy kernel selection, allocator growth and page faults;
+doing it here keeps that cost off the first user request. ``/health/ready``
+stays 503 until every warm-up has finished.
+
+Per-component timings (``import``, ``load``, ``warmup``) are kept in
+``TIMINGS``, exported as ``component_startup_seconds`` and shown by
+``/health/ready``. In worker mode the worker processes warm themselves up
+before reporting ready and send their timings back.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+from typing import Dict, Iterable, Optional
+
+from .metrics import component_startup_seconds
+from .registry import ServiceRegistry
+
+logger = logging.getLogger("chamas.warmup")
+
+# component -> phase -> seconds, for this process.
+TIMINGS: Dict[str, Dict[str, float]] = {}
+
+
+def warmup_enabled() -> bool:
+    return os.getenv("WARMUP_MODELS", "1") == "1"
+
+
+def record(component: str, timings: Dict[str, float]) -> None:
+    TIMINGS.setdefault(component, {}).update({phase: round(seconds, 3) for phase, seconds in timings.items()})
+    for phase, seconds in timings.items():
+        component_startup_seconds.labels(component=component, phase=phase).set(seconds)
+
+
+class ModelWarmup:
+    """Builds and warms the registry's model services in background threads."""
+
+    def __init__(self, registry: ServiceRegistry, kinds: Iterable[str]) -> None:
+        self._registry = registry
+        self._states: Dict[str, str] = {kind: "pending" for kind in kinds}
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    @property
+    def done(self) -> bool:
+        return all(state not in ("pending", "warming") for state in self._states.values())
+
+    def state(self, kind: str) -> str:
+        return self._states[kind]
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        # A model that is still loading keeps its thread; the process is exiting anyway.
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+
+    async def _run(self) -> None:
+        await asyncio.gather(*(self._warm(kind) for kind in self._states))
+
+    async def _warm(self, kind: str) -> None:
+        self._states[kind] = "warming"
+        try:
+            ready = await asyncio.to_thread(self._build, kind)
+        except Exception:
+            logger.exception("Warm-up of %s failed", kind)
+            self._states[kind] = "failed"
+            return
+        self._states[kind] = "ready" if ready else "unavailable"
+        logger.info("%s %s after %s", kind, self._states[kind], TIMINGS.get(kind, {}))
+
+    def _build(self, kind: str) -> bool:
+        service = self._registry.get(kind)
+        if service.is_ready:
+            service.warm_up()
+        record(kind, service.timings)
+        return service.is_ready
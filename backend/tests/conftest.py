@@ -0,0 +1,27 @@
+"""
+Puts ``backend`` on the path so tests import ``services`` and ``blockchain``
+the way the app does, and provides a ``clock`` to pass to the classes that
+take one.
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+
+class Clock:
+    """A clock for the classes that take one; it only moves when a test moves ``now``."""
+
+    def __init__(self, now: float = 1000.0) -> None:
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock() -> Clock:
+    return Clock()
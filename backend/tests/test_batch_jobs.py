@@ -0,0 +1,68 @@
+import io
+import zipfile
+
+import pytest
+
+from services.batch_jobs import BatchJobStore, BatchRejected
+
+
+@pytest.fixture
+def store(tmp_path):
+    return BatchJobStore(root=str(tmp_path), max_clips=3, max_bytes=1000, max_clip_bytes=400)
+
+
+def _zip(entries):
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+        for name, data in entries.items():
+            archive.writestr(name, data)
+    return buffer.getvalue()
+
+
+def test_unpack_expands_archives_and_skips_hidden_and_empty_entries(store):
+    archive = _zip({"a.wav": b"a" * 10, "__MACOSX/a.wav": b"x", "notes/.DS_Store": b"x", "empty.wav": b""})
+    clips = store.unpack([("voice.zip", archive), ("b.wav", b"b" * 20)])
+    assert clips == [("voice.zip/a.wav", b"a" * 10), ("b.wav", b"b" * 20)]
+
+
+@pytest.mark.parametrize(
+    "uploads, status_code",
+    [
+        ([("big.wav", b"x" * 401)], 413),
+        ([(f"{index}.wav", b"x") for index in range(4)], 413),
+        ([(f"{index}.wav", b"x" * 400) for index in range(3)], 413),
+        ([("bad.zip", b"PK\x03\x04 not really")], 400),
+        ([("empty.wav", b"")], 400),
+    ],
+)
+def test_unpack_rejects_uploads_past_the_limits(store, uploads, status_code):
+    with pytest.raises(BatchRejected) as raised:
+        store.unpack(uploads)
+    assert raised.value.status_code == status_code
+
+
+def test_unpack_checks_declared_archive_size_before_inflating(store):
+    archive = _zip({"a.wav": b"\0" * 600, "b.wav": b"\0" * 600})
+    assert len(archive) < 1000
+    with pytest.raises(BatchRejected, match="expands past"):
+        store.unpack([("voice.zip", archive)])
+
+
+def test_check_sizes_uses_declared_sizes(store):
+    store.check_sizes([("a.wav", 400, False), ("voice.zip", 500, True), ("unknown.wav", None, False)])
+    with pytest.raises(BatchRejected):
+        store.check_sizes([("a.wav", 401, False)])
+    with pytest.raises(BatchRejected):
+        store.check_sizes([("voice.zip", 700, True), ("b.wav", 400, False)])
+
+
+def test_cancel_survives_a_concurrent_runner_update(store):
+    status = store.create([("a.wav", b"a")], {"respond": False, "synthesise": False})
+    job_id = status["id"]
+    store.update(job_id, status="running")
+    store.cancel(job_id)
+    # The runner's progress write lands after the cancel.
+    store.update(job_id, completed=1, failed=0)
+    assert store.update(job_id, status="done")["status"] == "cancelled"
+    assert store.status(job_id)["completed"] == 1
+    assert store.cancelled(job_id)
@@ -0,0 +1,65 @@
+import asyncio
+
+import pytest
+
+from blockchain.chama_client import ChamaClient, ChamaSummary
+
+OWNER = "0x" + "1" * 40
+
+
+class PagingClient(ChamaClient):
+    """Chamas 1..``count`` with no node behind them; ids in ``failing`` fail to read."""
+
+    def __init__(self, count: int, failing=()) -> None:
+        super().__init__()
+        self._contract = object()
+        self.count = count
+        self.failing = set(failing)
+        self.reads = 0
+
+    async def _candidate_ids(self, before, active, member):
+        return range(min(before or self.count + 1, self.count + 1) - 1, 0, -1)
+
+    async def get_chamas(self, chama_ids):
+        self.reads += 1
+        return [
+            ChamaSummary(chama_id, f"c{chama_id}", OWNER, 1, 1, 0, 1, True)
+            for chama_id in chama_ids
+            if chama_id not in self.failing
+        ]
+
+
+@pytest.fixture(autouse=True)
+def no_rpc(monkeypatch):
+    for name in ("SEPOLIA_RPC_URLS", "SEPOLIA_RPC_URL", "CHAMA_FACTORY_ADDRESS"):
+        monkeypatch.delenv(name, raising=False)
+
+
+def test_complete_pages_are_served_from_the_page_cache():
+    client = PagingClient(count=10)
+
+    async def scenario():
+        body, complete = await client.page_json(limit=3, version="block:1:0")
+        assert complete
+        assert b'"nextCursor":"' in body
+        assert await client.page_json(limit=3, version="block:1:0") == (body, True)
+
+    asyncio.run(scenario())
+    assert client.reads == 1
+
+
+@pytest.mark.parametrize("owner", [None, OWNER])
+def test_a_page_missing_a_failed_read_is_not_cached(owner):
+    client = PagingClient(count=10, failing={9})
+
+    async def scenario():
+        body, complete = await client.page_json(limit=3, owner=owner, version="block:1:0")
+        assert not complete
+        assert b'"id":9' not in body
+        client.failing.clear()
+        body, complete = await client.page_json(limit=3, owner=owner, version="block:1:0")
+        assert complete
+        assert b'"id":9' in body
+
+    asyncio.run(scenario())
+    assert client.reads == 2
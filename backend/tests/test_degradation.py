@@ -0,0 +1,101 @@
+from services.degradation import FALLBACK_ASR, DegradationController, template_answer
+
+
+class FakeInference:
+    def __init__(self, ready=("asr", "llm", "tts"), fallback=False) -> None:
+        self.ready = set(ready)
+        self.has_fallback_asr = fallback
+        self.backlogs = {"asr": 0.0, "llm": 0.0, "tts": 0.0}
+
+    def is_ready(self, kind: str) -> bool:
+        return kind in self.ready
+
+    def backlog(self, kind: str) -> float:
+        return self.backlogs[kind]
+
+
+BUDGETS = {"asr": 1.5, "llm": 1.5, "tts": 0.75}
+
+
+def test_backlog_at_the_threshold_sheds_the_stage(clock):
+    controller = DegradationController(
+        enabled=True, max_backlog=2, hold_seconds=10, latency_budgets=BUDGETS, clock=clock
+    )
+    inference = FakeInference()
+    inference.backlogs["tts"] = 1.9
+    assert not controller.shed("tts", inference)
+    inference.backlogs["tts"] = 2.0
+    assert controller.shed("tts", inference)
+    assert not controller.shed("llm", inference)
+
+
+def test_latency_over_budget_sheds_the_stage(clock):
+    controller = DegradationController(
+        enabled=True, max_backlog=2, hold_seconds=10, latency_budgets=BUDGETS, clock=clock
+    )
+    inference = FakeInference()
+    for _ in range(3):
+        controller.observe("llm", 1.0)
+    assert not controller.shed("llm", inference)
+    for _ in range(10):
+        controller.observe("llm", 3.0)
+    assert controller.shed("llm", inference)
+
+
+def test_shed_stage_holds_then_recovers_below_half_the_backlog(clock):
+    controller = DegradationController(
+        enabled=True, max_backlog=2, hold_seconds=10, latency_budgets=BUDGETS, clock=clock
+    )
+    inference = FakeInference()
+    inference.backlogs["llm"] = 3.0
+    assert controller.shed("llm", inference)
+    inference.backlogs["llm"] = 0.0
+    clock.now += 5
+    assert controller.shed("llm", inference), "still within the hold"
+    clock.now += 6
+    inference.backlogs["llm"] = 1.0
+    assert controller.shed("llm", inference), "backlog not yet below half the threshold"
+    inference.backlogs["llm"] = 0.5
+    assert not controller.shed("llm", inference)
+
+
+def test_recovery_clears_the_latency_history(clock):
+    controller = DegradationController(
+        enabled=True, max_backlog=2, hold_seconds=10, latency_budgets=BUDGETS, clock=clock
+    )
+    inference = FakeInference()
+    for _ in range(10):
+        controller.observe("tts", 2.0)
+    assert controller.shed("tts", inference)
+    clock.now += 11
+    assert not controller.shed("tts", inference)
+    assert not controller.shed("tts", inference)
+
+
+def test_stages_that_are_not_ready_are_shed_even_when_disabled(clock):
+    controller = DegradationController(
+        enabled=False, max_backlog=2, hold_seconds=10, latency_budgets=BUDGETS, clock=clock
+    )
+    inference = FakeInference(ready=("asr",))
+    inference.backlogs["asr"] = 10
+    assert controller.shed("llm", inference)
+    assert controller.shed("tts", inference)
+    # Without a fallback model ASR is never shed.
+    assert not controller.shed("asr", inference)
+
+
+def test_asr_falls_back_to_the_small_model(clock):
+    controller = DegradationController(
+        enabled=True, max_backlog=2, hold_seconds=10, latency_budgets=BUDGETS, clock=clock
+    )
+    inference = FakeInference(ready=("asr", FALLBACK_ASR), fallback=True)
+    assert not controller.shed("asr", inference)
+    inference.backlogs["asr"] = 5
+    assert controller.shed("asr", inference)
+    inference.ready.discard(FALLBACK_ASR)
+    assert not controller.shed("asr", inference)
+
+
+def test_template_answer_falls_back_to_the_general_one():
+    assert template_answer("contribute") != template_answer("general_query")
+    assert template_answer("unknown_intent") == template_answer("general_query")
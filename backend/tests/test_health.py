@@ -0,0 +1,47 @@
+import asyncio
+
+from services.health import HealthProber, default_required
+
+
+def _probe(ok, state="ready"):
+    async def probe():
+        return ok, state
+
+    return probe
+
+
+def _ready(prober: HealthProber) -> bool:
+    asyncio.run(prober.refresh())
+    return prober.ready
+
+
+def test_default_requires_asr_and_memory_only_with_redis(monkeypatch):
+    monkeypatch.delenv("REDIS_URL", raising=False)
+    assert default_required() == ["asr"]
+    monkeypatch.setenv("REDIS_URL", "redis://localhost:6379/0")
+    assert default_required() == ["asr", "memory"]
+
+
+def test_not_ready_while_a_required_component_is_down(monkeypatch):
+    monkeypatch.delenv("HEALTH_REQUIRED_COMPONENTS", raising=False)
+    monkeypatch.delenv("REDIS_URL", raising=False)
+    prober = HealthProber(interval_seconds=1, timeout_seconds=1)
+    prober.add("asr", _probe(False, "warming"))
+    prober.add("tts", _probe(False, "unavailable"))
+    assert not _ready(prober)
+    prober.add("asr", _probe(True))
+    assert _ready(prober)
+
+
+def test_required_component_without_a_probe_is_not_ready():
+    prober = HealthProber(interval_seconds=1, timeout_seconds=1, required=["asr", "memory"])
+    prober.add("asr", _probe(True))
+    assert not _ready(prober)
+
+
+def test_empty_setting_only_waits_for_the_first_pass(monkeypatch):
+    monkeypatch.setenv("HEALTH_REQUIRED_COMPONENTS", "")
+    prober = HealthProber(interval_seconds=1, timeout_seconds=1)
+    prober.add("asr", _probe(False, "warming"))
+    assert not prober.ready
+    assert _ready(prober)
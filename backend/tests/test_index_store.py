@@ -0,0 +1,91 @@
+import pytest
+
+from blockchain.index_store import ChamaEvent, ChamaIndexStore
+
+CREATOR = "0x" + "11" * 20
+MEMBER = "0x" + "22" * 20
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = ChamaIndexStore(str(tmp_path / "index.sqlite3"))
+    yield store
+    store.close()
+
+
+def _event(event, chama_id, block, log_index=0, **args):
+    return ChamaEvent(
+        name=event,
+        chama_id=chama_id,
+        block_number=block,
+        block_hash=f"0x{block:064x}",
+        log_index=log_index,
+        tx_hash=f"0x{block:04x}{log_index:04x}",
+        args=args,
+    )
+
+
+def _created(chama_id, block):
+    return _event(
+        "ChamaCreated",
+        chama_id,
+        block,
+        creator=CREATOR,
+        chamaAddress="0x" + "33" * 20,
+        name=f"Chama {chama_id}",
+        contributionAmount=50,
+    )
+
+
+def _history():
+    return [
+        (10, [_created(1, 10)]),
+        (11, [_event("MemberJoined", 1, 11, member=MEMBER), _event("ContributionMade", 1, 11, 1, amount=100)]),
+        (12, [_created(2, 12), _event("ChamaArchived", 1, 12, 1)]),
+    ]
+
+
+def _apply_all(store):
+    touched = set()
+    for block, events in _history():
+        touched |= store.apply(events, block, f"0x{block:064x}")
+    return touched
+
+
+def test_apply_materialises_chamas(store):
+    assert _apply_all(store) == {1, 2}
+    first = store.get_chama(1)
+    assert (first.members, first.total_funds_wei, first.active) == (2, 100, False)
+    assert store.chama_count() == 2
+    assert store.active_chama_ids() == [2]
+    assert store.member_chama_ids(MEMBER.upper()) == [1]
+    assert store.checkpoint() == (12, f"0x{12:064x}")
+
+
+def test_reapplying_events_is_a_no_op(store):
+    _apply_all(store)
+    assert _apply_all(store) == set()
+    first = store.get_chama(1)
+    assert (first.members, first.total_funds_wei) == (2, 100)
+
+
+def test_rollback_undoes_everything_above_the_fork(store):
+    _apply_all(store)
+    assert store.rollback(11, f"0x{11:064x}") == {1, 2}
+    first = store.get_chama(1)
+    assert (first.members, first.total_funds_wei, first.active) == (2, 100, True)
+    assert store.get_chama(2) is None
+    assert store.checkpoint() == (11, f"0x{11:064x}")
+    assert [number for number, _ in store.recent_blocks()] == [11, 10]
+
+    store.rollback(10, f"0x{10:064x}")
+    first = store.get_chama(1)
+    assert (first.members, first.total_funds_wei) == (1, 0)
+    assert store.member_chama_ids(MEMBER) == []
+
+
+def test_rollback_past_the_start_clears_the_checkpoint(store):
+    _apply_all(store)
+    store.rollback(0, None)
+    assert store.checkpoint() is None
+    assert store.chama_count() == 0
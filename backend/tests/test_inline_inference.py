@@ -0,0 +1,66 @@
+import asyncio
+import threading
+import time
+
+from services.asr_service import TranscriptionResult
+from services.inference_workers import InlineInference
+from services.registry import ServiceRegistry
+
+
+class SlowService:
+    is_ready = True
+    timings = {"load": 0.0}
+
+    def __init__(self, release: threading.Event) -> None:
+        release.wait(5)
+
+
+class SleepyASR:
+    is_ready = True
+    timings = {"load": 0.0}
+    engine = "fake"
+    model_name = "fake"
+
+    def transcribe(self, path):
+        time.sleep(0.05)
+        return TranscriptionResult(text="habari", confidence=0.9, dialect="standard", raw={}, audio_seconds=1.0)
+
+
+def test_is_ready_builds_in_the_background(monkeypatch):
+    monkeypatch.setenv("WARMUP_MODELS", "0")
+    monkeypatch.delenv("ASR_FALLBACK_MODEL", raising=False)
+
+    async def scenario():
+        release = threading.Event()
+        registry = ServiceRegistry()
+        registry.register("asr", lambda: SlowService(release))
+        inference = InlineInference(registry)
+        # The factory blocks until released: a synchronous build would hang here.
+        assert inference.is_ready("asr") is False
+        assert inference.is_ready("asr") is False
+        release.set()
+        for _ in range(100):
+            if inference.is_ready("asr"):
+                break
+            await asyncio.sleep(0.01)
+        assert inference.is_ready("asr")
+
+    asyncio.run(scenario())
+
+
+def test_compute_seconds_leave_out_the_scheduler_wait(monkeypatch):
+    monkeypatch.setenv("WARMUP_MODELS", "0")
+    monkeypatch.delenv("ASR_FALLBACK_MODEL", raising=False)
+
+    async def scenario():
+        registry = ServiceRegistry()
+        registry.register("asr", SleepyASR)
+        inference = InlineInference(registry)
+        start = time.perf_counter()
+        results = await asyncio.gather(*(inference.transcribe(b"RIFF", ".wav") for _ in range(3)))
+        wall = time.perf_counter() - start
+        # One slot: the clips ran one after another, but each reports only its own decode.
+        assert wall >= 0.15
+        assert all(0.05 <= result.compute_seconds < 0.1 for result in results)
+
+    asyncio.run(scenario())
@@ -0,0 +1,55 @@
+import asyncio
+
+from loadtest.stubs import FakeRedis
+from services.memory_service import ContextMemory
+from services.session_store import SessionStore
+
+WALLET = "0x" + "ab" * 20
+
+
+def _worker(redis: FakeRedis) -> ContextMemory:
+    # Each worker process has its own L1 in front of the shared Redis.
+    return ContextMemory(client=redis, store=SessionStore(ttl_seconds=300, max_bytes=1 << 20))
+
+
+def test_workers_see_each_others_writes():
+    async def scenario():
+        redis = FakeRedis()
+        first, second = _worker(redis), _worker(redis)
+
+        await first.record_exchange("s1", "Habari", "Nzuri", "sheng", "greeting", 0.9, wallet=WALLET)
+        assert await second.context_and_wallet("s1") == ("Mtumiaji: Habari\nAI: Nzuri", WALLET)
+
+        # first still holds its L1 copy; second's write must not be hidden behind it.
+        await second.record_exchange("s1", "Salio?", "Ni 500", "sheng", "balance", 0.8)
+        context, wallet = await first.context_and_wallet("s1")
+        assert context.endswith("Mtumiaji: Salio?\nAI: Ni 500")
+        assert wallet == WALLET
+        assert [entry["intent"] for entry in await first.intents("s1")] == ["balance", "greeting"]
+
+    asyncio.run(scenario())
+
+
+def test_current_l1_copy_is_served_without_reloading():
+    async def scenario():
+        redis = FakeRedis()
+        memory = _worker(redis)
+        await memory.append_turn("s1", "Habari", "Nzuri", "sheng")
+        await memory.recent_context("s1")
+        before = redis.round_trips
+        await memory.append_turn("s1", "Je?", "Sawa", "sheng")
+        assert "Mtumiaji: Je?" in await memory.recent_context("s1")
+        # The write plus a version GET: the lists are not read back.
+        assert redis.round_trips - before == 2
+
+    asyncio.run(scenario())
+
+
+def test_without_redis_the_store_is_the_backend():
+    async def scenario():
+        memory = ContextMemory(store=SessionStore(ttl_seconds=60, max_bytes=1 << 20))
+        await memory.record_exchange("s1", "Habari", "Nzuri", "sheng", "greeting", 0.9, wallet=WALLET)
+        assert await memory.wallet("s1") == WALLET
+        assert await memory.recent_context("s1") == "Mtumiaji: Habari\nAI: Nzuri"
+
+    asyncio.run(scenario())
@@ -0,0 +1,79 @@
+import asyncio
+
+import pytest
+
+from services.rate_limit import Policy, RateLimited, RateLimiter
+
+
+class FakeScriptClient:
+    """Grants every call and leases ``lease`` extra tokens, counting round trips."""
+
+    def __init__(self, lease: float) -> None:
+        self.lease = lease
+        self.calls = 0
+
+    def register_script(self, source: str):
+        async def script(keys, args):
+            self.calls += 1
+            return [1, "0", self.lease]
+
+        return script
+
+
+def test_policy_parse():
+    policy = Policy.parse("voice", "30/minute")
+    assert policy.capacity == 30
+    assert policy.refill_per_second == pytest.approx(0.5)
+    with pytest.raises(ValueError):
+        Policy.parse("voice", "30/fortnight")
+
+
+def test_local_bucket_limits_and_refills(clock, monkeypatch):
+    monkeypatch.delenv("REDIS_URL", raising=False)
+    limiter = RateLimiter(clock=clock)
+    policy = Policy.parse("voice", "2/second")
+
+    async def scenario():
+        await limiter.acquire(policy, "alice")
+        await limiter.acquire(policy, "alice")
+        with pytest.raises(RateLimited) as excinfo:
+            await limiter.acquire(policy, "alice")
+        assert excinfo.value.retry_after == pytest.approx(0.5)
+        # Buckets are per client.
+        await limiter.acquire(policy, "bob")
+        clock.now += 0.5
+        await limiter.acquire(policy, "alice")
+
+    asyncio.run(scenario())
+
+
+def test_cost_is_capped_at_capacity(clock, monkeypatch):
+    monkeypatch.delenv("REDIS_URL", raising=False)
+    limiter = RateLimiter(clock=clock)
+    policy = Policy.parse("voice", "2/second")
+
+    async def scenario():
+        await limiter.acquire(policy, "alice", cost=10)
+        with pytest.raises(RateLimited):
+            await limiter.acquire(policy, "alice")
+
+    asyncio.run(scenario())
+
+
+def test_lease_is_spent_locally_until_it_expires(clock):
+    client = FakeScriptClient(lease=2)
+    limiter = RateLimiter(lease_fraction=0.2, lease_seconds=2, client=client, clock=clock)
+    policy = Policy.parse("voice", "10/second")
+
+    async def scenario():
+        await limiter.acquire(policy, "alice")
+        await limiter.acquire(policy, "alice")
+        await limiter.acquire(policy, "alice")
+        assert client.calls == 1
+        await limiter.acquire(policy, "alice")
+        assert client.calls == 2
+        clock.now += 3
+        await limiter.acquire(policy, "alice")
+        assert client.calls == 3
+
+    asyncio.run(scenario())
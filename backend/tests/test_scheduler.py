@@ -0,0 +1,132 @@
+import asyncio
+
+import pytest
+
+from services.scheduler import CostModel, JobScheduler, QueueFull
+
+
+def _run_order(scheduler: JobScheduler, clock, jobs):
+    """Queue ``(units, priority, enqueued at)`` jobs behind a running one; the indexes in the order they ran."""
+
+    async def scenario():
+        gate = asyncio.Event()
+        ran = []
+        running = asyncio.create_task(scheduler.run(0, gate.wait))
+        await asyncio.sleep(0)
+        waiting = []
+        for index, (units, priority, enqueued) in enumerate(jobs):
+            clock.now = enqueued
+
+            async def job(index=index):
+                ran.append(index)
+
+            waiting.append(asyncio.create_task(scheduler.run(units, job, priority)))
+            await asyncio.sleep(0)
+        assert scheduler.pending == len(jobs)
+        gate.set()
+        await asyncio.gather(running, *waiting)
+        return ran
+
+    return asyncio.run(scenario())
+
+
+def test_shortest_job_runs_first(clock):
+    scheduler = JobScheduler("asr", 1, cost_model=CostModel(1.0), policy="sjf", aging=0.0, clock=clock)
+    jobs = [(10, "interactive", 0.0), (1, "interactive", 0.0), (5, "interactive", 0.0)]
+    assert _run_order(scheduler, clock, jobs) == [1, 2, 0]
+
+
+def test_fifo_policy_keeps_arrival_order(clock):
+    scheduler = JobScheduler("asr", 1, cost_model=CostModel(1.0), policy="fifo", clock=clock)
+    jobs = [(10, "interactive", 1.0), (1, "interactive", 2.0), (5, "interactive", 3.0)]
+    assert _run_order(scheduler, clock, jobs) == [0, 1, 2]
+
+
+def test_aging_lets_a_long_waiting_job_overtake_cheaper_ones(clock):
+    # Key = estimate + aging * enqueue time: 10 + 0 against 2 + 20 and 2 + 5.
+    scheduler = JobScheduler("asr", 1, cost_model=CostModel(1.0), policy="sjf", aging=1.0, clock=clock)
+    assert _run_order(scheduler, clock, [(10, "interactive", 0.0), (2, "interactive", 20.0)]) == [0, 1]
+    scheduler = JobScheduler("asr", 1, cost_model=CostModel(1.0), policy="sjf", aging=1.0, clock=clock)
+    assert _run_order(scheduler, clock, [(10, "interactive", 0.0), (2, "interactive", 5.0)]) == [1, 0]
+
+
+def test_bulk_jobs_wait_behind_interactive_ones(clock):
+    scheduler = JobScheduler(
+        "asr", 1, cost_model=CostModel(1.0), policy="sjf", aging=0.0, bulk_offset=30.0, clock=clock
+    )
+    jobs = [(1, "bulk", 0.0), (20, "interactive", 0.0), (40, "interactive", 0.0)]
+    assert _run_order(scheduler, clock, jobs) == [1, 0, 2]
+
+
+def test_queue_full_and_unknown_priority(clock):
+    async def scenario():
+        scheduler = JobScheduler("asr", 1, max_pending=1, clock=clock)
+        gate = asyncio.Event()
+        running = asyncio.create_task(scheduler.run(1, gate.wait))
+        await asyncio.sleep(0)
+        queued = asyncio.create_task(scheduler.run(1, gate.wait))
+        await asyncio.sleep(0)
+        with pytest.raises(QueueFull):
+            await scheduler.run(1, gate.wait)
+        with pytest.raises(ValueError):
+            await scheduler.run(1, gate.wait, priority="urgent")
+        gate.set()
+        await asyncio.gather(running, queued)
+
+    asyncio.run(scenario())
+
+
+def test_cancelled_waiter_leaves_the_queue(clock):
+    async def scenario():
+        scheduler = JobScheduler("asr", 1, cost_model=CostModel(1.0), clock=clock)
+        gate = asyncio.Event()
+        running = asyncio.create_task(scheduler.run(1, gate.wait))
+        await asyncio.sleep(0)
+        cancelled = asyncio.create_task(scheduler.run(1, gate.wait))
+        await asyncio.sleep(0)
+        cancelled.cancel()
+        await asyncio.gather(cancelled, return_exceptions=True)
+        assert scheduler.pending == 0
+        gate.set()
+        await running
+        # The slot was handed back: a new job runs straight away.
+        assert await asyncio.wait_for(scheduler.run(1, lambda: asyncio.sleep(0)), 1) is None
+
+    asyncio.run(scenario())
+
+
+def test_cost_model_learns_seconds_per_unit():
+    model = CostModel(1.0, alpha=0.5)
+    model.observe(10, 5.0)
+    assert model.seconds_per_unit == pytest.approx(0.75)
+    model.observe(0, 5.0)
+    assert model.estimate(4) == pytest.approx(3.0)
+
+
+def test_waiter_cancelled_as_the_slot_is_released_is_skipped(clock):
+    async def scenario():
+        scheduler = JobScheduler("asr", 1, cost_model=CostModel(1.0), clock=clock)
+        gate = asyncio.Event()
+        waiting = []
+
+        async def first():
+            await gate.wait()
+            # Cancelled in the same loop turn that this job hands its slot on.
+            waiting[0].cancel()
+
+        running = asyncio.create_task(scheduler.run(1, first))
+        await asyncio.sleep(0)
+        waiting.append(asyncio.create_task(scheduler.run(1, lambda: asyncio.sleep(0))))
+        waiting.append(asyncio.create_task(scheduler.run(2, lambda: asyncio.sleep(0))))
+        await asyncio.sleep(0)
+        assert scheduler.pending == 2
+        gate.set()
+        await running
+        results = await asyncio.wait_for(asyncio.gather(*waiting, return_exceptions=True), 1)
+        assert isinstance(results[0], asyncio.CancelledError)
+        assert results[1] is None
+        assert scheduler.pending == 0
+        # The slot was handed back: a new job runs straight away.
+        assert await asyncio.wait_for(scheduler.run(1, lambda: asyncio.sleep(0)), 1) is None
+
+    asyncio.run(scenario())
@@ -0,0 +1,43 @@
+import time
+import uuid
+
+import pytest
+from cryptography.fernet import Fernet
+
+from services import security
+
+
+@pytest.fixture
+def keys(monkeypatch):
+    monkeypatch.setenv("SESSION_TOKEN_TTL", "60")
+    key = Fernet.generate_key().decode()
+    assert security.reload_keys([key])
+    yield key
+    security.reload_keys([])
+
+
+def test_round_trip(keys):
+    session_id = str(uuid.uuid4())
+    token = security.encrypt_session(session_id)
+    assert token != session_id
+    assert security.decrypt_session(token) == session_id
+
+
+def test_expired_token_starts_a_new_session(keys, monkeypatch):
+    token = security.encrypt_session(str(uuid.uuid4()))
+    security.reload_keys([keys])
+    now = time.time()
+    monkeypatch.setattr(time, "time", lambda: now + 120)
+    assert security.decrypt_session(token) is None
+
+
+def test_token_from_a_retired_key_starts_a_new_session(keys):
+    token = security.encrypt_session(str(uuid.uuid4()))
+    security.reload_keys([Fernet.generate_key().decode()])
+    assert security.decrypt_session(token) is None
+
+
+def test_only_bare_uuids_pass_through(keys):
+    session_id = str(uuid.uuid4())
+    assert security.decrypt_session(session_id) == session_id
+    assert security.decrypt_session("not-a-session") is None
@@ -0,0 +1,59 @@
+import pytest
+
+from services.session_codec import (
+    COMPRESS_MIN_BYTES,
+    decode_intent,
+    decode_turn,
+    encode_intent,
+    encode_intent_json,
+    encode_turn,
+    encode_turn_json,
+)
+from services.session_store import IntentRecord, Turn
+
+
+def _fields(turn):
+    return (turn.user, turn.ai, turn.dialect, turn.ts)
+
+
+@pytest.mark.parametrize(
+    "turn",
+    [
+        Turn(user="Salio la chama changu?", ai="Salio ni KES 5,000.", dialect="kiswahili_sanifu", ts=1700000000.0),
+        Turn(user="", ai="", dialect="", ts=0.0),
+        Turn(user="Mambo msee 😀", ai="Poa sana", dialect="sheng", ts=1700000123.0),
+    ],
+)
+def test_turn_round_trip(turn):
+    assert _fields(decode_turn(encode_turn(turn))) == _fields(turn)
+
+
+def test_long_turns_are_compressed_and_still_round_trip():
+    turn = Turn(user="habari " * 100, ai="nzuri " * 100, dialect="sheng", ts=1700000000.0)
+    encoded = encode_turn(turn)
+    assert len(encoded) < COMPRESS_MIN_BYTES
+    assert _fields(decode_turn(encoded)) == _fields(turn)
+
+
+def test_intent_round_trip_keeps_four_decimal_places():
+    record = IntentRecord(intent="balance_inquiry", confidence=0.87654, ts=1700000000.0)
+    decoded = decode_intent(encode_intent(record))
+    assert (decoded.intent, decoded.confidence, decoded.ts) == ("balance_inquiry", 0.8765, 1700000000.0)
+
+
+def test_legacy_json_entries_still_decode():
+    turn = Turn(user="Habari", ai="Nzuri", dialect="sheng", ts=1700000000.0)
+    record = IntentRecord(intent="greeting", confidence=0.5, ts=1700000000.0)
+    assert _fields(decode_turn(encode_turn_json(turn))) == _fields(turn)
+    assert _fields(decode_turn(encode_turn_json(turn).encode())) == _fields(turn)
+    decoded = decode_intent(encode_intent_json(record))
+    assert (decoded.intent, decoded.confidence, decoded.ts) == ("greeting", 0.5, 1700000000.0)
+
+
+def test_wrong_kind_and_garbage_decode_to_none():
+    turn = encode_turn(Turn(user="a", ai="b", dialect="c", ts=0.0))
+    intent = encode_intent(IntentRecord(intent="x", confidence=1.0, ts=0.0))
+    assert decode_intent(turn) is None
+    assert decode_turn(intent) is None
+    assert decode_turn(b"\x07garbage") is None
+    assert decode_turn(b"{not json") is None
@@ -0,0 +1,56 @@
+from services.session_store import IntentRecord, SessionStore, Turn
+
+
+def _turn(text: str) -> Turn:
+    return Turn(user=text, ai=text, dialect="sheng", ts=0.0)
+
+
+def test_turns_are_newest_first_and_capped(clock):
+    store = SessionStore(max_turns=3, clock=clock)
+    for index in range(5):
+        store.append("s1", turn=_turn(str(index)))
+    assert [turn.user for turn in store.turns("s1")] == ["4", "3", "2"]
+    assert [turn.user for turn in store.turns("s1", limit=2)] == ["4", "3"]
+
+
+def test_least_recently_used_session_is_evicted_first(clock):
+    store = SessionStore(max_bytes=10_000, clock=clock)
+    store.append("a", turn=_turn("x" * 1000))
+    store.append("b", turn=_turn("x" * 1000))
+    store.turns("a")
+    store.append("c", turn=_turn("x" * 1000))
+    store.append("d", turn=_turn("x" * 1000))
+    assert store.size_bytes <= 10_000
+    assert store.turns("b") is None
+    assert store.turns("a") is not None
+
+
+def test_sessions_expire_after_ttl_since_last_write(clock):
+    store = SessionStore(ttl_seconds=10, tick_seconds=1, wheel_slots=4, clock=clock)
+    store.append("s1", turn=_turn("a"))
+    clock.now += 8
+    store.append("s1", intent=IntentRecord(intent="balance", confidence=0.5, ts=0.0))
+    clock.now += 8
+    assert store.intents("s1") is not None
+    clock.now += 3
+    assert store.turns("s1") is None
+    assert len(store) == 0
+    assert store.size_bytes == 0
+
+
+def test_expiry_survives_more_than_a_wheel_rotation(clock):
+    store = SessionStore(ttl_seconds=2, tick_seconds=1, wheel_slots=4, clock=clock)
+    store.append("s1", turn=_turn("a"))
+    clock.now += 100
+    store.append("s2", turn=_turn("b"))
+    assert len(store) == 1
+
+
+def test_load_replaces_and_keeps_the_version(clock):
+    store = SessionStore(clock=clock)
+    store.append("s1", turn=_turn("stale"), version=1)
+    store.load("s1", [_turn("b"), _turn("a")], [], wallet="0xabc", version=4)
+    assert [turn.user for turn in store.turns("s1")] == ["b", "a"]
+    assert store.wallet("s1") == "0xabc"
+    assert store.version("s1") == 4
+    assert store.version("missing") is None
@@ -1,4 +1,5 @@
 import { useEffect, useRef, useState } from 'react';
+import { useAccount } from 'wagmi';
 import { MessageCircle, Send, Mic, MicOff, X, Volume2, VolumeX, Loader2, CheckCircle2, AlertCircle } from 'lucide-react';
 import { Button } from './ui/button';
 import { Input } from './ui/input';
@@ -30,6 +31,7 @@ export default function SwahiliChatbot({ language, onLanguageChange }: SwahiliCh
     latencyMs: null as number | null,
   });
   const messagesEndRef = useRef<HTMLDivElement>(null);
+  const { address } = useAccount();
 
   const { messages, setMessages, isProcessing, backendAvailable, sendMessage } = useChat({ language });
   const { health, services, isHealthy } = useBackendHealth({ 
@@ -42,7 +44,7 @@ export default function SwahiliChatbot({ language, onLanguageChange }: SwahiliCh
     const startTime = performance.now();
 
     try {
-      const result = await processVoiceSample(audioBlob, sessionId ?? undefined, language);
+      const result = await processVoiceSample(audioBlob, sessionId ?? undefined, language, address);
       
       setSessionId(result.sessionId);
       setVoiceMetrics({
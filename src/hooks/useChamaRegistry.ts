@@ -1,10 +1,12 @@
-import { useQuery } from "@tanstack/react-query";
+import { useEffect, useState } from "react";
+import { useQuery, useQueryClient } from "@tanstack/react-query";
 import { usePublicClient } from "wagmi";
 import { formatUnits } from "ethers";
 import { CONTRACTS, DEFAULT_CHAIN_ID } from "@/lib/constants";
 import { CHAMA_FACTORY_ABI } from "@/lib/abi/chamaFactory";
 import { CHAMA_ABI } from "@/lib/abi/chama";
 import { ERC20_ABI } from "@/lib/abi/erc20";
+import { subscribeChamaUpdates } from "@/lib/chamaApi";
 import type { Chama } from "@/lib/mockData";
 
 type FetchOptions = {
@@ -40,11 +42,25 @@ async function getTokenDecimals(
 
 export function useChamaRegistry({ language }: FetchOptions) {
   const publicClient = usePublicClient({ chainId: CONTRACTS.CHAIN_ID ?? DEFAULT_CHAIN_ID });
+  const queryClient = useQueryClient();
+  const [streamConnected, setStreamConnected] = useState(false);
+
+  // The backend pushes chama changes over SSE; refetch only when something
+  // changed and fall back to polling while the stream is down.
+  useEffect(
+    () =>
+      subscribeChamaUpdates((message) => {
+        if (message.type !== "ready") {
+          void queryClient.invalidateQueries({ queryKey: ["chamas", CONTRACTS.FACTORY] });
+        }
+      }, setStreamConnected),
+    [queryClient]
+  );
 
   return useQuery<Chama[]>({
     queryKey: ["chamas", CONTRACTS.FACTORY, language],
     enabled: Boolean(publicClient && CONTRACTS.FACTORY),
-    refetchInterval: 30_000,
+    refetchInterval: streamConnected ? false : 30_000,
     queryFn: async () => {
       if (!publicClient) {
         throw new Error("Public client not ready");
@@ -15,6 +15,20 @@ export interface RemoteChama {
 
 interface ChamaResponse {
   chamas: RemoteChama[];
+  nextCursor?: string | null;
+}
+
+export interface ChamaPageQuery {
+  limit?: number;
+  cursor?: string | null;
+  active?: boolean;
+  owner?: string;
+  member?: string;
+}
+
+export interface ChamaPage {
+  chamas: RemoteChama[];
+  nextCursor: string | null;
 }
 
 export async function fetchChamas(limit = 6, signal?: AbortSignal): Promise<RemoteChama[]> {
@@ -35,4 +49,63 @@ export async function fetchChamas(limit = 6, signal?: AbortSignal): Promise<Remo
   return payload.chamas ?? [];
 }
 
+export async function fetchChamaPage(query: ChamaPageQuery = {}, signal?: AbortSignal): Promise<ChamaPage> {
+  const url = new URL(`${API_URL}/chamas`);
+  url.searchParams.set('limit', String(query.limit ?? 6));
+  if (query.cursor) url.searchParams.set('cursor', query.cursor);
+  if (query.active !== undefined) url.searchParams.set('active', String(query.active));
+  if (query.owner) url.searchParams.set('owner', query.owner);
+  if (query.member) url.searchParams.set('member', query.member);
+
+  const response = await fetch(url.toString(), {
+    method: 'GET',
+    signal,
+  });
+
+  if (!response.ok) {
+    const message = await response.text();
+    throw new Error(`Failed to load chamas: ${response.status} ${message}`);
+  }
+
+  const payload = (await response.json()) as ChamaResponse;
+  return { chamas: payload.chamas ?? [], nextCursor: payload.nextCursor ?? null };
+}
+
+export type ChamaStreamMessage =
+  | { type: 'ready'; block: number | null }
+  | { type: 'update'; block: number; chamas: RemoteChama[] }
+  | { type: 'resync'; block: number | null };
 
+/**
+ * Subscribe to `/chamas/stream`. `onStatus(true)` fires once connected and
+ * `onStatus(false)` while the browser is reconnecting. Returns an unsubscribe
+ * function.
+ */
+export function subscribeChamaUpdates(
+  onMessage: (message: ChamaStreamMessage) => void,
+  onStatus?: (connected: boolean) => void
+): () => void {
+  if (typeof EventSource === 'undefined') {
+    onStatus?.(false);
+    return () => undefined;
+  }
+
+  const source = new EventSource(`${API_URL}/chamas/stream`);
+  const handle = (event: MessageEvent<string>) => {
+    try {
+      onMessage(JSON.parse(event.data) as ChamaStreamMessage);
+    } catch (error) {
+      console.error('Invalid chama stream message:', error);
+    }
+  };
+
+  source.addEventListener('ready', (event) => {
+    onStatus?.(true);
+    handle(event as MessageEvent<string>);
+  });
+  source.addEventListener('update', (event) => handle(event as MessageEvent<string>));
+  source.addEventListener('resync', (event) => handle(event as MessageEvent<string>));
+  source.onerror = () => onStatus?.(false);
+
+  return () => source.close();
+}
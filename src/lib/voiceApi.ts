@@ -15,7 +15,8 @@ const DEFAULT_API = import.meta.env.VITE_API_URL ?? 'http://localhost:8000';
 export async function processVoiceSample(
   blob: Blob,
   sessionId?: string,
-  language: 'sw' | 'en' = 'sw'
+  language: 'sw' | 'en' = 'sw',
+  walletAddress?: string
 ): Promise<VoiceProcessResult> {
   const form = new FormData();
   const extension = blob.type.includes('webm')
@@ -29,7 +30,14 @@ export async function processVoiceSample(
   }
   form.append('language', language);
 
-  const response = await fetch(`${DEFAULT_API}/voice/process`, {
+  // Binds the connected wallet to the session so balance questions answer
+  // about the speaker's own chamas.
+  const url = new URL(`${DEFAULT_API}/voice/process`);
+  if (walletAddress) {
+    url.searchParams.set('wallet_address', walletAddress);
+  }
+
+  const response = await fetch(url.toString(), {
     method: 'POST',
     body: form,
   });